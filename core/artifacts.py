@@ -0,0 +1,132 @@
+"""
+Content-addressed storage for experiment artifacts.
+Figures, datasets and checkpoints are stored once under their SHA-256 digest
+and referenced from experiment results, so repeated artifacts share one blob.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Bytes read per chunk while hashing and copying artifacts
+CHUNK_SIZE = 1024 * 1024
+
+# Temp files younger than this may belong to a put still copying its source
+INCOMING_GRACE_SECONDS = 60 * 60
+
+class ArtifactStore:
+    """
+    Blob store keyed by SHA-256 digest under <root>/objects/ab/cdef....
+
+    Files are hashed while they are copied into a temporary file in the store,
+    then renamed into place; if the digest is already present the copy is
+    discarded, which is how duplicate artifacts are deduplicated.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects = self.root / 'objects'
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def __contains__(self, digest: str) -> bool:
+        return self.blob_path(digest).exists()
+
+    def put(self, source: Path) -> Tuple[str, int, bool]:
+        """
+        Store a file, returning (digest, size, deduplicated).
+
+        The source is read once, in chunks, for both hashing and copying.
+        """
+        self.objects.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, temp_name = tempfile.mkstemp(dir=self.objects, prefix='incoming-')
+        temp_path = Path(temp_name)
+        try:
+            with open(source, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+
+            blob_path = self.blob_path(digest.hexdigest())
+            if blob_path.exists():
+                temp_path.unlink()
+                return digest.hexdigest(), size, True
+
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.replace(blob_path)
+            return digest.hexdigest(), size, False
+        except Exception as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise IOError(f"Failed to store artifact {source}: {str(e)}")
+
+    def digests(self) -> Iterator[str]:
+        """Digests of every stored blob."""
+        if not self.objects.exists():
+            return
+        for prefix_dir in self.objects.iterdir():
+            if prefix_dir.is_dir():
+                for blob in prefix_dir.iterdir():
+                    yield prefix_dir.name + blob.name
+
+    def collect_garbage(self, referenced: Set[str]) -> Tuple[int, int]:
+        """
+        Delete blobs whose digest is not referenced, plus abandoned temp files.
+
+        A temp file only counts as abandoned once it has not been written to
+        for INCOMING_GRACE_SECONDS, so a put running alongside keeps its copy.
+        Returns (blobs removed, bytes freed).
+        """
+        removed = 0
+        freed = 0
+        for digest in list(self.digests()):
+            if digest in referenced:
+                continue
+            blob_path = self.blob_path(digest)
+            freed += blob_path.stat().st_size
+            blob_path.unlink()
+            removed += 1
+            if not any(blob_path.parent.iterdir()):
+                blob_path.parent.rmdir()
+
+        if self.objects.exists():
+            cutoff = time.time() - INCOMING_GRACE_SECONDS
+            for temp_path in self.objects.glob('incoming-*'):
+                try:
+                    if temp_path.stat().st_mtime < cutoff:
+                        temp_path.unlink()
+                except FileNotFoundError:
+                    # Renamed into place or discarded by its put meanwhile
+                    pass
+        return removed, freed
+
+def make_artifact_ref(source: Path, digest: str, size: int, name: Optional[str] = None,
+                      kind: Optional[str] = None) -> Dict[str, Any]:
+    """Build the reference recorded in an experiment's results for a stored artifact."""
+    return {
+        'name': name or Path(source).name,
+        'kind': kind or 'file',
+        'sha256': digest,
+        'size': size,
+        'source': str(source),
+        'registered': datetime.now().isoformat()
+    }
+
+def referenced_digests(records: Iterable[Optional[Dict[str, Any]]]) -> Set[str]:
+    """Collect artifact digests from experiment metadata or results records."""
+    digests = set()
+    for record in records:
+        if not record:
+            continue
+        artifacts = list(record.get('artifacts', [])) + list(record.get('results', {}).get('artifacts', []))
+        digests.update(ref['sha256'] for ref in artifacts)
+    return digests
@@ -0,0 +1,83 @@
+"""
+Cold storage for finished research records.
+Old concluded experiments and ideas in terminal states are moved out of the
+project files that load on every open into compressed, indexed archives.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.file_handlers import save_json, load_json
+from utils.record_archive import RecordArchive
+
+COLD_KINDS = ('ideas', 'experiments')
+
+class ColdStore:
+    """
+    Per-kind compressed record archives plus a catalog of their contents.
+
+    Full records live in cold/<kind>.dat, one zlib-compressed record per key,
+    so any one of them is a single seek away. catalog.json holds a small
+    summary of each record (titles, dates, experiment parameters) so cold
+    records can be listed and filtered without decompressing anything.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.catalog_path = self.directory / 'catalog.json'
+        self._archives = {kind: RecordArchive(self.directory, kind, compress=True) for kind in COLD_KINDS}
+        self._catalog: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+
+    @property
+    def catalog(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if self._catalog is None:
+            catalog = load_json(self.catalog_path) or {}
+            self._catalog = {kind: catalog.get(kind, {}) for kind in COLD_KINDS}
+        return self._catalog
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.catalog.values())
+
+    def contains(self, kind: str, key: str) -> bool:
+        return key in self.catalog[kind]
+
+    def keys(self, kind: str) -> List[str]:
+        return sorted(self.catalog[kind])
+
+    def summary(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        return self.catalog[kind].get(key)
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Full record for a key, or None if it is not in cold storage."""
+        if key not in self.catalog[kind]:
+            return None
+        return self._archives[kind].get(key)
+
+    def iter_records(self, kind: str, keys: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (key, record) pairs in key order, decompressing one record at a time."""
+        wanted = self.keys(kind) if keys is None else sorted(k for k in keys if k in self.catalog[kind])
+        return self._archives[kind].iter_records(wanted)
+
+    def add(self, kind: str, records: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        Archive (key, record, summary) triples.
+
+        Records are consumed one at a time, so a generator never has more than
+        one full record in memory. They are durably appended before the catalog
+        is replaced, so a crash in between leaves them hot and merely
+        unreferenced in the archive.
+        """
+        summaries: Dict[str, Dict[str, Any]] = {}
+
+        def entries() -> Iterator[Tuple[str, Dict[str, Any]]]:
+            for key, record, summary in records:
+                summaries[key] = summary
+                yield key, record
+
+        written = self._archives[kind].append(entries())
+        if not written:
+            return 0
+        catalog = self.catalog
+        catalog[kind].update(summaries)
+        save_json(catalog, self.catalog_path)
+        return written
@@ -0,0 +1,308 @@
+"""
+Read-only queries across every research project in the projects directory.
+Projects are read straight from disk on a process pool, without opening a
+ComprehensiveResearchLog, and the per-project results are merged.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.cold_storage import ColdStore
+from core.daily_logs import DailyLogStore, incomplete_goals
+from core.insight_store import InsightStore, project_insights
+from core.models import experiment_id
+from core.records import idea_from_dict, note_from_dict, experiment_from_dict
+from core.wal import MutationLog
+from utils.file_handlers import save_json, load_json, COMPRESS_THRESHOLD
+
+# Record kinds that can be searched
+KINDS = ('idea', 'experiment', 'paper_note', 'insight', 'goal')
+
+INDEX_FILENAME = '.search_index.json'
+
+# Entries whose mtime and size make up a project's change marker. Project
+# files are replaced atomically, which also bumps their directory's mtime;
+# the mutation log and the insight log are appended to in place, so they
+# are stat'ed directly.
+_MARKER_PATHS = (
+    'project_metadata.json', 'ideas', 'ideas/idea_summaries.json',
+    'paper_notes', 'paper_notes/note_references.json',
+    'experiments', 'experiments/experiments.json',
+    'daily_logs', 'wal/mutations.log', 'wal/checkpoint.json', 'cold/catalog.json',
+    'insights/insights.jsonl',
+)
+
+def change_marker(project_path: Path) -> str:
+    """Cheap fingerprint of a project's data files that changes on every write."""
+    digest = hashlib.sha256()
+    for relative in _MARKER_PATHS:
+        try:
+            stat = os.stat(Path(project_path) / relative)
+            digest.update(f"{relative}:{stat.st_mtime_ns}:{stat.st_size};".encode('utf-8'))
+        except FileNotFoundError:
+            digest.update(f"{relative}:-;".encode('utf-8'))
+    return digest.hexdigest()
+
+def load_project(project_path: Path) -> Dict[str, Any]:
+    """
+    Load a project's checkpointed files, pending mutations and cold storage.
+
+    Mirrors ComprehensiveResearchLog loading and replay, but never writes to
+    the project and never prints on success.
+    """
+    project_path = Path(project_path)
+    metadata = load_json(project_path / 'project_metadata.json') or {}
+    ideas = {}
+    for record in load_json(project_path / 'ideas' / 'idea_summaries.json') or []:
+        idea = idea_from_dict(record)
+        ideas[idea.id] = idea
+    notes = {}
+    for record in load_json(project_path / 'paper_notes' / 'note_references.json') or []:
+        note = note_from_dict(record)
+        notes.setdefault((note.notebook_id, note.page_number, note.note_type), note)
+    experiments = {}
+    for record in load_json(project_path / 'experiments' / 'experiments.json') or []:
+        experiment = experiment_from_dict(record)
+        experiments[experiment_id(experiment)] = experiment
+
+    for record in MutationLog(project_path / 'wal').pending():
+        op, data = record['op'], record['data']
+        if op == 'idea.save':
+            idea = idea_from_dict(data)
+            ideas[idea.id] = idea
+        elif op == 'note.add':
+            note = note_from_dict(data)
+            notes.setdefault((note.notebook_id, note.page_number, note.note_type), note)
+        elif op == 'experiment.save':
+            experiment = experiment_from_dict(data)
+            experiments[experiment_id(experiment)] = experiment
+
+    cold = ColdStore(project_path / 'cold')
+    for key, record in cold.iter_records('ideas'):
+        ideas.setdefault(key, idea_from_dict(record))
+    for key, record in cold.iter_records('experiments'):
+        experiments.setdefault(key, experiment_from_dict(record))
+
+    return {
+        'name': metadata.get('project_name', project_path.name),
+        'path': project_path,
+        'ideas': list(ideas.values()),
+        'paper_notes': list(notes.values()),
+        'experiments': sorted(experiments.values(), key=lambda e: e.timestamp),
+        'daily_logs': DailyLogStore(project_path / 'daily_logs'),
+        'insights': InsightStore(project_path / 'insights'),
+    }
+
+def _document(project: str, kind: str, record_id: str, when: Any, title: str,
+              status: str, *fields: Any) -> Dict[str, Any]:
+    text = " ".join(str(field) for field in (title,) + fields if field not in (None, ''))
+    return {
+        'project': project,
+        'kind': kind,
+        'id': record_id,
+        'date': when.isoformat() if isinstance(when, datetime) else str(when),
+        'title': title,
+        'status': status,
+        'text': text.lower(),
+    }
+
+def project_entry(project_path: Path) -> Dict[str, Any]:
+    """
+    Searchable documents and summary totals for one project.
+
+    This is the unit of work sent to pool workers, and also what the global
+    index stores per project.
+    """
+    data = load_project(project_path)
+    name = data['name']
+    documents = []
+
+    for idea in data['ideas']:
+        documents.append(_document(
+            name, 'idea', idea.id, idea.last_updated, idea.title, idea.status.value,
+            idea.description, idea.potential_impact, idea.next_steps
+        ))
+    for experiment in data['experiments']:
+        documents.append(_document(
+            name, 'experiment', experiment_id(experiment), experiment.timestamp,
+            experiment.hypothesis, 'concluded' if experiment.conclusions else 'ongoing',
+            experiment.methodology, experiment.conclusions, experiment.next_steps,
+            experiment.code_version, json.dumps(experiment.parameters, sort_keys=True, default=str)
+        ))
+    for note in data['paper_notes']:
+        documents.append(_document(
+            name, 'paper_note', f"{note.notebook_id}:{note.page_number}", note.date,
+            note.brief_summary, note.note_type, note.notebook_id
+        ))
+
+    days = list(data['daily_logs'].iter_days())
+    for day, summary in days:
+        goal_status = summary.get('goal_status', {})
+        for i, goal in enumerate(summary.get('goals', []), 1):
+            documents.append(_document(
+                name, 'goal', f"{day:%Y%m%d}:{i}", day, str(goal),
+                goal_status.get(str(i), {}).get('status', 'pending')
+            ))
+
+    for insight in project_insights(data['insights'], data['daily_logs']):
+        documents.append(_document(
+            name, 'insight', insight['id'] or insight['timestamp'], insight['timestamp'],
+            insight['observation'], '', insight['implications'],
+            insight['experiment_id'], ' '.join(insight['idea_ids'])
+        ))
+
+    ideas_by_status: Dict[str, int] = {}
+    for idea in data['ideas']:
+        ideas_by_status[idea.status.value] = ideas_by_status.get(idea.status.value, 0) + 1
+
+    return {
+        'name': name,
+        'marker': change_marker(project_path),
+        'documents': documents,
+        'totals': {
+            'ideas': len(data['ideas']),
+            'ideas_by_status': ideas_by_status,
+            'experiments': len(data['experiments']),
+            'paper_notes': len(data['paper_notes']),
+            'days_logged': len(days),
+            'open_goals': len(incomplete_goals(days)),
+        },
+    }
+
+def safe_project_entry(project_path: Path) -> Dict[str, Any]:
+    """
+    project_entry() that reports a damaged project instead of raising.
+
+    Failed entries carry an 'error' message and no marker, so they are
+    re-read on the next query rather than cached as broken.
+    """
+    try:
+        return project_entry(project_path)
+    except Exception as e:
+        return {'name': Path(project_path).name, 'marker': None, 'error': f"{type(e).__name__}: {e}"}
+
+def _matches(document: Dict[str, Any], terms: List[str], kinds: Optional[Iterable[str]]) -> bool:
+    if kinds is not None and document['kind'] not in kinds:
+        return False
+    return all(term in document['text'] for term in terms)
+
+def search_project(project_path: Path, terms: List[str],
+                   kinds: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Entry for one project holding only its matching documents; runs in a pool worker."""
+    entry = safe_project_entry(project_path)
+    if 'error' not in entry:
+        entry['documents'] = [doc for doc in entry['documents'] if _matches(doc, terms, kinds)]
+    return entry
+
+class CrossProjectSearch:
+    """
+    Fans queries out over every project on a process pool and merges results.
+
+    With the global index enabled, each project's documents and totals are
+    cached in research_projects/.search_index.json together with the change
+    marker they were built from; a query only re-reads projects whose marker
+    has moved since.
+
+    A project that cannot be read does not fail the query: it is left out of
+    the results and listed in `skipped` with the error, as
+    {'project': name, 'error': message}.
+    """
+
+    def __init__(self, projects_dir: Path, max_workers: Optional[int] = None,
+                 use_index: bool = True):
+        self.projects_dir = Path(projects_dir)
+        self.max_workers = max_workers
+        self.use_index = use_index
+        self.index_path = self.projects_dir / INDEX_FILENAME
+        self.skipped: List[Dict[str, str]] = []
+
+    def project_paths(self) -> List[Path]:
+        """Project directories, identified the same way as ProjectManager does."""
+        required_dirs = ['experiments', 'ideas', 'daily_logs', 'paper_notes']
+        if not self.projects_dir.exists():
+            return []
+        return sorted(
+            path for path in self.projects_dir.iterdir()
+            if path.is_dir() and all((path / subdir).exists() for subdir in required_dirs)
+        )
+
+    def _map(self, function: Callable, paths: List[Path], *args: Any) -> List[Any]:
+        """Run function(path, *args) for every path, in parallel when worthwhile."""
+        if len(paths) <= 1 or self.max_workers == 1:
+            return [function(path, *args) for path in paths]
+        workers = min(len(paths), self.max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(function, paths, *([arg] * len(paths) for arg in args)))
+
+    def refresh_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the global index up to date and return its per-project entries.
+
+        Only projects whose change marker differs from the stored one are
+        re-read; projects that disappeared are dropped.
+        """
+        try:
+            index = load_json(self.index_path) or {}
+        except IOError:
+            index = {}
+
+        paths = {path.name: path for path in self.project_paths()}
+        stale = [path for key, path in paths.items()
+                 if index.get(key, {}).get('marker') != change_marker(path)]
+
+        for path, entry in zip(stale, self._map(safe_project_entry, stale)):
+            index[path.name] = entry
+        vanished = [key for key in index if key not in paths]
+        for key in vanished:
+            del index[key]
+
+        if stale or vanished or not self.index_path.exists():
+            save_json(index, self.index_path, compress_threshold=COMPRESS_THRESHOLD)
+        return index
+
+    def _readable(self, entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Entries that loaded; the failed ones are recorded in self.skipped."""
+        readable = []
+        self.skipped = []
+        for entry in entries:
+            if 'error' in entry:
+                self.skipped.append({'project': entry['name'], 'error': entry['error']})
+            else:
+                readable.append(entry)
+        self.skipped.sort(key=lambda skipped: skipped['project'].lower())
+        return readable
+
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Records from every project containing all whitespace-separated terms.
+
+        Matching is case-insensitive; results are sorted newest first.
+        """
+        terms = query.lower().split()
+        kinds = list(kinds) if kinds is not None else None
+        if self.use_index:
+            entries = self._readable(self.refresh_index().values())
+            results = [
+                doc for entry in entries
+                for doc in entry['documents'] if _matches(doc, terms, kinds)
+            ]
+        else:
+            entries = self._readable(self._map(search_project, self.project_paths(), terms, kinds))
+            results = [doc for entry in entries for doc in entry['documents']]
+        return sorted(results, key=lambda doc: doc['date'], reverse=True)
+
+    def totals(self) -> List[Dict[str, Any]]:
+        """Per-project counts of ideas, experiments, notes and open goals."""
+        if self.use_index:
+            entries = self._readable(self.refresh_index().values())
+        else:
+            entries = self._readable(self._map(safe_project_entry, self.project_paths()))
+        return sorted(
+            (dict(entry['totals'], project=entry['name']) for entry in entries),
+            key=lambda totals: totals['project'].lower()
+        )
@@ -0,0 +1,199 @@
+"""
+Storage for daily research logs.
+Days are written as live daily_YYYYMMDD.json files and can be compacted into
+monthly archive_YYYYMM record archives; readers see both transparently.
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.file_handlers import load_json
+from utils.record_archive import RecordArchive
+from ui.console import console
+
+def incomplete_goals(days: Iterable[Tuple[date, Dict[str, Any]]],
+                     before: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Unique goals that were never completed, each with its earliest date.
+
+    Goals completed on any day are excluded; only days before `before` (all
+    days when None) contribute open goals.
+    """
+    goal_tracker: Dict[str, Dict[str, Any]] = {}
+    completed_goals = set()
+
+    for file_date, daily_summary in days:
+        goals = daily_summary.get('goals', [])
+        goal_status = daily_summary.get('goal_status', {})
+
+        for i, goal in enumerate(goals, 1):
+            if goal_status.get(str(i), {}).get('status', 'pending') == 'completed':
+                completed_goals.add(str(goal).strip())
+
+        if before is not None and file_date >= before:
+            continue
+
+        for goal, status_entry in zip(goals, goal_status.values()):
+            goal_text = str(goal).strip()
+
+            # Days are visited in order, so the first occurrence is the earliest
+            if goal_text not in goal_tracker:
+                goal_tracker[goal_text] = {
+                    'goal': goal,
+                    'original_date': file_date.isoformat(),
+                    'status': status_entry.get('status', 'pending'),
+                    'progress_notes': status_entry.get('progress_notes', [])
+                }
+
+    return [
+        goal_info for goal_text, goal_info in goal_tracker.items()
+        if goal_text not in completed_goals
+    ]
+
+class DailyLogStore:
+    """
+    Unified view over live daily log files and monthly archives.
+
+    A live file always takes precedence over an archived copy of the same day,
+    so a day that is edited after compaction still reads its latest version.
+    """
+
+    def __init__(self, daily_logs_path: Path):
+        self.path = Path(daily_logs_path)
+        self._archives: Dict[str, RecordArchive] = {}
+
+    def live_path(self, day: date) -> Path:
+        return self.path / f"daily_{day:%Y%m%d}.json"
+
+    def _archive(self, month: str) -> RecordArchive:
+        if month not in self._archives:
+            self._archives[month] = RecordArchive(self.path, f"archive_{month}")
+        return self._archives[month]
+
+    def _archive_months(self) -> List[str]:
+        return sorted(p.name[len('archive_'):-len('.idx.json')] for p in self.path.glob('archive_*.idx.json'))
+
+    def _live_days(self) -> Dict[date, Path]:
+        days = {}
+        for log_file in self.path.glob('daily_*.json'):
+            try:
+                days[datetime.strptime(log_file.stem[6:], '%Y%m%d').date()] = log_file
+            except ValueError:
+                continue
+        return days
+
+    def days(self) -> List[date]:
+        """Every day with a log, live or archived, in date order."""
+        archived = {
+            datetime.strptime(key, '%Y%m%d').date()
+            for month in self._archive_months()
+            for key in self._archive(month).keys()
+        }
+        return sorted(archived | set(self._live_days()))
+
+    def load(self, day: date) -> Optional[Dict[str, Any]]:
+        """Load one day's summary, preferring the live file over the archive."""
+        live_path = self.live_path(day)
+        if live_path.exists():
+            return load_json(live_path)
+        archive = self._archive(f"{day:%Y%m}")
+        if not archive.index_path.exists():
+            return None
+        return archive.get(f"{day:%Y%m%d}")
+
+    def fingerprints(self, end: Optional[date] = None) -> Dict[date, Tuple[int, int]]:
+        """
+        A value per day before end that changes whenever the day's log does.
+
+        Live days are fingerprinted by file mtime and size, archived days by
+        their record's location, which moves when the day is archived again.
+        """
+        found: Dict[date, Tuple[int, int]] = {}
+        for month in self._archive_months():
+            for key, (offset, length) in self._archive(month).index.items():
+                found[datetime.strptime(key, '%Y%m%d').date()] = (offset, length)
+        for day, log_file in self._live_days().items():
+            try:
+                stat = log_file.stat()
+            except OSError:
+                continue
+            found[day] = (stat.st_mtime_ns, stat.st_size)
+        return {day: value for day, value in found.items() if end is None or day < end}
+
+    def iter_days(self, start: Optional[date] = None, end: Optional[date] = None,
+                  only: Optional[Iterable[date]] = None) -> Iterator[Tuple[date, Dict[str, Any]]]:
+        """
+        Yield (day, summary) pairs in date order for days in [start, end),
+        limited to the days in only when it is given.
+
+        Archived months are read through one file handle each; unreadable days
+        are reported and skipped.
+        """
+        only = None if only is None else set(only)
+        live = self._live_days()
+        archived: Dict[date, str] = {}
+        for month in self._archive_months():
+            for key in self._archive(month).keys():
+                archived[datetime.strptime(key, '%Y%m%d').date()] = month
+
+        selected = sorted(
+            day for day in set(live) | set(archived)
+            if (start is None or day >= start) and (end is None or day < end)
+            and (only is None or day in only)
+        )
+
+        pending: List[date] = []
+        for day in selected:
+            if day in live:
+                yield from self._iter_archived(pending, archived)
+                pending = []
+                try:
+                    yield day, load_json(live[day])
+                except IOError as e:
+                    console.log(f"[yellow]Warning: Error processing {live[day]}: {str(e)}[/yellow]")
+            else:
+                if pending and archived[pending[-1]] != archived[day]:
+                    yield from self._iter_archived(pending, archived)
+                    pending = []
+                pending.append(day)
+        yield from self._iter_archived(pending, archived)
+
+    def _iter_archived(self, days: List[date],
+                       archived: Dict[date, str]) -> Iterator[Tuple[date, Dict[str, Any]]]:
+        if not days:
+            return
+        archive = self._archive(archived[days[0]])
+        try:
+            for key, summary in archive.iter_records(f"{day:%Y%m%d}" for day in days):
+                yield datetime.strptime(key, '%Y%m%d').date(), summary
+        except (OSError, ValueError) as e:
+            console.log(f"[yellow]Warning: Error reading {archive.data_path}: {str(e)}[/yellow]")
+
+    def compact(self, before: date) -> int:
+        """
+        Pack live daily files dated before the given day into monthly archives.
+
+        Live files are removed only after their month's archive index has been
+        durably updated. Returns the number of days compacted.
+        """
+        by_month: Dict[str, List[Tuple[date, Path]]] = {}
+        for day, log_file in sorted(self._live_days().items()):
+            if day < before:
+                by_month.setdefault(f"{day:%Y%m}", []).append((day, log_file))
+
+        compacted = 0
+        for month, entries in by_month.items():
+            records = []
+            for day, log_file in entries:
+                try:
+                    records.append((f"{day:%Y%m%d}", load_json(log_file)))
+                except IOError as e:
+                    console.log(f"[yellow]Warning: Skipping unreadable {log_file}: {str(e)}[/yellow]")
+            self._archive(month).append(records)
+            archived_keys = {key for key, _ in records}
+            for day, log_file in entries:
+                if f"{day:%Y%m%d}" in archived_keys:
+                    log_file.unlink()
+                    compacted += 1
+        return compacted
@@ -0,0 +1,190 @@
+"""
+Registry of array datasets kept in the project data/ directory.
+Records shape, dtype and checksum for .npy and raw binary files and opens
+registered versions as read-only memory maps.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from math import prod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.integrity import quarantine
+from ui.console import console
+from utils.file_handlers import save_json, load_json, file_sha256
+
+# Number of memory maps kept open by default
+DEFAULT_MAX_OPEN = 8
+
+def _dtype(descr: Any) -> np.dtype:
+    """
+    The dtype of a descr saved by register. Plain dtypes are strings such as
+    '<f8'; structured ones are field lists whose tuples JSON turned into lists.
+    """
+    def restore(descr: Any) -> Any:
+        if isinstance(descr, str):
+            return descr
+        fields = []
+        for name, field_descr, *shape in descr:
+            field = (tuple(name) if isinstance(name, list) else name, restore(field_descr))
+            fields.append(field + tuple(tuple(dims) for dims in shape))
+        return fields
+    return np.lib.format.descr_to_dtype(restore(descr))
+
+class DatasetRegistry:
+    """
+    Versioned dataset metadata stored in data/datasets.json.
+
+    Each registration of a file whose checksum differs from the latest version
+    creates a new version. Versions are not copied: an entry pins the file's
+    size, modification time and checksum, and a version whose file no longer
+    matches them refuses to open. Opened datasets are np.memmap views kept in
+    a bounded LRU cache, so repeated opens reuse the existing mapping.
+    """
+
+    def __init__(self, data_path: Path, max_open: int = DEFAULT_MAX_OPEN):
+        self.data_path = Path(data_path)
+        self.registry_path = self.data_path / 'datasets.json'
+        self.max_open = max_open
+        try:
+            self._datasets: Dict[str, List[Dict[str, Any]]] = load_json(self.registry_path) or {}
+        except IOError as e:
+            # Start empty rather than block the project; the next save would overwrite the file
+            console.log(f"[red]Could not load {self.registry_path} ({str(e)}); "
+                        f"copied to {quarantine(self.data_path.parent, self.registry_path)}[/red]")
+            self._datasets = {}
+        self._open: "OrderedDict[Tuple[str, int], np.memmap]" = OrderedDict()
+
+    def names(self) -> List[str]:
+        return sorted(self._datasets)
+
+    def versions(self, name: str) -> List[Dict[str, Any]]:
+        return list(self._datasets.get(name, []))
+
+    def get(self, name: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """Metadata for a dataset version, defaulting to the latest."""
+        versions = self._datasets.get(name)
+        if not versions:
+            raise KeyError(f"Unknown dataset: {name}")
+        if version is None:
+            return versions[-1]
+        for entry in versions:
+            if entry['version'] == version:
+                return entry
+        raise KeyError(f"Dataset {name} has no version {version}")
+
+    def _resolve(self, entry: Dict[str, Any]) -> Path:
+        path = Path(entry['path'])
+        return path if path.is_absolute() else self.data_path / path
+
+    def register(self, name: str, path: Path, shape: Optional[Tuple[int, ...]] = None,
+                 dtype: Optional[str] = None, order: str = 'C') -> Dict[str, Any]:
+        """
+        Register a .npy file or raw binary array under a dataset name.
+
+        Raw files need an explicit shape and dtype; .npy headers are read for
+        them. Re-registering unchanged contents returns the existing version.
+        """
+        path = Path(path).resolve()
+        if path.suffix == '.npy':
+            # Mapping the file parses the header for every .npy version numpy
+            # supports, and rejects the others, without reading any data
+            array = np.load(path, mmap_mode='r')
+            shape, np_dtype, offset = array.shape, array.dtype, array.offset
+            order = 'F' if array.flags.f_contiguous and not array.flags.c_contiguous else 'C'
+            del array
+            file_format = 'npy'
+        else:
+            if shape is None or dtype is None:
+                raise ValueError("Raw binary datasets need a shape and dtype")
+            np_dtype = np.dtype(dtype)
+            offset = 0
+            file_format = 'raw'
+            expected = prod(shape) * np_dtype.itemsize
+            if path.stat().st_size != expected:
+                raise ValueError(f"{path} holds {path.stat().st_size} bytes, expected {expected} "
+                                 f"for shape {tuple(shape)} of {np_dtype}")
+
+        checksum = file_sha256(path)
+        stat = path.stat()
+        versions = self._datasets.setdefault(name, [])
+        if versions and versions[-1]['checksum'] == checksum:
+            latest = versions[-1]
+            if latest.get('mtime_ns') != stat.st_mtime_ns:
+                # Same contents rewritten or touched: pin the new timestamp
+                latest['mtime_ns'] = stat.st_mtime_ns
+                save_json(self._datasets, self.registry_path)
+            return latest
+
+        try:
+            stored_path = str(path.relative_to(self.data_path.resolve()))
+        except ValueError:
+            stored_path = str(path)
+
+        entry = {
+            'version': versions[-1]['version'] + 1 if versions else 1,
+            'path': stored_path,
+            'format': file_format,
+            'shape': list(shape),
+            'dtype': np.lib.format.dtype_to_descr(np_dtype),
+            'order': order,
+            'offset': offset,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': checksum,
+            'registered': datetime.now().isoformat()
+        }
+        versions.append(entry)
+        save_json(self._datasets, self.registry_path)
+        return entry
+
+    def open(self, name: str, version: Optional[int] = None) -> np.memmap:
+        """Open a dataset version as a read-only memory map."""
+        entry = self.get(name, version)
+        key = (name, entry['version'])
+        if key in self._open:
+            self._open.move_to_end(key)
+            return self._open[key]
+
+        path = self._resolve(entry)
+        self._check_unchanged(name, entry, path)
+
+        array = np.memmap(path, dtype=_dtype(entry['dtype']), mode='r', offset=entry['offset'],
+                          shape=tuple(entry['shape']), order=entry['order'])
+        self._open[key] = array
+        while len(self._open) > self.max_open:
+            self._open.popitem(last=False)
+        return array
+
+    def _check_unchanged(self, name: str, entry: Dict[str, Any], path: Path) -> None:
+        """
+        Refuse a version whose file was modified since it was registered.
+
+        A matching size and modification time are trusted; otherwise the
+        checksum decides, so a file rewritten with identical contents stays
+        usable and has its new modification time pinned.
+        """
+        stat = path.stat()
+        if stat.st_size == entry['size'] and stat.st_mtime_ns == entry.get('mtime_ns'):
+            return
+        if stat.st_size != entry['size'] or file_sha256(path) != entry['checksum']:
+            raise IOError(f"{path} was modified after dataset {name} v{entry['version']} was registered; "
+                          f"register it again to record a new version")
+        entry['mtime_ns'] = stat.st_mtime_ns
+        save_json(self._datasets, self.registry_path)
+
+    def view(self, name: str, index: Any, version: Optional[int] = None) -> np.ndarray:
+        """Zero-copy slice of a dataset, e.g. view('prices', np.s_[1000:2000])."""
+        return self.open(name, version)[index]
+
+    def verify(self, name: str, version: Optional[int] = None) -> bool:
+        """Recompute a dataset's checksum and compare it with the registered one."""
+        entry = self.get(name, version)
+        return file_sha256(self._resolve(entry)) == entry['checksum']
+
+    def close(self) -> None:
+        """Drop all cached memory maps."""
+        self._open.clear()
@@ -0,0 +1,241 @@
+"""
+Resident summaries and on-demand bodies for a project's experiments.
+Without a memory bound every experiment stays in memory. With one, full
+records are spilled to an on-disk archive and hydrated through an LRU cache
+that holds a bounded number of bytes.
+"""
+
+import os
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.models import Experiment, experiment_id
+from core.records import experiment_to_dict, experiment_from_dict, record_fingerprint
+from utils.record_archive import RecordArchive
+
+# Spilled records are rewritten once superseded versions outnumber live ones
+COMPACT_RATIO = 2
+
+@dataclass
+class CacheStats:
+    """Hit and miss counts of the experiment cache."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    resident: int = 0
+    resident_bytes: int = 0
+    max_bytes: Optional[int] = None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ExperimentView(Sequence):
+    """Experiments for a list of ids, hydrated one at a time when accessed."""
+
+    def __init__(self, collection: 'ExperimentCollection', keys: List[str]):
+        self.collection = collection
+        self.keys = keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.collection.get(key) for key in self.keys[index]]
+        return self.collection.get(self.keys[index])
+
+class ExperimentCollection(Sequence):
+    """
+    Concluded experiments in timestamp order, addressable by experiment id.
+
+    A summary of every experiment (timestamp, parameters, conclusion time and
+    the fingerprint and size of its full record) is always resident. With
+    max_bytes set, full records live in <spill_dir>/bodies.dat, keyed by id
+    and fingerprint so that unchanged experiments are not rewritten on the
+    next open, and at most max_bytes of serialized records are cached in
+    memory. Objects handed out may be evicted at any time: an experiment that
+    was changed must be put() again.
+    """
+
+    def __init__(self, spill_dir: Path, max_bytes: Optional[int] = None):
+        self.spill_dir = Path(spill_dir)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats(max_bytes=max_bytes)
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._order: List[Tuple[datetime, str]] = []
+        self._resident: 'OrderedDict[str, Tuple[Experiment, int]]' = OrderedDict()
+        self._spill = RecordArchive(self.spill_dir, 'bodies') if max_bytes is not None else None
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_bytes is not None
+
+    def _spill_key(self, key: str) -> str:
+        return f"{key}@{self._summaries[key]['fingerprint']}"
+
+    def _index(self, experiment: Experiment) -> Tuple[str, Dict[str, Any]]:
+        """Replace an experiment's summary; returns its key and serialized record."""
+        key = experiment_id(experiment)
+        record = experiment_to_dict(experiment, copy=False)
+        concluded = experiment.results.get('concluded_at')
+        summary = {
+            'timestamp': experiment.timestamp,
+            'concluded_at': datetime.fromisoformat(concluded) if concluded else experiment.timestamp,
+            'parameters': experiment.parameters,
+            'fingerprint': record_fingerprint(record),
+            'size': 0,
+        }
+        previous = self._summaries.get(key)
+        if previous is not None:
+            self._order.remove((previous['timestamp'], key))
+        self._summaries[key] = summary
+        insort(self._order, (summary['timestamp'], key))
+        return key, record
+
+    def _size(self, key: str) -> int:
+        """Serialized size of a spilled record; sizes are only tracked in bounded mode."""
+        summary = self._summaries[key]
+        if self.bounded and not summary['size']:
+            summary['size'] = self._spill.index[self._spill_key(key)][1]
+        return summary['size']
+
+    def _cache(self, key: str, experiment: Experiment) -> None:
+        size = self._size(key)
+        if key in self._resident:
+            self.stats.resident_bytes -= self._resident.pop(key)[1]
+        self._resident[key] = (experiment, size)
+        self.stats.resident_bytes += size
+        if self.bounded:
+            # Always keep the entry just added, even if it alone exceeds the budget
+            while self.stats.resident_bytes > self.max_bytes and len(self._resident) > 1:
+                _, (_, evicted) = self._resident.popitem(last=False)
+                self.stats.resident_bytes -= evicted
+                self.stats.evictions += 1
+        self.stats.resident = len(self._resident)
+
+    def load(self, experiments: Iterable[Experiment]) -> None:
+        """Replace the contents, consuming experiments one at a time."""
+        self._summaries.clear()
+        self._order.clear()
+        self._resident.clear()
+        self.stats = CacheStats(max_bytes=self.max_bytes)
+        if not self.bounded:
+            for experiment in experiments:
+                key, _ = self._index(experiment)
+                self._cache(key, experiment)
+            return
+
+        def missing() -> Iterator[Tuple[str, Dict[str, Any]]]:
+            for experiment in experiments:
+                key, record = self._index(experiment)
+                if self._spill_key(key) not in self._spill:
+                    yield self._spill_key(key), record
+        self._spill.append(missing())
+        if len(self._spill.index) > COMPACT_RATIO * max(len(self._summaries), 1):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the spill archive with only the live records."""
+        fresh = RecordArchive(self.spill_dir, 'bodies.compact')
+        for path in (fresh.data_path, fresh.index_path):
+            if path.exists():
+                path.unlink()
+        fresh.append(self._spill.iter_records(sorted(self._spill_key(key) for key in self._summaries)))
+        # Without an index the archive reads as empty, so a crash part way
+        # through only costs re-spilling on the next open
+        self._spill.index_path.unlink()
+        os.replace(fresh.data_path, self._spill.data_path)
+        if fresh.index_path.exists():
+            os.replace(fresh.index_path, self._spill.index_path)
+        self._spill = RecordArchive(self.spill_dir, 'bodies')
+
+    def put(self, experiment: Experiment) -> str:
+        """Add or replace an experiment; returns its id."""
+        key, record = self._index(experiment)
+        if self.bounded and self._spill_key(key) not in self._spill:
+            self._spill.append([(self._spill_key(key), record)])
+        self._cache(key, experiment)
+        return key
+
+    def remove(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            summary = self._summaries.pop(key, None)
+            if summary is None:
+                continue
+            self._order.remove((summary['timestamp'], key))
+            if key in self._resident:
+                self.stats.resident_bytes -= self._resident.pop(key)[1]
+        self.stats.resident = len(self._resident)
+
+    def contains(self, key: str) -> bool:
+        return key in self._summaries
+
+    def keys(self) -> List[str]:
+        """Experiment ids, oldest first."""
+        return [key for _, key in self._order]
+
+    def summary(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._summaries.get(key)
+
+    def fingerprints(self) -> Dict[str, str]:
+        return {key: summary['fingerprint'] for key, summary in self._summaries.items()}
+
+    def get(self, key: str) -> Optional[Experiment]:
+        """The full experiment for an id, hydrated from the spill archive on a miss."""
+        if key not in self._summaries:
+            return None
+        cached = self._resident.get(key)
+        if cached is not None:
+            self._resident.move_to_end(key)
+            self.stats.hits += 1
+            return cached[0]
+        self.stats.misses += 1
+        experiment = experiment_from_dict(self._spill.get(self._spill_key(key)))
+        self._cache(key, experiment)
+        return experiment
+
+    def since(self, start: datetime, newest_first: bool = False) -> ExperimentView:
+        """Experiments started at or after start, hydrated when accessed."""
+        position = bisect_left(self._order, (start,))
+        keys = [key for _, key in self._order[position:]]
+        return ExperimentView(self, keys[::-1] if newest_first else keys)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get(key) for _, key in self._order[index]]
+        return self.get(self._order[index][1])
+
+    def __iter__(self) -> Iterator[Experiment]:
+        """
+        Every experiment, oldest first.
+
+        In bounded mode uncached experiments are streamed through one file
+        handle and not added to the cache, so a full scan does not flush it.
+        """
+        keys = self.keys()
+        if not self.bounded:
+            for key in keys:
+                cached = self._resident.get(key)
+                if cached is not None:
+                    yield cached[0]
+            return
+        spill_keys = [self._spill_key(key) for key in keys]
+        for spill_key, record in self._spill.iter_records(spill_keys):
+            key = spill_key.partition('@')[0]
+            cached = self._resident.get(key)
+            if cached is not None:
+                self.stats.hits += 1
+                yield cached[0]
+            else:
+                self.stats.misses += 1
+                yield experiment_from_dict(record)
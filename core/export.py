@@ -0,0 +1,263 @@
+"""
+Chunked export of research data for analysis in pandas and similar tools.
+Streams ideas, paper notes, experiments, insights and daily goal history as
+flat tables to CSV, and to Parquet or Arrow IPC when pyarrow is installed.
+"""
+
+import csv
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.insight_store import project_insights
+from core.models import experiment_id
+from core.records import idea_to_dict, note_to_dict
+from utils.file_handlers import DateTimeEncoder, save_json, load_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Rows buffered per write; bounds memory independently of project size
+DEFAULT_CHUNK_SIZE = 5000
+
+FORMAT_EXTENSIONS = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+def available_formats() -> List[str]:
+    """Export formats usable in this environment."""
+    return ['csv', 'parquet', 'arrow'] if pa is not None else ['csv']
+
+def flatten(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Flatten nested dicts into dotted keys; lists become JSON strings."""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, cls=DateTimeEncoder)
+        elif isinstance(value, datetime):
+            flat[name] = value.isoformat()
+        else:
+            flat[name] = value
+    return flat
+
+def _column_type(current: Optional[str], value: Any) -> Optional[str]:
+    """Widen a column's inferred type to accommodate another value."""
+    if value is None:
+        return current
+    if isinstance(value, bool):
+        kind = 'bool'
+    elif isinstance(value, (int, float)):
+        kind = 'float'
+    else:
+        kind = 'string'
+    if current is None or current == kind:
+        return kind
+    return 'string'
+
+class ProjectExporter:
+    """
+    Writes each data source of a research log to its own table file.
+
+    A first streaming pass collects the column set, column types and a
+    content digest; if the digest matches the manifest from the previous
+    export the source is skipped, otherwise a second pass writes it in
+    fixed-size chunks to a temporary file that replaces the old export.
+    """
+
+    def __init__(self, research_log, output_dir: Path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.log = research_log
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.manifest_path = self.output_dir / 'manifest.json'
+
+    def sources(self) -> Dict[str, Callable[[], Iterator[Dict[str, Any]]]]:
+        return {
+            'ideas': self._idea_rows,
+            'paper_notes': self._note_rows,
+            'experiments': self._experiment_rows,
+            'insights': self._insight_rows,
+            'daily_goals': self._goal_rows,
+        }
+
+    def _idea_rows(self) -> Iterator[Dict[str, Any]]:
+        for idea in self.log.iter_ideas():
+            record = idea_to_dict(idea)
+            record['paper_notes'] = len(idea.paper_notes)
+            yield flatten(record)
+
+    def _note_rows(self) -> Iterator[Dict[str, Any]]:
+        for note in self.log.paper_notes:
+            yield note_to_dict(note)
+
+    def _experiment_rows(self) -> Iterator[Dict[str, Any]]:
+        # iter_experiments streams from the bounded cache; never collect it into a list
+        for experiment in self.log.iter_experiments():
+            yield self._experiment_row(experiment, 'concluded')
+        if self.log.current_experiment is not None:
+            yield self._experiment_row(self.log.current_experiment, 'ongoing')
+
+    def _experiment_row(self, experiment, status: str) -> Dict[str, Any]:
+        row = {
+            'experiment_id': experiment_id(experiment),
+            'timestamp': experiment.timestamp.isoformat(),
+            'status': status,
+            'hypothesis': experiment.hypothesis,
+            'methodology': experiment.methodology,
+            'conclusions': experiment.conclusions,
+            'next_steps': experiment.next_steps,
+            'code_version': experiment.code_version,
+            'related_ideas': ';'.join(experiment.related_ideas),
+        }
+        row.update(flatten(experiment.parameters, 'param.'))
+        row.update(flatten(experiment.metrics, 'metric.'))
+        return row
+
+    def _insight_rows(self) -> Iterator[Dict[str, Any]]:
+        for insight in project_insights(self.log.insights, self.log.daily_logs):
+            yield {
+                'insight_id': insight['id'],
+                'timestamp': insight['timestamp'],
+                'day': insight['timestamp'][:10],
+                'observation': insight['observation'],
+                'implications': insight['implications'],
+                'experiment_id': insight['experiment_id'],
+                'idea_ids': ';'.join(insight['idea_ids']),
+            }
+
+    def _goal_rows(self) -> Iterator[Dict[str, Any]]:
+        for day, summary in self.log.daily_logs.iter_days():
+            goal_status = summary.get('goal_status', {})
+            for i, goal in enumerate(summary.get('goals', []), 1):
+                status = goal_status.get(str(i), {})
+                yield {
+                    'day': day.isoformat(),
+                    'goal_index': i,
+                    'goal': str(goal),
+                    'status': status.get('status', 'pending'),
+                    'completion_time': status.get('completion_time'),
+                    'original_date': status.get('original_date'),
+                    'progress_note_count': len(status.get('progress_notes', [])),
+                }
+
+    def _profile(self, rows: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Optional[str]], str, int]:
+        """Stream once to collect column types, a content digest and the row count."""
+        columns: Dict[str, Optional[str]] = {}
+        digest = hashlib.sha256()
+        count = 0
+        for row in rows:
+            for key, value in row.items():
+                columns[key] = _column_type(columns.get(key), value)
+            digest.update(json.dumps(row, sort_keys=True, cls=DateTimeEncoder).encode('utf-8'))
+            count += 1
+        return columns, digest.hexdigest(), count
+
+    def _chunks(self, rows: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _write_csv(self, rows: Iterable[Dict[str, Any]], columns: Dict[str, Optional[str]], path: Path) -> None:
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(columns))
+            writer.writeheader()
+            for chunk in self._chunks(rows):
+                writer.writerows(chunk)
+
+    def _arrow_schema(self, columns: Dict[str, Optional[str]]):
+        types = {'bool': pa.bool_(), 'float': pa.float64(), 'string': pa.string(), None: pa.string()}
+        return pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+    def _arrow_batch(self, chunk: List[Dict[str, Any]], columns: Dict[str, Optional[str]], schema):
+        arrays = []
+        for name, kind in columns.items():
+            values = [row.get(name) for row in chunk]
+            if kind in ('string', None):
+                values = [None if v is None else str(v) for v in values]
+            elif kind == 'float':
+                values = [None if v is None else float(v) for v in values]
+            arrays.append(values)
+        return pa.RecordBatch.from_arrays([pa.array(v, type=f.type) for v, f in zip(arrays, schema)], schema=schema)
+
+    def _write_arrow(self, rows: Iterable[Dict[str, Any]], columns: Dict[str, Optional[str]],
+                     path: Path, file_format: str) -> None:
+        schema = self._arrow_schema(columns)
+        if file_format == 'parquet':
+            writer = pq.ParquetWriter(str(path), schema)
+            write = writer.write_batch
+        else:
+            sink = pa.OSFile(str(path), 'wb')
+            writer = pa.ipc.new_file(sink, schema)
+            write = writer.write_batch
+        try:
+            for chunk in self._chunks(rows):
+                write(self._arrow_batch(chunk, columns, schema))
+        finally:
+            writer.close()
+            if file_format == 'arrow':
+                sink.close()
+
+    def export(self, formats: Iterable[str] = ('csv',),
+               progress: Optional[Callable[[int, int], None]] = None,
+               cancelled: Optional[threading.Event] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Export every source in the requested formats.
+
+        Returns a summary per source with its row count, the files written and
+        whether the previous export was still current. progress is called with
+        (sources done, number of sources). When cancelled is set, the manifest
+        is saved for the sources already exported and InterruptedError is raised.
+        """
+        formats = list(formats)
+        for file_format in formats:
+            if file_format not in FORMAT_EXTENSIONS:
+                raise ValueError(f"Unknown export format: {file_format}")
+            if file_format != 'csv' and pa is None:
+                raise ValueError(f"Exporting to {file_format} requires pyarrow")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = load_json(self.manifest_path) or {}
+        summary = {}
+
+        sources = self.sources()
+        for done, (name, rows) in enumerate(sources.items(), 1):
+            if cancelled is not None and cancelled.is_set():
+                save_json(manifest, self.manifest_path)
+                raise InterruptedError(f"Export cancelled after {done - 1} of {len(sources)} sources")
+            columns, digest, count = self._profile(rows())
+            previous = manifest.get(name, {})
+            written, skipped = [], []
+            for file_format in formats:
+                path = self.output_dir / f"{name}.{FORMAT_EXTENSIONS[file_format]}"
+                if previous.get(file_format) == digest and path.exists():
+                    skipped.append(path)
+                    continue
+
+                temp_path = path.with_name(path.name + '.tmp')
+                if file_format == 'csv':
+                    self._write_csv(rows(), columns, temp_path)
+                else:
+                    self._write_arrow(rows(), columns, temp_path, file_format)
+                temp_path.replace(path)
+                written.append(path)
+                previous[file_format] = digest
+
+            manifest[name] = previous
+            summary[name] = {'rows': count, 'written': written, 'unchanged': skipped}
+            if progress is not None:
+                progress(done, len(sources))
+
+        save_json(manifest, self.manifest_path)
+        return summary
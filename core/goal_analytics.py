@@ -0,0 +1,216 @@
+"""
+Goal completion analytics over the daily log history.
+The history is held as columnar NumPy arrays with one row per goal per logged
+day, cached on disk and updated only for days whose logs changed.
+"""
+
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.daily_logs import DailyLogStore
+
+STATUS_CODES = {'pending': 0, 'in_progress': 1, 'completed': 2, 'blocked': 3}
+OTHER_STATUS = 4
+COMPLETED = STATUS_CODES['completed']
+BLOCKED = STATUS_CODES['blocked']
+
+# Day ordinal used where a goal has no completion date
+NO_DATE = -1
+
+_COLUMNS = {'day': np.int32, 'goal': np.int32, 'status': np.int8, 'origin': np.int32, 'completed_on': np.int32}
+
+def _ordinal(value: Any) -> int:
+    if not value:
+        return NO_DATE
+    try:
+        return datetime.fromisoformat(str(value)).date().toordinal()
+    except ValueError:
+        return NO_DATE
+
+class GoalHistory:
+    """
+    Columnar goal history with vectorized metrics.
+
+    Days before today are treated as closed: their rows are cached in
+    goal_history.npz together with a fingerprint of each day's log, and a
+    refresh re-reads only the closed days whose fingerprint is new or has
+    changed, so edits to past days are picked up. Today's goals are still
+    changing, so they are kept apart and rebuilt on every refresh.
+    """
+
+    def __init__(self, daily_logs: DailyLogStore, cache_path: Path):
+        self.daily_logs = daily_logs
+        self.cache_path = Path(cache_path)
+        self.goals: List[str] = []
+        self._goal_ids: Dict[str, int] = {}
+        self._closed = {name: np.empty(0, dtype=dtype) for name, dtype in _COLUMNS.items()}
+        self._today = {name: np.empty(0, dtype=dtype) for name, dtype in _COLUMNS.items()}
+        self._fingerprints: Dict[date, Tuple[int, int]] = {}
+        self._loaded = False
+
+    def _load_cache(self) -> None:
+        self._loaded = True
+        if not self.cache_path.exists():
+            return
+        try:
+            with np.load(self.cache_path) as cache:
+                closed = {name: cache[name].astype(dtype) for name, dtype in _COLUMNS.items()}
+                goals = [str(goal) for goal in cache['goals']]
+                fingerprints = {
+                    date.fromordinal(int(day)): (int(first), int(second))
+                    for day, first, second in cache['fingerprints']
+                }
+        except (OSError, KeyError, ValueError):
+            # An unreadable cache, or one written before days were
+            # fingerprinted, is rebuilt from the logs
+            return
+        self._closed, self.goals, self._fingerprints = closed, goals, fingerprints
+        self._goal_ids = {goal: i for i, goal in enumerate(self.goals)}
+
+    def _save_cache(self) -> None:
+        temp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        fingerprints = np.array(
+            [(day.toordinal(), *value) for day, value in sorted(self._fingerprints.items())],
+            dtype=np.int64
+        ).reshape(-1, 3)
+        with open(temp_path, 'wb') as f:
+            np.savez(f, goals=np.array(self.goals, dtype=str), fingerprints=fingerprints, **self._closed)
+        os.replace(temp_path, self.cache_path)
+
+    def _rows(self, day: date, summary: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        goals = summary.get('goals', [])
+        goal_status = summary.get('goal_status', {})
+        rows = {name: np.empty(len(goals), dtype=dtype) for name, dtype in _COLUMNS.items()}
+        for i, goal in enumerate(goals):
+            text = str(goal).strip()
+            if text not in self._goal_ids:
+                self._goal_ids[text] = len(self.goals)
+                self.goals.append(text)
+            status = goal_status.get(str(i + 1), {})
+            origin = _ordinal(status.get('original_date'))
+            rows['day'][i] = day.toordinal()
+            rows['goal'][i] = self._goal_ids[text]
+            rows['status'][i] = STATUS_CODES.get(status.get('status', 'pending'), OTHER_STATUS)
+            rows['origin'][i] = origin if origin != NO_DATE else day.toordinal()
+            rows['completed_on'][i] = _ordinal(status.get('completion_time'))
+        return rows
+
+    def refresh(self, today: Optional[date] = None,
+                today_summary: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Re-read closed days that are new or changed since the last refresh,
+        drop days whose logs are gone, and rebuild today's rows.
+
+        today_summary, when given, is used instead of re-reading today's log.
+        Returns the number of closed days read.
+        """
+        if not self._loaded:
+            self._load_cache()
+        today = today or datetime.now().date()
+
+        current = self.daily_logs.fingerprints(end=today)
+        stale = {day for day in set(current) | set(self._fingerprints)
+                 if current.get(day) != self._fingerprints.get(day)}
+        if stale:
+            keep = ~np.isin(self._closed['day'], [day.toordinal() for day in stale])
+            read = list(self.daily_logs.iter_days(min(stale), today, only=stale))
+            new_rows = [self._rows(day, summary) for day, summary in read]
+            for name in _COLUMNS:
+                self._closed[name] = np.concatenate([self._closed[name][keep]] + [rows[name] for rows in new_rows])
+            # Keep rows in day order, as appending closed days one by one did
+            order = np.argsort(self._closed['day'], kind='stable')
+            self._closed = {name: column[order] for name, column in self._closed.items()}
+            self._fingerprints = current
+            self._save_cache()
+        else:
+            read = []
+
+        if today_summary is None:
+            today_summary = self.daily_logs.load(today) or {}
+        self._today = self._rows(today, today_summary)
+        return len(read)
+
+    def column(self, name: str) -> np.ndarray:
+        """One column across closed days and today."""
+        return np.concatenate([self._closed[name], self._today[name]])
+
+    def completion_by_day(self, window: int = 7) -> Dict[str, np.ndarray]:
+        """
+        Goals set and completed per logged day, the daily completion rate and a
+        trailing completion rate over `window` logged days.
+        """
+        day = self.column('day')
+        days, index = np.unique(day, return_inverse=True)
+        totals = np.bincount(index, minlength=len(days))
+        completed = np.bincount(index, weights=self.column('status') == COMPLETED, minlength=len(days))
+
+        cumulative_total = np.concatenate([[0], np.cumsum(totals)])
+        cumulative_done = np.concatenate([[0], np.cumsum(completed)])
+        lagged = np.maximum(np.arange(1, len(days) + 1) - window, 0)
+        window_total = cumulative_total[1:] - cumulative_total[lagged]
+        window_done = cumulative_done[1:] - cumulative_done[lagged]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'day': days,
+                'total': totals,
+                'completed': completed.astype(np.int64),
+                'rate': np.where(totals > 0, completed / np.maximum(totals, 1), np.nan),
+                'rolling_rate': np.where(window_total > 0, window_done / np.maximum(window_total, 1), np.nan),
+            }
+
+    def time_to_completion(self) -> np.ndarray:
+        """Days from a goal's original date to its completion, one entry per completed goal."""
+        done = (self.column('status') == COMPLETED) & (self.column('completed_on') != NO_DATE)
+        return (self.column('completed_on')[done] - self.column('origin')[done]).astype(np.int64)
+
+    def carry_overs(self) -> Dict[str, np.ndarray]:
+        """
+        Carried-over goals per logged day, and how many days each goal appeared.
+
+        A row is a carry-over when its original date precedes the day it was
+        logged on.
+        """
+        day = self.column('day')
+        days, index = np.unique(day, return_inverse=True)
+        carried = self.column('origin') < day
+        return {
+            'day': days,
+            'carried': np.bincount(index, weights=carried, minlength=len(days)).astype(np.int64),
+            'appearances': np.bincount(self.column('goal'), minlength=len(self.goals)),
+        }
+
+    def blocked_streaks(self) -> Dict[str, np.ndarray]:
+        """
+        Longest and current runs of consecutive logged days each goal spent blocked.
+
+        Returns goal ids with their longest streak and the streak still open on
+        the goal's latest logged day (0 when it is no longer blocked).
+        """
+        goal, day, status = self.column('goal'), self.column('day'), self.column('status')
+        order = np.lexsort((day, goal))
+        goal, day, blocked = goal[order], day[order], status[order] == BLOCKED
+
+        continues = np.zeros(len(goal), dtype=bool)
+        continues[1:] = (goal[1:] == goal[:-1]) & blocked[1:] & blocked[:-1]
+        starts = blocked & ~continues
+        run_ids = np.cumsum(starts) - 1
+        lengths = np.bincount(run_ids[blocked], minlength=int(starts.sum()))
+        run_goals = goal[starts]
+
+        longest = np.zeros(len(self.goals), dtype=np.int64)
+        np.maximum.at(longest, run_goals, lengths)
+
+        # A goal's last row closes its history; an open run ends there
+        last_row = np.ones(len(goal), dtype=bool)
+        last_row[:-1] = goal[1:] != goal[:-1]
+        current = np.zeros(len(self.goals), dtype=np.int64)
+        open_runs = last_row & blocked
+        current[goal[open_runs]] = lengths[run_ids[open_runs]]
+
+        ids = np.flatnonzero(longest)
+        return {'goal': ids, 'longest': longest[ids], 'current': current[ids]}
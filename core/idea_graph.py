@@ -0,0 +1,222 @@
+"""
+Dependency graph index over research ideas.
+Maintains prerequisite and related-idea adjacency incrementally as ideas are
+saved, so dependency queries never rebuild the graph from the full idea set.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from core.models import ResearchIdea, IdeaStatus
+
+# Statuses that count as a finished prerequisite; a READY idea has not
+# started yet, so its dependents stay blocked until it is completed
+SATISFIED_STATUSES = {IdeaStatus.COMPLETED}
+
+class IdeaGraph:
+    """
+    Adjacency index over idea prerequisites and related-idea links.
+
+    Edges point from an idea to the ideas it depends on; the reverse adjacency
+    and a per-idea count of unmet prerequisites are kept alongside so that
+    readiness and "what does finishing X unblock" are answered from local
+    neighbourhoods only.
+    """
+
+    def __init__(self):
+        self._prerequisites: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
+        self._related_out: Dict[str, Set[str]] = {}
+        self._related_in: Dict[str, Set[str]] = defaultdict(set)
+        self._status: Dict[str, IdeaStatus] = {}
+        self._priority: Dict[str, int] = {}
+        self._unmet: Dict[str, int] = {}
+
+    def __contains__(self, idea_id: str) -> bool:
+        return idea_id in self._status
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def is_satisfied(self, idea_id: str) -> bool:
+        """Whether an idea counts as finished for its dependents."""
+        return self._status.get(idea_id) in SATISFIED_STATUSES
+
+    def update(self, idea: ResearchIdea) -> None:
+        """Insert or refresh an idea, adjusting only the edges that changed."""
+        idea_id = idea.id
+        was_satisfied = self.is_satisfied(idea_id)
+        self._status[idea_id] = idea.status
+        self._priority[idea_id] = idea.priority
+
+        # Propagate a change in finished state to direct dependents
+        now_satisfied = self.is_satisfied(idea_id)
+        if was_satisfied != now_satisfied:
+            delta = -1 if now_satisfied else 1
+            for dependent in self._dependents.get(idea_id, ()):
+                self._unmet[dependent] += delta
+
+        old_prerequisites = self._prerequisites.get(idea_id, set())
+        new_prerequisites = set(idea.prerequisites)
+        for prerequisite in old_prerequisites - new_prerequisites:
+            self._dependents[prerequisite].discard(idea_id)
+        for prerequisite in new_prerequisites - old_prerequisites:
+            self._dependents[prerequisite].add(idea_id)
+        self._prerequisites[idea_id] = new_prerequisites
+        self._unmet[idea_id] = sum(1 for p in new_prerequisites if not self.is_satisfied(p))
+
+        old_related = self._related_out.get(idea_id, set())
+        new_related = set(idea.related_ideas)
+        for related in old_related - new_related:
+            self._related_in[related].discard(idea_id)
+        for related in new_related - old_related:
+            self._related_in[related].add(idea_id)
+        self._related_out[idea_id] = new_related
+
+    def remove(self, idea_id: str) -> None:
+        """Drop an idea and its outgoing edges; dependents keep it as unmet."""
+        if idea_id not in self._status:
+            return
+        if self.is_satisfied(idea_id):
+            for dependent in self._dependents.get(idea_id, ()):
+                self._unmet[dependent] += 1
+
+        for prerequisite in self._prerequisites.pop(idea_id, set()):
+            self._dependents[prerequisite].discard(idea_id)
+        for related in self._related_out.pop(idea_id, set()):
+            self._related_in[related].discard(idea_id)
+        del self._status[idea_id]
+        self._priority.pop(idea_id, None)
+        self._unmet.pop(idea_id, None)
+
+    def prerequisites(self, idea_id: str) -> Set[str]:
+        """Direct prerequisites of an idea."""
+        return set(self._prerequisites.get(idea_id, ()))
+
+    def dependents(self, idea_id: str) -> Set[str]:
+        """Ideas that list this idea as a direct prerequisite."""
+        return set(self._dependents.get(idea_id, ()))
+
+    def related(self, idea_id: str) -> Set[str]:
+        """Ideas linked to this one in either direction."""
+        return self._related_out.get(idea_id, set()) | self._related_in.get(idea_id, set())
+
+    def prerequisite_closure(self, idea_id: str) -> Set[str]:
+        """All ideas this idea transitively depends on."""
+        return self._reachable(idea_id, self._prerequisites)
+
+    def dependent_closure(self, idea_id: str) -> Set[str]:
+        """All ideas that transitively depend on this idea."""
+        return self._reachable(idea_id, self._dependents)
+
+    def _reachable(self, start: str, edges: Dict[str, Set[str]]) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(edges.get(start, ()))
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(n for n in edges.get(node, ()) if n not in seen)
+        return seen
+
+    def would_create_cycle(self, idea_id: str, prerequisite_id: str) -> bool:
+        """Whether adding prerequisite_id as a prerequisite of idea_id closes a cycle."""
+        if idea_id == prerequisite_id:
+            return True
+        return idea_id in self.prerequisite_closure(prerequisite_id)
+
+    def unmet_prerequisites(self, idea_id: str) -> int:
+        """Number of direct prerequisites that are not yet finished."""
+        return self._unmet.get(idea_id, 0)
+
+    def unblocked_by(self, idea_id: str) -> List[str]:
+        """Dependents whose only unfinished prerequisite is the given idea."""
+        remaining = 0 if self.is_satisfied(idea_id) else 1
+        return sorted(
+            dependent for dependent in self._dependents.get(idea_id, ())
+            if self._unmet.get(dependent, 0) - remaining == 0
+        )
+
+    def ready_order(self) -> List[str]:
+        """
+        READY ideas in topological order, prerequisites first.
+
+        Ties are broken by priority then id. Ideas caught in a prerequisite
+        cycle can never be ordered and are left out.
+        """
+        ready = {i for i, status in self._status.items() if status == IdeaStatus.READY}
+        indegree = {i: sum(1 for p in self._prerequisites.get(i, ()) if p in ready) for i in ready}
+        heap = [(self._priority.get(i, 0), i) for i, degree in indegree.items() if degree == 0]
+        heapq.heapify(heap)
+
+        order = []
+        while heap:
+            _, idea_id = heapq.heappop(heap)
+            order.append(idea_id)
+            for dependent in self._dependents.get(idea_id, ()):
+                if dependent in indegree:
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        heapq.heappush(heap, (self._priority.get(dependent, 0), dependent))
+        return order
+
+    def find_cycles(self) -> List[List[str]]:
+        """
+        Strongly connected prerequisite cycles, via an iterative Tarjan search.
+
+        Iterative so that long dependency chains cannot hit the recursion limit.
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        cycles: List[List[str]] = []
+        counter = 0
+
+        for root in self._prerequisites:
+            if root in index:
+                continue
+            work = [(root, iter(self._prerequisites.get(root, ())))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in self._status:
+                        continue
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self._prerequisites.get(child, ()))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self._prerequisites.get(node, ()):
+                        cycles.append(sorted(component))
+
+        return cycles
@@ -0,0 +1,263 @@
+"""
+Append-only store of research insights.
+Each insight is a checksummed JSON line with a stable id and links to
+experiments and ideas by their stable ids; in-memory indexes by time,
+experiment and idea locate matching lines without reading the others.
+"""
+
+import os
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.wal import encode_line, decode_line
+from utils.file_handlers import save_json, load_json, exclusive_lock
+
+class InsightResults(Sequence):
+    """
+    Insights matching a query, oldest first, read from disk only when accessed.
+
+    Slicing reads just the requested records, so a page of a large result
+    set costs one seek per insight on the page.
+    """
+
+    def __init__(self, store: 'InsightStore', positions: List[int]):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.store._read(self.positions[index])
+        return self.store._read([self.positions[index]])[0]
+
+class InsightStore:
+    """
+    Insights in insights.jsonl, indexed by id, time, experiment and idea.
+
+    Lines are only ever appended. The indexes are rebuilt from the log, but
+    insights.idx.json saves them together with the number of bytes they
+    cover, so opening a project only scans insights appended since. Lines
+    appended by another process are picked up before every lookup.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.log_path = self.directory / 'insights.jsonl'
+        self.lock_path = self.directory / 'insights.lock'
+        self.index_path = self.directory / 'insights.idx.json'
+        self._reset()
+        self._load_index()
+
+    def _reset(self) -> None:
+        self._length = 0
+        self._locations: List[Tuple[int, int]] = []
+        self._timestamps: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._by_time: List[Tuple[str, int]] = []
+        self._by_experiment: Dict[str, List[int]] = {}
+        self._by_idea: Dict[str, List[int]] = {}
+        self._index_dirty = False
+
+    def _add_to_index(self, record: Dict[str, Any], offset: int, length: int) -> None:
+        position = len(self._locations)
+        self._locations.append((offset, length))
+        self._timestamps.append(record['timestamp'])
+        self._ids[record['id']] = position
+        insort(self._by_time, (record['timestamp'], position))
+        if record.get('experiment_id'):
+            self._by_experiment.setdefault(record['experiment_id'], []).append(position)
+        for idea_id in record.get('idea_ids', []):
+            self._by_idea.setdefault(idea_id, []).append(position)
+        self._index_dirty = True
+
+    def _load_index(self) -> None:
+        try:
+            saved = load_json(self.index_path)
+        except IOError:
+            saved = None
+        if not saved or not self.log_path.exists() or saved['length'] > self.log_path.stat().st_size:
+            return
+        for record_id, timestamp, experiment_id, idea_ids, offset, length in saved['entries']:
+            self._add_to_index({'id': record_id, 'timestamp': timestamp, 'experiment_id': experiment_id,
+                                'idea_ids': idea_ids}, offset, length)
+        self._length = saved['length']
+        self._index_dirty = False
+
+    def save_index(self) -> None:
+        """Persist the indexes so the next open only scans newer lines."""
+        if not self._index_dirty:
+            return
+        experiments = {position: key for key, found in self._by_experiment.items() for position in found}
+        ideas: Dict[int, List[str]] = {}
+        for idea_id, found in self._by_idea.items():
+            for position in found:
+                ideas.setdefault(position, []).append(idea_id)
+        entries = [
+            [record_id, self._timestamps[position], experiments.get(position), ideas.get(position, []),
+             *self._locations[position]]
+            for record_id, position in sorted(self._ids.items(), key=lambda item: item[1])
+        ]
+        save_json({'length': self._length, 'entries': entries}, self.index_path)
+        self._index_dirty = False
+
+    def _refresh(self) -> int:
+        """
+        Index lines appended since the last scan; returns the length of the
+        valid prefix, which is short of the file size after a torn write.
+        """
+        if not self.log_path.exists():
+            return 0
+        if self.log_path.stat().st_size < self._length:
+            # The log was replaced behind our back; start over
+            self._reset()
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._length)
+            for line in f:
+                record = decode_line(line)
+                if record is None:
+                    break
+                self._add_to_index(record, self._length, len(line))
+                self._length += len(line)
+        return self._length
+
+    def exists(self) -> bool:
+        return self.log_path.exists()
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._locations)
+
+    def append_many(self, insights: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Durably append insights, assigning each a stable id.
+
+        Each insight needs 'observation', 'implications' and 'timestamp', and
+        may carry 'experiment_id' and 'idea_ids'. Returns the stored records.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Ids are numbered from the insights already in the log, so the scan,
+        # the numbering and the write must not interleave with another writer's
+        with exclusive_lock(self.lock_path):
+            valid_length = self._refresh()
+            if self.log_path.exists() and valid_length < self.log_path.stat().st_size:
+                # Drop a torn line left by a crash mid-append
+                with open(self.log_path, 'r+b') as f:
+                    f.truncate(valid_length)
+
+            stored = []
+            with open(self.log_path, 'ab') as f:
+                for insight in insights:
+                    timestamp = insight['timestamp']
+                    record = {
+                        'id': f"INS-{len(self._locations) + 1:06d}",
+                        'timestamp': timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+                        'observation': insight['observation'],
+                        'implications': insight['implications'],
+                        'experiment_id': insight.get('experiment_id'),
+                        'idea_ids': list(insight.get('idea_ids', [])),
+                    }
+                    line = encode_line(record)
+                    f.write(line)
+                    self._add_to_index(record, self._length, len(line))
+                    self._length += len(line)
+                    stored.append(record)
+                f.flush()
+                os.fsync(f.fileno())
+        return stored
+
+    def append(self, observation: str, implications: str, experiment_id: Optional[str] = None,
+               idea_ids: Iterable[str] = (), timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """Durably append one insight and return it with its id."""
+        return self.append_many([{
+            'timestamp': timestamp or datetime.now(),
+            'observation': observation,
+            'implications': implications,
+            'experiment_id': experiment_id,
+            'idea_ids': idea_ids,
+        }])[0]
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Every insight in the order it was appended, read in one sequential pass."""
+        valid_length = self._refresh()
+        if not valid_length:
+            return
+        offset = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                offset += len(line)
+                # Stop at a torn line, and before lines appended after the refresh
+                record = decode_line(line) if offset <= valid_length else None
+                if record is None:
+                    break
+                yield record
+
+    def _read(self, positions: List[int]) -> List[Dict[str, Any]]:
+        if not positions:
+            return []
+        records = []
+        with open(self.log_path, 'rb') as f:
+            for position in positions:
+                offset, length = self._locations[position]
+                f.seek(offset)
+                records.append(decode_line(f.read(length)))
+        return records
+
+    def get(self, insight_id: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        position = self._ids.get(insight_id)
+        return None if position is None else self._read([position])[0]
+
+    def query(self, experiment_id: Optional[str] = None, idea_id: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None) -> InsightResults:
+        """
+        Insights matching every given condition, oldest first.
+
+        start is inclusive and end exclusive. Only the index is consulted;
+        records are read when the results are accessed.
+        """
+        self._refresh()
+        low, high = (start.isoformat() if start else None), (end.isoformat() if end else None)
+        if experiment_id is None and idea_id is None:
+            first = bisect_left(self._by_time, (low,)) if low else 0
+            last = bisect_left(self._by_time, (high,)) if high else len(self._by_time)
+            return InsightResults(self, [position for _, position in self._by_time[first:last]])
+
+        wanted = None
+        if experiment_id is not None:
+            wanted = set(self._by_experiment.get(experiment_id, []))
+        if idea_id is not None:
+            matches = set(self._by_idea.get(idea_id, []))
+            wanted = matches if wanted is None else wanted & matches
+        found = sorted(
+            (self._timestamps[position], position) for position in wanted
+            if (low is None or self._timestamps[position] >= low)
+            and (high is None or self._timestamps[position] < high)
+        )
+        return InsightResults(self, [position for _, position in found])
+
+def project_insights(store: InsightStore, daily_logs) -> Iterator[Dict[str, Any]]:
+    """
+    Every insight of a project, from its insight store.
+
+    A project last opened before the store existed has its insights only in
+    the daily logs; they are read from there, without ids or links, until
+    the project is next opened and imports them.
+    """
+    if store.exists():
+        yield from store.iter_records()
+        return
+    for day, summary in daily_logs.iter_days():
+        for insight in summary.get('insights', []):
+            yield {
+                'id': None,
+                'timestamp': str(insight.get('timestamp') or day.isoformat()),
+                'observation': insight.get('observation', ''),
+                'implications': insight.get('implications', ''),
+                'experiment_id': None,
+                'idea_ids': [],
+            }
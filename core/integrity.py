@@ -0,0 +1,345 @@
+"""
+Integrity checking and repair for research projects.
+Every project file is validated in parallel, cross-references between ideas
+and experiments are checked, and repairs rebuild the experiment index from
+the per-experiment directories.
+"""
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.models import experiment_id
+from core.records import (idea_from_dict, idea_to_dict, note_from_dict, note_to_dict,
+                          experiment_from_dict, experiment_to_dict)
+from core.wal import MutationLog
+from utils.file_handlers import load_json, iter_json_array
+from utils.record_archive import RecordArchive
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Repair actions an issue can point at
+REBUILD_EXPERIMENTS = 'rebuild_experiments'
+DROP_DANGLING_REFERENCES = 'drop_dangling_references'
+REWRITE_VALID_RECORDS = 'rewrite_valid_records'
+
+_CODECS: Dict[str, Tuple[Callable, Callable]] = {
+    'ideas': (idea_from_dict, idea_to_dict),
+    'paper_notes': (note_from_dict, note_to_dict),
+    'experiments': (experiment_from_dict, experiment_to_dict),
+}
+
+KNOWN_GOAL_STATUSES = {'pending', 'in_progress', 'completed', 'blocked'}
+
+@dataclass
+class IntegrityIssue:
+    """One problem found in a project."""
+    severity: str
+    path: str
+    message: str
+    repair: Optional[str] = None
+
+def iter_records(path: Path, kind: str, errors: List[Tuple[int, Any, str]]) -> Iterator[Any]:
+    """
+    Stream the converted records of a project record file, skipping invalid ones.
+
+    (position, raw record, error) is appended to errors for each record that
+    could not be converted. IOError propagates for unreadable files, possibly
+    after the records before the damage were yielded.
+    """
+    from_dict, _ = _CODECS[kind]
+    for position, raw in enumerate(iter_json_array(path)):
+        try:
+            yield from_dict(raw)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            errors.append((position, raw, f"{type(e).__name__}: {e}"))
+
+def load_records(path: Path, kind: str) -> Tuple[List[Any], List[Tuple[int, Any, str]]]:
+    """Convert every record of a project record file; see iter_records."""
+    errors: List[Tuple[int, Any, str]] = []
+    records = list(iter_records(path, kind, errors))
+    return records, errors
+
+def quarantine(project_path: Path, source: Path) -> Path:
+    """Copy a damaged file into quarantine/ before anything overwrites it."""
+    target = Path(project_path) / 'quarantine' / f"{source.name}.{datetime.now():%Y%m%d_%H%M%S_%f}"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(source, target)
+    return target
+
+def experiment_from_directory(exp_dir: Path, base: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild an experiment record from its metadata.json and results.json.
+
+    Fields the directory does not hold (code version, paper notes) are taken
+    from base when given. Returns None for experiments that were never concluded.
+    """
+    results = load_json(exp_dir / 'results.json')
+    if results is None:
+        return None
+    metadata = load_json(exp_dir / 'metadata.json') or {}
+    record = dict(base or {
+        'code_version': "unknown",
+        'paper_notes': [],
+        'related_ideas': [],
+        'metrics': {},
+        'results': {},
+    })
+    timestamp = metadata.get('start_time') or datetime.strptime(
+        exp_dir.name[len('experiment_'):], '%Y%m%d_%H%M%S').isoformat()
+    record.update({
+        'timestamp': timestamp,
+        'hypothesis': results.get('hypothesis', metadata.get('hypothesis', "")),
+        'methodology': results.get('methodology', metadata.get('methodology', "")),
+        'parameters': results.get('parameters', metadata.get('parameters', {})),
+        'results': results.get('results', record.get('results', {})),
+        'metrics': results.get('metrics', record.get('metrics', {})),
+        'conclusions': results.get('conclusions', ""),
+        'next_steps': results.get('next_steps', ""),
+        'related_ideas': metadata.get('related_ideas', record.get('related_ideas', [])),
+    })
+    return experiment_to_dict(experiment_from_dict(record))
+
+def _relative(project_path: Path, path: Path) -> str:
+    return str(path.relative_to(project_path))
+
+def _check_record_file(project_path: Path, path: Path, kind: str) -> Tuple[List[IntegrityIssue], Dict[str, Any]]:
+    _, to_dict = _CODECS[kind]
+    try:
+        records, errors = load_records(path, kind)
+    except IOError as e:
+        repair = REBUILD_EXPERIMENTS if kind == 'experiments' else None
+        return [IntegrityIssue(ERROR, _relative(project_path, path), f"Unreadable: {e}", repair)], {}
+    issues = [
+        IntegrityIssue(ERROR, _relative(project_path, path), f"Record {position} is invalid ({message})",
+                       REWRITE_VALID_RECORDS)
+        for position, _, message in errors
+    ]
+    return issues, {'kind': kind, 'records': [to_dict(record) for record in records]}
+
+def _check_daily_log(project_path: Path, path: Path) -> Tuple[List[IntegrityIssue], Dict[str, Any]]:
+    where = _relative(project_path, path)
+    try:
+        summary = load_json(path)
+    except IOError as e:
+        return [IntegrityIssue(ERROR, where, f"Unreadable: {e}")], {}
+    if not isinstance(summary, dict):
+        return [IntegrityIssue(ERROR, where, "Daily log is not a JSON object")], {}
+    issues = []
+    goals = summary.get('goals', [])
+    goal_status = summary.get('goal_status', {})
+    if not isinstance(goals, list) or not isinstance(goal_status, dict):
+        return [IntegrityIssue(ERROR, where, "goals must be a list and goal_status an object")], {}
+    for key, status in goal_status.items():
+        if not key.isdigit() or not 1 <= int(key) <= len(goals):
+            issues.append(IntegrityIssue(WARNING, where, f"Status entry {key} has no matching goal"))
+        elif status.get('status') not in KNOWN_GOAL_STATUSES:
+            issues.append(IntegrityIssue(WARNING, where, f"Goal {key} has unknown status {status.get('status')!r}"))
+    return issues, {}
+
+def _check_experiment_dir(project_path: Path, path: Path) -> Tuple[List[IntegrityIssue], Dict[str, Any]]:
+    where = _relative(project_path, path)
+    try:
+        record = experiment_from_directory(path)
+    except (IOError, KeyError, TypeError, ValueError) as e:
+        return [IntegrityIssue(ERROR, where, f"Cannot rebuild experiment from directory: {e}")], {}
+    if record is None:
+        if not (path / 'metadata.json').exists():
+            return [IntegrityIssue(WARNING, where, "Experiment directory has no metadata.json")], {}
+        return [IntegrityIssue(WARNING, where, "Experiment was never concluded (no results.json)")], {}
+    return [], {'id': path.name, 'record': record}
+
+def _check_json(project_path: Path, path: Path) -> Tuple[List[IntegrityIssue], Dict[str, Any]]:
+    try:
+        load_json(path)
+    except IOError as e:
+        return [IntegrityIssue(ERROR, _relative(project_path, path), f"Unreadable: {e}")], {}
+    return [], {}
+
+def _check_archive(project_path: Path, path: Path, compress: bool) -> Tuple[List[IntegrityIssue], Dict[str, Any]]:
+    where = _relative(project_path, path)
+    archive = RecordArchive(path.parent, path.name[:-len('.idx.json')], compress=compress)
+    try:
+        keys = [key for key, _ in archive.iter_records()]
+    except (OSError, ValueError) as e:
+        return [IntegrityIssue(ERROR, where, f"Archive cannot be read back: {e}")], {}
+    return [], {'keys': keys}
+
+def _check_mutation_log(project_path: Path, path: Path) -> Tuple[List[IntegrityIssue], Dict[str, Any]]:
+    log = MutationLog(path.parent)
+    try:
+        pending = log.pending()
+        torn = log.torn_bytes()
+    except IOError as e:
+        return [IntegrityIssue(ERROR, _relative(project_path, path), f"Unreadable: {e}")], {}
+    issues = []
+    if torn:
+        issues.append(IntegrityIssue(
+            WARNING, _relative(project_path, path),
+            f"{torn} bytes after the last intact record will be discarded when the project is opened"
+        ))
+    return issues, {'pending': pending}
+
+def _run_check(task: Tuple[str, Path, Path, Any]) -> Tuple[str, Path, List[IntegrityIssue], Dict[str, Any]]:
+    """Pool worker entry point: run one file check."""
+    check, project_path, path, option = task
+    if check == 'records':
+        issues, payload = _check_record_file(project_path, path, option)
+    elif check == 'daily':
+        issues, payload = _check_daily_log(project_path, path)
+    elif check == 'experiment_dir':
+        issues, payload = _check_experiment_dir(project_path, path)
+    elif check == 'archive':
+        issues, payload = _check_archive(project_path, path, option)
+    elif check == 'wal':
+        issues, payload = _check_mutation_log(project_path, path)
+    else:
+        issues, payload = _check_json(project_path, path)
+    return check, path, issues, payload
+
+class ProjectChecker:
+    """
+    fsck for one project directory.
+
+    check() is read-only: every file is validated on a process pool, then the
+    results are cross-checked for dangling idea references and for drift
+    between the experiment index and the experiment directories.
+    """
+
+    def __init__(self, project_path: Path, max_workers: Optional[int] = None):
+        self.project_path = Path(project_path)
+        self.max_workers = max_workers
+
+    def _tasks(self) -> List[Tuple[str, Path, Path, Any]]:
+        root = self.project_path
+        tasks = [
+            ('records', root, root / 'ideas' / 'idea_summaries.json', 'ideas'),
+            ('records', root, root / 'paper_notes' / 'note_references.json', 'paper_notes'),
+            ('records', root, root / 'experiments' / 'experiments.json', 'experiments'),
+            ('wal', root, root / 'wal' / 'mutations.log', None),
+        ]
+        for name in ('project_metadata.json', 'data/datasets.json', 'cold/catalog.json', 'wal/checkpoint.json'):
+            if (root / name).exists():
+                tasks.append(('json', root, root / name, None))
+        tasks += [('daily', root, path, None) for path in sorted((root / 'daily_logs').glob('daily_*.json'))]
+        tasks += [('archive', root, path, False) for path in sorted((root / 'daily_logs').glob('archive_*.idx.json'))]
+        tasks += [('archive', root, path, True) for path in sorted((root / 'cold').glob('*.idx.json'))]
+        tasks += [('experiment_dir', root, path, None)
+                  for path in sorted((root / 'experiments').glob('experiment_*')) if path.is_dir()]
+        return tasks
+
+    def _map(self, tasks: List[Tuple[str, Path, Path, Any]]) -> List[Tuple[str, Path, List[IntegrityIssue], Dict[str, Any]]]:
+        if len(tasks) <= 1 or self.max_workers == 1:
+            return [_run_check(task) for task in tasks]
+        workers = min(len(tasks), self.max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_run_check, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    def check(self) -> List[IntegrityIssue]:
+        """Validate the project and return every issue found, errors first."""
+        issues: List[IntegrityIssue] = []
+        records: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in _CODECS}
+        directories: Dict[str, Dict[str, Any]] = {}
+        cold_keys: Dict[str, List[str]] = {}
+        pending: List[Dict[str, Any]] = []
+
+        for check, path, file_issues, payload in self._map(self._tasks()):
+            issues.extend(file_issues)
+            if check == 'records' and payload:
+                records[payload['kind']] = payload['records']
+            elif check == 'experiment_dir' and payload:
+                directories[payload['id']] = payload['record']
+            elif check == 'archive' and payload and path.parent.name == 'cold':
+                cold_keys[path.name[:-len('.idx.json')]] = payload['keys']
+            elif check == 'wal' and payload:
+                pending = payload['pending']
+
+        issues.extend(self._cross_check(records, directories, cold_keys, pending))
+        return sorted(issues, key=lambda issue: (issue.severity != ERROR, issue.path))
+
+    def _cross_check(self, records: Dict[str, List[Dict[str, Any]]], directories: Dict[str, Dict[str, Any]],
+                     cold_keys: Dict[str, List[str]], pending: List[Dict[str, Any]]) -> List[IntegrityIssue]:
+        issues = []
+        ideas = {record['id']: record for record in records['ideas']}
+        experiments = {experiment_id(experiment_from_dict(record)): record for record in records['experiments']}
+        for mutation in pending:
+            if mutation['op'] == 'idea.save':
+                ideas[mutation['data']['id']] = mutation['data']
+            elif mutation['op'] == 'experiment.save':
+                experiments[experiment_id(experiment_from_dict(mutation['data']))] = mutation['data']
+
+        seen_ids = set()
+        for record in records['ideas']:
+            if record['id'] in seen_ids:
+                issues.append(IntegrityIssue(WARNING, 'ideas/idea_summaries.json',
+                                             f"Idea id {record['id']} appears more than once",
+                                             REWRITE_VALID_RECORDS))
+            seen_ids.add(record['id'])
+
+        known_ideas = set(ideas) | set(cold_keys.get('ideas', []))
+        for idea_id, record in sorted(ideas.items()):
+            for field in ('prerequisites', 'related_ideas'):
+                for reference in record.get(field, []):
+                    if reference not in known_ideas:
+                        issues.append(IntegrityIssue(
+                            WARNING, 'ideas/idea_summaries.json',
+                            f"{idea_id} lists unknown idea {reference} in {field}", DROP_DANGLING_REFERENCES
+                        ))
+        for key, record in sorted(experiments.items()):
+            for reference in record.get('related_ideas', []):
+                if reference not in known_ideas:
+                    issues.append(IntegrityIssue(
+                        WARNING, f"experiments/{key}", f"Related idea {reference} does not exist",
+                        DROP_DANGLING_REFERENCES
+                    ))
+
+        archived = set(cold_keys.get('experiments', []))
+        for key, record in sorted(directories.items()):
+            if key in archived:
+                continue
+            indexed = experiments.get(key)
+            if indexed is None:
+                issues.append(IntegrityIssue(ERROR, f"experiments/{key}",
+                                             "Concluded experiment is missing from experiments.json",
+                                             REBUILD_EXPERIMENTS))
+                continue
+            drifted = [field for field in ('hypothesis', 'parameters', 'conclusions', 'next_steps', 'metrics')
+                       if indexed.get(field) != record.get(field)]
+            if drifted:
+                issues.append(IntegrityIssue(WARNING, f"experiments/{key}",
+                                             f"experiments.json differs from results.json in {', '.join(drifted)}",
+                                             REBUILD_EXPERIMENTS))
+        for key in sorted(set(experiments) - set(directories)):
+            if not (self.project_path / 'experiments' / key).is_dir():
+                issues.append(IntegrityIssue(WARNING, 'experiments/experiments.json',
+                                             f"{key} has no experiment directory"))
+        return issues
+
+def repair(research_log, issues: List[IntegrityIssue]) -> Dict[str, int]:
+    """
+    Apply the repairs named by the issues to an opened research log.
+
+    Opening the log already skipped and quarantined invalid records and folded
+    the mutation log, so rewriting the project files drops bad records. The
+    experiment index is rebuilt from the experiment directories, and dangling
+    idea references are removed. Returns the number of changes per repair.
+    """
+    actions = {issue.repair for issue in issues if issue.repair}
+    done = {action: 0 for action in actions}
+
+    if REBUILD_EXPERIMENTS in actions:
+        done[REBUILD_EXPERIMENTS] = research_log.rebuild_experiment_index()
+
+    if DROP_DANGLING_REFERENCES in actions:
+        done[DROP_DANGLING_REFERENCES] = research_log.drop_dangling_references()
+
+    if REWRITE_VALID_RECORDS in actions:
+        done[REWRITE_VALID_RECORDS] = 1
+
+    research_log.checkpoint()
+    return done
@@ -0,0 +1,267 @@
+"""
+Multi-resolution storage for metric series logged during experiments.
+Raw points are appended to a binary file and rollup tiers of min, max, mean
+and last per bucket are extended as they arrive, so a long series is drawn
+at any zoom level from a small precomputed tier instead of the raw points.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.file_handlers import save_json, load_json
+
+# Each bucket of tier k combines this many rows of tier k - 1 (tier 0 is raw)
+BUCKET_SIZE = 16
+
+# Tier 5 buckets hold about a million raw points
+MAX_TIER = 5
+
+DEFAULT_POINTS = 500
+
+# Row layout shared by all levels: a raw point is a bucket of one
+STEP, MIN, MAX, SUM, COUNT, LAST = range(6)
+_ROW_WIDTH = 6
+
+_VALID_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+def _combine(rows: np.ndarray) -> np.ndarray:
+    """Merge each run of BUCKET_SIZE consecutive rows into one row."""
+    groups = rows.reshape(-1, BUCKET_SIZE, _ROW_WIDTH)
+    combined = np.empty((len(groups), _ROW_WIDTH))
+    combined[:, STEP] = groups[:, 0, STEP]
+    combined[:, MIN] = groups[:, :, MIN].min(axis=1)
+    combined[:, MAX] = groups[:, :, MAX].max(axis=1)
+    combined[:, SUM] = groups[:, :, SUM].sum(axis=1)
+    combined[:, COUNT] = groups[:, :, COUNT].sum(axis=1)
+    combined[:, LAST] = groups[:, -1, LAST]
+    return combined
+
+def _merge(rows: np.ndarray) -> np.ndarray:
+    """Merge any number of consecutive rows into a single row."""
+    return np.array([[rows[0, STEP], rows[:, MIN].min(), rows[:, MAX].max(),
+                      rows[:, SUM].sum(), rows[:, COUNT].sum(), rows[-1, LAST]]])
+
+def _as_rows(points: np.ndarray) -> np.ndarray:
+    """Raw (step, value) pairs in the row layout."""
+    rows = np.empty((len(points), _ROW_WIDTH))
+    rows[:, STEP] = points[:, 0]
+    for column in (MIN, MAX, SUM, LAST):
+        rows[:, column] = points[:, 1]
+    rows[:, COUNT] = 1
+    return rows
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. From each of threshold - 2
+    buckets in between, the point kept is the one forming the largest
+    triangle with the point kept before it and the mean of the next bucket,
+    which preserves peaks and troughs that plain decimation would drop.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        mean_x, mean_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[previous] - mean_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (mean_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+class MetricSeries:
+    """
+    One metric's raw points and rollup tiers under <directory>.
+
+    raw.bin holds (step, value) float64 pairs and tier<k>.bin one row per
+    full bucket of tier k. Rows that do not yet fill a bucket, and totals
+    over the whole series, are kept in state.json. Tiers found out of step
+    with raw.bin, after a crash between writes for instance, are rebuilt.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.raw_path = self.directory / 'raw.bin'
+        self.state_path = self.directory / 'state.json'
+        state = load_json(self.state_path) or {}
+        self.count: int = state.get('count', 0)
+        self.totals: Optional[List[float]] = state.get('totals')
+        self.last_step: Optional[float] = state.get('last_step')
+        self._pending = [np.array(rows, dtype=np.float64).reshape(-1, _ROW_WIDTH)
+                         for rows in state.get('pending', [[]] * MAX_TIER)]
+        if not self._consistent():
+            self.rebuild()
+
+    def _tier_path(self, tier: int) -> Path:
+        return self.directory / f"tier{tier}.bin"
+
+    def _rows_on_disk(self, tier: int) -> int:
+        path = self.raw_path if tier == 0 else self._tier_path(tier)
+        width = 2 if tier == 0 else _ROW_WIDTH
+        return path.stat().st_size // (8 * width) if path.exists() else 0
+
+    def _consistent(self) -> bool:
+        return all(self._rows_on_disk(tier) == self.count // BUCKET_SIZE ** tier
+                   for tier in range(MAX_TIER + 1))
+
+    def _load(self, tier: int) -> np.ndarray:
+        """A read-only memory map of a level's rows; raw points are (step, value) pairs."""
+        rows = self._rows_on_disk(tier)
+        if rows == 0:
+            return np.empty((0, 2 if tier == 0 else _ROW_WIDTH))
+        width = 2 if tier == 0 else _ROW_WIDTH
+        path = self.raw_path if tier == 0 else self._tier_path(tier)
+        return np.memmap(path, dtype=np.float64, mode='r', shape=(rows, width))
+
+    def append(self, values: Any, steps: Any = None) -> None:
+        """
+        Append one value or an array of values.
+
+        steps default to consecutive point numbers; given steps must not
+        decrease, also relative to points appended earlier.
+        """
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        if steps is None:
+            start = 0 if self.last_step is None else np.floor(self.last_step) + 1
+            steps = np.arange(start, start + len(values), dtype=np.float64)
+        else:
+            steps = np.atleast_1d(np.asarray(steps, dtype=np.float64))
+            if len(steps) != len(values):
+                raise ValueError(f"Got {len(steps)} steps for {len(values)} values")
+            last = self.last_step
+            if np.any(np.diff(steps) < 0) or (last is not None and len(steps) and steps[0] < last):
+                raise ValueError("Metric steps must not decrease")
+        if not len(values):
+            return
+
+        points = np.column_stack([steps, values])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.raw_path, 'ab') as f:
+            f.write(points.tobytes())
+        self._ingest(_as_rows(points))
+        self._save_state()
+
+    def _ingest(self, rows: np.ndarray) -> None:
+        """Fold new raw rows into the totals and every tier."""
+        merged = _merge(rows)[0]
+        self.last_step = float(rows[-1, STEP])
+        if self.totals is None:
+            self.totals = merged.tolist()
+        else:
+            self.totals = _merge(np.array([self.totals, merged]))[0].tolist()
+        self.count += len(rows)
+
+        for tier in range(1, MAX_TIER + 1):
+            rows = np.concatenate([self._pending[tier - 1], rows])
+            full = len(rows) // BUCKET_SIZE * BUCKET_SIZE
+            self._pending[tier - 1] = rows[full:]
+            if not full:
+                break
+            rows = _combine(rows[:full])
+            with open(self._tier_path(tier), 'ab') as f:
+                f.write(rows.tobytes())
+
+    def _save_state(self) -> None:
+        save_json({
+            'count': self.count,
+            'totals': self.totals,
+            'last_step': self.last_step,
+            'pending': [rows.tolist() for rows in self._pending],
+        }, self.state_path)
+
+    def rebuild(self, chunk_size: int = 1 << 20) -> None:
+        """Recompute the totals and every tier from raw.bin."""
+        for tier in range(1, MAX_TIER + 1):
+            if self._tier_path(tier).exists():
+                self._tier_path(tier).unlink()
+        self.count, self.totals, self.last_step = 0, None, None
+        self._pending = [np.empty((0, _ROW_WIDTH)) for _ in range(MAX_TIER)]
+        raw = self._load(0)
+        for start in range(0, len(raw), chunk_size):
+            self._ingest(_as_rows(np.asarray(raw[start:start + chunk_size])))
+        self._save_state()
+
+    def summary(self) -> Dict[str, Any]:
+        """Point count, min, max, mean and last value over the whole series."""
+        if not self.count:
+            return {'count': 0}
+        totals = self.totals
+        return {'count': self.count, 'min': totals[MIN], 'max': totals[MAX],
+                'mean': totals[SUM] / totals[COUNT], 'last': totals[LAST]}
+
+    def _span(self, tier: int, start: Optional[float], end: Optional[float]) -> slice:
+        steps = self._load(tier)[:, STEP]
+        first = 0 if start is None else int(np.searchsorted(steps, start, side='left'))
+        last = len(steps) if end is None else int(np.searchsorted(steps, end, side='right'))
+        return slice(first, last)
+
+    def _rows(self, tier: int, span: slice, start: Optional[float], end: Optional[float]) -> np.ndarray:
+        data = np.asarray(self._load(tier)[span])
+        rows = _as_rows(data) if tier == 0 else data
+        # Points not yet rolled up into a full bucket of this tier
+        below = [self._pending[level] for level in range(tier)]
+        tail = np.concatenate(below[::-1]) if below else np.empty((0, _ROW_WIDTH))
+        if start is not None:
+            tail = tail[tail[:, STEP] >= start]
+        if end is not None:
+            tail = tail[tail[:, STEP] <= end]
+        if len(tail) and (span.stop == self._rows_on_disk(tier)):
+            rows = np.concatenate([rows, _merge(tail)])
+        return rows
+
+    def view(self, start: Optional[float] = None, end: Optional[float] = None,
+             max_points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+        """
+        At most max_points points covering steps [start, end] for display.
+
+        The coarsest tier that still has max_points rows in the range is
+        read, so at most BUCKET_SIZE times as many rows as points shown, and
+        LTTB picks the points to show. Each point carries its bucket's min,
+        max, mean and last value.
+        """
+        tier, span = 0, self._span(0, start, end)
+        while tier < MAX_TIER:
+            coarser = self._span(tier + 1, start, end)
+            if coarser.stop - coarser.start < max_points:
+                break
+            tier, span = tier + 1, coarser
+        rows = self._rows(tier, span, start, end)
+        if len(rows):
+            rows = rows[lttb(rows[:, STEP], rows[:, SUM] / rows[:, COUNT], max_points)]
+        return {
+            'tier': tier,
+            'step': rows[:, STEP],
+            'min': rows[:, MIN],
+            'max': rows[:, MAX],
+            'mean': rows[:, SUM] / rows[:, COUNT] if len(rows) else rows[:, SUM],
+            'last': rows[:, LAST],
+        }
+
+class MetricStore:
+    """The metric series of one experiment, one directory per metric."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._series: Dict[str, MetricSeries] = {}
+
+    def names(self) -> List[str]:
+        if not self.directory.exists():
+            return []
+        return sorted(path.name for path in self.directory.iterdir() if (path / 'state.json').exists())
+
+    def series(self, name: str) -> MetricSeries:
+        if not _VALID_NAME.match(name):
+            raise ValueError(f"Metric names may only contain letters, digits, '_', '.' and '-': {name!r}")
+        if name not in self._series:
+            self._series[name] = MetricSeries(self.directory / name)
+        return self._series[name]
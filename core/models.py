@@ -11,6 +11,11 @@ class IdeaStatus(Enum):
     DEVELOPING = "developing"
     BLOCKED = "blocked"
     READY = "ready"
+    COMPLETED = "completed"
+    ABANDONED = "abandoned"
+
+# Ideas in these states are finished and eligible for cold storage
+TERMINAL_STATUSES = {IdeaStatus.COMPLETED, IdeaStatus.ABANDONED}
 
 @dataclass
 class PaperNoteReference:
@@ -51,4 +56,12 @@ class Experiment:
     parameters: dict
     metrics: Dict[str, Dict[str, Any]]
     paper_notes: List[PaperNoteReference]
-    related_ideas: List[str]
\ No newline at end of file
+    related_ideas: List[str]
+
+def experiment_key(timestamp: datetime) -> str:
+    """Identifier of an experiment started at timestamp; ids have one-second resolution."""
+    return f"experiment_{timestamp:%Y%m%d_%H%M%S}"
+
+def experiment_id(experiment: Experiment) -> str:
+    """Stable identifier of an experiment, matching its directory name."""
+    return experiment_key(experiment.timestamp)
@@ -0,0 +1,93 @@
+"""
+Composite index over paper note references.
+Supports page-range lookups per notebook, note type and date range queries,
+duplicate detection on insert, and table-of-contents generation.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.models import PaperNoteReference
+
+class PaperNoteIndex:
+    """
+    Index of paper notes keyed by (notebook_id, page_number), note type and date.
+
+    Each secondary index is a sorted list of (key, position) pairs into the
+    note list, so range queries are a pair of bisections plus the matches.
+    """
+
+    def __init__(self, notes: Iterable[PaperNoteReference] = ()):
+        self._notes: List[PaperNoteReference] = []
+        self._pages: Dict[str, List[Tuple[int, int]]] = {}
+        self._by_type: Dict[str, List[Tuple[datetime, int]]] = {}
+        self._by_date: List[Tuple[datetime, int]] = []
+        self._by_entry: Dict[Tuple[str, int, str], int] = {}
+        for note in notes:
+            self.add(note)
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def find_duplicate(self, notebook_id: str, page_number: int,
+                       note_type: str) -> Optional[PaperNoteReference]:
+        """Return an already indexed note for the same notebook page and type."""
+        position = self._by_entry.get((notebook_id, page_number, note_type))
+        return self._notes[position] if position is not None else None
+
+    def add(self, note: PaperNoteReference) -> Optional[PaperNoteReference]:
+        """
+        Index a note unless the same notebook page and type is already present.
+
+        Returns the existing note when a duplicate is detected, otherwise None.
+        """
+        duplicate = self.find_duplicate(note.notebook_id, note.page_number, note.note_type)
+        if duplicate is not None:
+            return duplicate
+
+        position = len(self._notes)
+        self._notes.append(note)
+        self._by_entry[(note.notebook_id, note.page_number, note.note_type)] = position
+        insort(self._pages.setdefault(note.notebook_id, []), (note.page_number, position))
+        insort(self._by_type.setdefault(note.note_type, []), (note.date, position))
+        insort(self._by_date, (note.date, position))
+        return None
+
+    def notebooks(self) -> List[str]:
+        """All notebook ids with at least one indexed note."""
+        return sorted(self._pages)
+
+    def pages(self, notebook_id: str, first_page: Optional[int] = None,
+              last_page: Optional[int] = None) -> List[PaperNoteReference]:
+        """Notes in a notebook between two page numbers inclusive, in page order."""
+        entries = self._pages.get(notebook_id, [])
+        lo = 0 if first_page is None else bisect_left(entries, (first_page, -1))
+        hi = len(entries) if last_page is None else bisect_right(entries, (last_page, len(self._notes)))
+        return [self._notes[position] for _, position in entries[lo:hi]]
+
+    def by_type(self, note_type: str, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> List[PaperNoteReference]:
+        """Notes of one type, optionally limited to [start, end), in date order."""
+        return self._date_range(self._by_type.get(note_type, []), start, end)
+
+    def between(self, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> List[PaperNoteReference]:
+        """All notes dated in [start, end), in date order."""
+        return self._date_range(self._by_date, start, end)
+
+    def _date_range(self, entries: List[Tuple[datetime, int]], start: Optional[datetime],
+                    end: Optional[datetime]) -> List[PaperNoteReference]:
+        lo = 0 if start is None else bisect_left(entries, (start, -1))
+        hi = len(entries) if end is None else bisect_left(entries, (end, -1))
+        return [self._notes[position] for _, position in entries[lo:hi]]
+
+    def table_of_contents(self, notebook_id: str) -> List[Tuple[int, List[PaperNoteReference]]]:
+        """Notes in a notebook grouped by page, in page order."""
+        toc: List[Tuple[int, List[PaperNoteReference]]] = []
+        for page_number, position in self._pages.get(notebook_id, []):
+            if toc and toc[-1][0] == page_number:
+                toc[-1][1].append(self._notes[position])
+            else:
+                toc.append((page_number, [self._notes[position]]))
+        return toc
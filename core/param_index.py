@@ -0,0 +1,143 @@
+"""
+Per-parameter index over experiment hyperparameters.
+Numeric parameters are kept in sorted arrays for range queries; categorical
+parameters map each value to the experiments that used it.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+def _is_numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class _SortedColumn:
+    """
+    Sorted value array with the matching row ids for one numeric parameter.
+
+    Inserts land in a small buffer that is merged in on the next query, so a
+    burst of inserts costs a single merge rather than one array shift each.
+    """
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.float64)
+        self.rows = np.empty(0, dtype=np.int64)
+        self._pending: List[Tuple[float, int]] = []
+
+    def add(self, value: float, row: int) -> None:
+        self._pending.append((value, row))
+
+    def _merge(self) -> None:
+        if not self._pending:
+            return
+        self._pending.sort()
+        new_values = np.fromiter((v for v, _ in self._pending), dtype=np.float64, count=len(self._pending))
+        new_rows = np.fromiter((r for _, r in self._pending), dtype=np.int64, count=len(self._pending))
+        positions = np.searchsorted(self.values, new_values, side='right')
+        self.values = np.insert(self.values, positions, new_values)
+        self.rows = np.insert(self.rows, positions, new_rows)
+        self._pending = []
+
+    def between(self, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Row ids whose value lies in [low, high]; None leaves a side open."""
+        self._merge()
+        lo = 0 if low is None else np.searchsorted(self.values, low, side='left')
+        hi = len(self.values) if high is None else np.searchsorted(self.values, high, side='right')
+        return self.rows[lo:hi]
+
+class ParameterIndex:
+    """
+    Index of experiment keys by parameter value.
+
+    Every indexed experiment gets an integer row id. Conditions resolve to row
+    id arrays (a slice of a sorted column, or a categorical posting list) that
+    are combined as boolean masks, smallest first.
+    """
+
+    def __init__(self):
+        self._numeric: Dict[str, _SortedColumn] = {}
+        self._categorical: Dict[str, Dict[str, List[int]]] = {}
+        self._posting_arrays: Dict[Tuple[str, str], np.ndarray] = {}
+        self._keys: List[str] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_of: Dict[str, int] = {}
+        self._indexed: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._indexed
+
+    def add(self, key: str, parameters: Dict[str, Any]) -> None:
+        """Index an experiment's parameters, replacing any earlier entry for the key."""
+        if self._indexed.get(key) == parameters:
+            return
+        self.remove(key)
+
+        row = len(self._keys)
+        self._keys.append(key)
+        if row >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(max(1024, row), dtype=bool)])
+        self._alive[row] = True
+        self._row_of[key] = row
+
+        for name, value in parameters.items():
+            if _is_numeric(value):
+                self._numeric.setdefault(name, _SortedColumn()).add(float(value), row)
+            else:
+                self._categorical.setdefault(name, {}).setdefault(str(value), []).append(row)
+                self._posting_arrays.pop((name, str(value)), None)
+        self._indexed[key] = dict(parameters)
+
+    def remove(self, key: str) -> None:
+        """Drop an experiment; its stale rows are masked out of every query."""
+        if self._indexed.pop(key, None) is None:
+            return
+        self._alive[self._row_of.pop(key)] = False
+
+    def parameter_names(self) -> List[str]:
+        return sorted(set(self._numeric) | set(self._categorical))
+
+    def _rows(self, name: str, condition: Tuple[str, Any]) -> np.ndarray:
+        kind, value = condition
+        if kind == 'range' or _is_numeric(value):
+            column = self._numeric.get(name)
+            if column is None:
+                return np.empty(0, dtype=np.int64)
+            bounds = value if kind == 'range' else (float(value), float(value))
+            return column.between(*bounds)
+        cache_key = (name, str(value))
+        if cache_key not in self._posting_arrays:
+            postings = self._categorical.get(name, {}).get(str(value), [])
+            self._posting_arrays[cache_key] = np.fromiter(postings, dtype=np.int64, count=len(postings))
+        return self._posting_arrays[cache_key]
+
+    def query(self, equals: Optional[Dict[str, Any]] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None) -> Set[str]:
+        """
+        Keys matching every condition.
+
+        Args:
+            equals: Parameter values that must match exactly
+            ranges: Inclusive (low, high) bounds for numeric parameters; either
+                bound may be None
+        """
+        conditions: List[Tuple[str, Tuple[str, Any]]] = []
+        conditions.extend((name, ('equals', value)) for name, value in (equals or {}).items())
+        conditions.extend((name, ('range', bounds)) for name, bounds in (ranges or {}).items())
+        if not conditions:
+            return set(self._indexed)
+
+        row_sets = sorted((self._rows(name, condition) for name, condition in conditions), key=len)
+        mask = np.zeros(len(self._keys), dtype=bool)
+        mask[row_sets[0]] = True
+        mask &= self._alive[:len(self._keys)]
+        for rows in row_sets[1:]:
+            if not mask.any():
+                break
+            hits = np.zeros(len(self._keys), dtype=bool)
+            hits[rows] = True
+            mask &= hits
+
+        return {self._keys[row] for row in np.flatnonzero(mask)}
@@ -0,0 +1,77 @@
+"""
+Conversion between research dataclasses and their JSON-ready dictionaries.
+Every on-disk representation of ideas, paper notes and experiments goes
+through these functions so that all writers agree on one format; records
+are stamped with their schema version and upgraded when read.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import Any, Dict
+
+from core.models import PaperNoteReference, ResearchIdea, Experiment, IdeaStatus
+from core.schema import stamp, upgrade
+from utils.file_handlers import DateTimeEncoder
+
+def _as_datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+def note_to_dict(note: PaperNoteReference) -> Dict[str, Any]:
+    record = asdict(note)
+    record['date'] = note.date.isoformat() if isinstance(note.date, datetime) else note.date
+    return stamp('paper_notes', record)
+
+def note_from_dict(record: Dict[str, Any]) -> PaperNoteReference:
+    record = upgrade('paper_notes', record)
+    record['date'] = _as_datetime(record['date'])
+    return PaperNoteReference(**record)
+
+def idea_to_dict(idea: ResearchIdea) -> Dict[str, Any]:
+    record = asdict(idea)
+    record['status'] = idea.status.value
+    record['created_date'] = idea.created_date.isoformat()
+    record['last_updated'] = idea.last_updated.isoformat()
+    record['paper_notes'] = [note_to_dict(note) for note in idea.paper_notes]
+    return stamp('ideas', record)
+
+def idea_from_dict(record: Dict[str, Any]) -> ResearchIdea:
+    record = upgrade('ideas', record)
+    record['status'] = IdeaStatus(record['status'])
+    record['created_date'] = _as_datetime(record['created_date'])
+    record['last_updated'] = _as_datetime(record['last_updated'])
+    record['paper_notes'] = [
+        note if isinstance(note, PaperNoteReference) else note_from_dict(note)
+        for note in record.get('paper_notes', [])
+    ]
+    return ResearchIdea(**record)
+
+def experiment_to_dict(experiment: Experiment, copy: bool = True) -> Dict[str, Any]:
+    """
+    Serialize an experiment. With copy=False the record shares results,
+    parameters and metrics with the experiment instead of deep-copying them,
+    which is much faster for large results; use it only for records that are
+    written out or hashed straight away.
+    """
+    if copy:
+        record = asdict(experiment)
+    else:
+        record = {f.name: getattr(experiment, f.name) for f in fields(experiment)}
+    record['timestamp'] = experiment.timestamp.isoformat()
+    record['paper_notes'] = [note_to_dict(note) for note in experiment.paper_notes]
+    return stamp('experiments', record)
+
+def experiment_from_dict(record: Dict[str, Any]) -> Experiment:
+    record = upgrade('experiments', record)
+    record['timestamp'] = _as_datetime(record['timestamp'])
+    record['paper_notes'] = [
+        note if isinstance(note, PaperNoteReference) else note_from_dict(note)
+        for note in record.get('paper_notes', [])
+    ]
+    return Experiment(**record)
+
+def record_fingerprint(record: Dict[str, Any]) -> str:
+    """Short digest of a serialized record; equal records have equal fingerprints."""
+    payload = json.dumps(record, sort_keys=True, cls=DateTimeEncoder).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()[:20]
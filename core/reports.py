@@ -0,0 +1,260 @@
+"""
+Static Markdown and HTML research reports per day, week and month.
+Reports are regenerated incrementally: a manifest of per-period content
+fingerprints decides which pages are rebuilt after data changes.
+"""
+
+import hashlib
+import html
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.insight_store import project_insights
+from core.models import experiment_id
+from utils.file_handlers import DateTimeEncoder, save_json, load_json
+
+PERIODS = ('day', 'week', 'month')
+
+# Section order and the columns shown for each section
+SECTIONS = {
+    'experiments': ('Experiments', ['hypothesis', 'status', 'conclusions']),
+    'ideas': ('Ideas', ['event', 'title', 'status', 'priority', 'next_steps']),
+    'paper_notes': ('Paper Notes', ['notebook_id', 'page_number', 'note_type', 'brief_summary']),
+    'goals': ('Goals', ['day', 'goal', 'status']),
+    'insights': ('Insights', ['day', 'id', 'observation', 'implications', 'experiment_id']),
+}
+
+def period_key(period: str, day: date) -> str:
+    """Name of the day, ISO week or month containing a date."""
+    if period == 'day':
+        return day.isoformat()
+    if period == 'week':
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{day:%Y-%m}"
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    return datetime.fromisoformat(value).date()
+
+class ReportGenerator:
+    """
+    Builds reports/<period>/<key>.md and .html for a research log.
+
+    Generation streams every dated event twice: once to fingerprint each
+    period, and once more to collect content for only the periods whose
+    fingerprint differs from the manifest.
+    """
+
+    def __init__(self, research_log, output_dir: Path):
+        self.log = research_log
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / 'manifest.json'
+
+    def _experiment_row(self, experiment, status: str) -> Dict[str, Any]:
+        return {
+            'id': experiment_id(experiment),
+            'hypothesis': experiment.hypothesis,
+            'status': status,
+            'conclusions': experiment.conclusions,
+        }
+
+    def _events(self) -> Iterator[Tuple[date, str, Dict[str, Any]]]:
+        """Yield (day, section, row) for every dated record in the project."""
+        for experiment in self.log.iter_experiments():
+            yield experiment.timestamp.date(), 'experiments', self._experiment_row(experiment, 'Completed')
+        current = self.log.current_experiment
+        if current is not None:
+            yield current.timestamp.date(), 'experiments', self._experiment_row(current, 'Ongoing')
+
+        for idea in self.log.iter_ideas():
+            row = {
+                'id': idea.id,
+                'title': idea.title,
+                'status': idea.status.value,
+                'priority': idea.priority,
+                'next_steps': idea.next_steps,
+            }
+            yield idea.created_date.date(), 'ideas', dict(row, event='created')
+            if idea.last_updated.date() != idea.created_date.date():
+                yield idea.last_updated.date(), 'ideas', dict(row, event='updated')
+
+        for note in self.log.paper_notes:
+            yield _as_date(note.date), 'paper_notes', {
+                'notebook_id': note.notebook_id,
+                'page_number': note.page_number,
+                'note_type': note.note_type,
+                'brief_summary': note.brief_summary,
+            }
+
+        for day, summary in self.log.daily_logs.iter_days():
+            goal_status = summary.get('goal_status', {})
+            for i, goal in enumerate(summary.get('goals', []), 1):
+                yield day, 'goals', {
+                    'day': day.isoformat(),
+                    'goal': str(goal),
+                    'status': goal_status.get(str(i), {}).get('status', 'pending'),
+                }
+
+        for insight in project_insights(self.log.insights, self.log.daily_logs):
+            day = _as_date(insight['timestamp'])
+            yield day, 'insights', {
+                'day': day.isoformat(),
+                'id': insight['id'],
+                'observation': insight['observation'],
+                'implications': insight['implications'],
+                'experiment_id': insight['experiment_id'],
+            }
+
+    def _fingerprints(self, periods: Iterable[str]) -> Dict[str, str]:
+        digests: Dict[str, Any] = {}
+        for day, section, row in self._events():
+            encoded = json.dumps([section, row], sort_keys=True, cls=DateTimeEncoder).encode('utf-8')
+            # A modular sum of per-event hashes does not depend on event order
+            event_hash = int.from_bytes(hashlib.sha256(encoded).digest()[:16], 'big')
+            for period in periods:
+                key = f"{period}/{period_key(period, day)}"
+                digests[key] = (digests.get(key, 0) + event_hash) % (1 << 128)
+        return {key: f"{value:032x}" for key, value in digests.items()}
+
+    def _collect(self, keys: Set[str], periods: Iterable[str]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        content: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for day, section, row in self._events():
+            for period in periods:
+                key = f"{period}/{period_key(period, day)}"
+                if key in keys:
+                    content.setdefault(key, {}).setdefault(section, []).append(row)
+        return content
+
+    def generate(self, periods: Iterable[str] = PERIODS,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 cancelled: Optional[threading.Event] = None) -> List[Path]:
+        """
+        Rebuild the reports whose underlying records changed.
+
+        Returns the report files written; pages for periods that no longer have
+        any records are removed. progress is called with (pages done, pages to
+        rebuild). When cancelled is set, the manifest is saved for the pages
+        already rebuilt and InterruptedError is raised.
+        """
+        periods = [p for p in PERIODS if p in set(periods)]
+        manifest: Dict[str, str] = load_json(self.manifest_path) or {}
+        previous_keys = set(manifest)
+        fingerprints = self._fingerprints(periods)
+
+        changed = {
+            key for key, fingerprint in fingerprints.items()
+            if manifest.get(key) != fingerprint or not self._path(key, 'md').exists()
+        }
+        vanished = {key for key in manifest if key.split('/')[0] in periods and key not in fingerprints}
+
+        written = []
+        for done, (key, sections) in enumerate(self._collect(changed, periods).items(), 1):
+            if cancelled is not None and cancelled.is_set():
+                save_json(manifest, self.manifest_path)
+                raise InterruptedError(f"Report generation cancelled after {done - 1} of {len(changed)} pages")
+            written.extend(self._write(key, sections))
+            manifest[key] = fingerprints[key]
+            if progress is not None:
+                progress(done, len(changed))
+
+        for key in vanished:
+            for extension in ('md', 'html'):
+                path = self._path(key, extension)
+                if path.exists():
+                    path.unlink()
+            del manifest[key]
+
+        if set(manifest) != previous_keys or not (self.output_dir / 'index.md').exists():
+            written.extend(self._write_index(manifest))
+        save_json(manifest, self.manifest_path)
+        return written
+
+    def _path(self, key: str, extension: str) -> Path:
+        return self.output_dir / f"{key}.{extension}"
+
+    def _title(self, key: str) -> str:
+        period, name = key.split('/')
+        return f"{self.log.project_name}: {period.capitalize()} {name}"
+
+    def _write(self, key: str, sections: Dict[str, List[Dict[str, Any]]]) -> List[Path]:
+        md_path = self._path(key, 'md')
+        html_path = self._path(key, 'html')
+        md_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(md_path, 'w') as f:
+            f.write(self._render_markdown(self._title(key), sections))
+        with open(html_path, 'w') as f:
+            f.write(self._render_html(self._title(key), sections))
+        return [md_path, html_path]
+
+    def _render_markdown(self, title: str, sections: Dict[str, List[Dict[str, Any]]]) -> str:
+        def cell(value: Any) -> str:
+            return str('' if value is None else value).replace('|', '\\|').replace('\n', ' ')
+
+        lines = [f"# {title}", "", f"_Generated {datetime.now():%Y-%m-%d %H:%M}_", ""]
+        for section, (heading, columns) in SECTIONS.items():
+            rows = sections.get(section)
+            if not rows:
+                continue
+            lines += [f"## {heading} ({len(rows)})", "",
+                      "| " + " | ".join(c.replace('_', ' ').title() for c in columns) + " |",
+                      "|" + "---|" * len(columns)]
+            lines += ["| " + " | ".join(cell(row.get(c)) for c in columns) + " |" for row in rows]
+            lines.append("")
+        return "\n".join(lines)
+
+    def _render_html(self, title: str, sections: Dict[str, List[Dict[str, Any]]]) -> str:
+        def cell(value: Any) -> str:
+            return html.escape(str('' if value is None else value))
+
+        parts = [
+            "<!DOCTYPE html>",
+            f"<html><head><meta charset=\"utf-8\"><title>{cell(title)}</title>",
+            "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+            "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left}</style></head><body>",
+            f"<h1>{cell(title)}</h1>",
+            f"<p><em>Generated {datetime.now():%Y-%m-%d %H:%M}</em></p>",
+        ]
+        for section, (heading, columns) in SECTIONS.items():
+            rows = sections.get(section)
+            if not rows:
+                continue
+            parts.append(f"<h2>{cell(heading)} ({len(rows)})</h2><table><tr>")
+            parts.extend(f"<th>{cell(c.replace('_', ' ').title())}</th>" for c in columns)
+            parts.append("</tr>")
+            for row in rows:
+                parts.append("<tr>" + "".join(f"<td>{cell(row.get(c))}</td>" for c in columns) + "</tr>")
+            parts.append("</table>")
+        parts.append("</body></html>")
+        return "\n".join(parts)
+
+    def _write_index(self, manifest: Dict[str, str]) -> List[Path]:
+        """List every report, newest first, in index.md and index.html."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        md_lines = [f"# {self.log.project_name} Reports", ""]
+        html_parts = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\">",
+                      f"<title>{html.escape(self.log.project_name)} Reports</title></head><body>",
+                      f"<h1>{html.escape(self.log.project_name)} Reports</h1>"]
+        for period in PERIODS:
+            keys = sorted((k for k in manifest if k.startswith(f"{period}/")), reverse=True)
+            if not keys:
+                continue
+            md_lines += [f"## {period.capitalize()}", ""]
+            md_lines += [f"- [{k.split('/')[1]}]({k}.md)" for k in keys]
+            md_lines.append("")
+            html_parts.append(f"<h2>{period.capitalize()}</h2><ul>")
+            html_parts += [f"<li><a href=\"{k}.html\">{k.split('/')[1]}</a></li>" for k in keys]
+            html_parts.append("</ul>")
+        html_parts.append("</body></html>")
+
+        md_path = self.output_dir / 'index.md'
+        html_path = self.output_dir / 'index.html'
+        with open(md_path, 'w') as f:
+            f.write("\n".join(md_lines))
+        with open(html_path, 'w') as f:
+            f.write("\n".join(html_parts))
+        return [md_path, html_path]
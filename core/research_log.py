@@ -4,19 +4,68 @@ This module implements the main ResearchLog class that handles all research trac
 experiment management, and idea organization.
 """
 
-from dataclasses import asdict
-from datetime import datetime, timedelta
+import atexit
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import json
 import subprocess
+import threading
+import numpy as np
 from rich.table import Table
 from rich.text import Text
 
-from core.models import PaperNoteReference, ResearchIdea, Experiment, IdeaStatus
-from utils.file_handlers import save_json, load_json, DateTimeEncoder
+from core.models import (PaperNoteReference, ResearchIdea, Experiment, IdeaStatus, TERMINAL_STATUSES,
+                         experiment_id, experiment_key)
+from core.artifacts import ArtifactStore, make_artifact_ref, referenced_digests
+from core.datasets import DatasetRegistry
+from core.param_index import ParameterIndex
+from core.idea_graph import IdeaGraph
+from core.note_index import PaperNoteIndex
+from core.daily_logs import DailyLogStore, incomplete_goals
+from core.records import (idea_to_dict, idea_from_dict, note_to_dict, note_from_dict,
+                          experiment_to_dict, experiment_from_dict, record_fingerprint)
+from core.wal import MutationLog, SNAPSHOT_INTERVAL
+from core.export import ProjectExporter
+from core.reports import ReportGenerator, PERIODS, period_key
+from core.watcher import FileWatcher, merge_external
+from core.similarity import SimilarityIndex
+from core.goal_analytics import GoalHistory
+from core.cold_storage import ColdStore
+from core.integrity import iter_records, quarantine, experiment_from_directory
+from core.schema import BackgroundMigration
+from core.insight_store import InsightStore
+from core.experiment_cache import ExperimentCollection
+from core.metrics import MetricStore, DEFAULT_POINTS
+from core.timeline import Timeline
+from core.result_cache import ResultCache, result_key, cacheable_version, RUN_FIELDS, DEFAULT_MAX_BYTES as DEFAULT_RESULT_CACHE_BYTES
+from utils.file_handlers import (save_json, load_json, save_json_stream, iter_json_array,
+                                 DateTimeEncoder, COMPRESS_THRESHOLD)
 from utils.formatters import format_date, format_time
+from utils.locks import ReadWriteLock
 from ui.console import console
+from ui.tables import PaginatedTable, Column
+
+# Number of progress notes shown inline in the goals summary table
+NOTES_PREVIEW_COUNT = 3
+
+# Estimated text similarity above which a new idea is linked as related, and
+# above which it is reported as a likely duplicate
+RELATED_IDEA_THRESHOLD = 0.3
+DUPLICATE_IDEA_THRESHOLD = 0.6
+
+# Days after which concluded experiments and finished ideas move to cold storage
+COLD_AFTER_DAYS = 90
+
+def _note_key(note: PaperNoteReference) -> str:
+    return f"{note.notebook_id}:{note.page_number}:{note.note_type}"
+
+# (from_dict, to_dict, key) for each record kind kept in a project file
+_RECORD_CODECS = {
+    'ideas': (idea_from_dict, idea_to_dict, lambda idea: idea.id),
+    'paper_notes': (note_from_dict, note_to_dict, _note_key),
+    'experiments': (experiment_from_dict, experiment_to_dict, experiment_id),
+}
 
 class ComprehensiveResearchLog:
     """
@@ -25,215 +74,566 @@ class ComprehensiveResearchLog:
     maintaining data persistence and organization.
     """
     
-    def __init__(self, project_name: str, base_path: Path):
+    def __init__(self, project_name: str, base_path: Path, max_experiment_bytes: Optional[int] = None):
+        """
+        Open a project. max_experiment_bytes turns on memory-bounded mode, in
+        which at most that many bytes of full experiment records are kept in
+        memory; it defaults to the project's experiment_cache_bytes setting in
+        project_metadata.json, and without either every experiment is resident.
+        The result cache is bounded by result_cache_bytes from the same file,
+        and archive_on_close there makes close() move old work to cold storage.
+        """
         self.project_name = project_name
         self.base_path = Path(base_path)
-        self.experiments: List[Experiment] = []
-        self.insights: List[Dict[str, Any]] = []
+        try:
+            metadata = load_json(self.base_path / 'project_metadata.json') or {}
+        except IOError:
+            metadata = {}
+        if max_experiment_bytes is None:
+            max_experiment_bytes = metadata.get('experiment_cache_bytes')
+        self.experiments = ExperimentCollection(self.base_path / 'cache' / 'experiments', max_experiment_bytes)
+        self.result_cache = ResultCache(self.base_path / 'cache' / 'results',
+                                        metadata.get('result_cache_bytes', DEFAULT_RESULT_CACHE_BYTES))
+        self.archive_on_close = bool(metadata.get('archive_on_close', False))
+        self.insights = InsightStore(self.base_path / 'insights')
         self.current_experiment: Optional[Experiment] = None
         self.paper_notes: List[PaperNoteReference] = []
         self.ideas: Dict[str, ResearchIdea] = {}
         self.daily_summaries: List[Dict[str, Any]] = []
+        self._today_summary: Optional[Dict[str, Any]] = None
+        self._today_date = None
+        self._today_dirty = False
+        self.idea_graph = IdeaGraph()
+        self.idea_similarity = SimilarityIndex()
+        self.note_index = PaperNoteIndex()
+        self.daily_logs = DailyLogStore(self.base_path / 'daily_logs')
+        self.goal_history = GoalHistory(self.daily_logs, self.base_path / 'daily_logs' / 'goal_history.npz')
+        self.artifacts = ArtifactStore(self.base_path / 'artifacts')
+        self.param_index = ParameterIndex()
+        self.cold = ColdStore(self.base_path / 'cold')
+        self._cold_param_index: Optional[ParameterIndex] = None
+        self.mutation_log = MutationLog(self.base_path / 'wal')
+        self.watcher = FileWatcher()
+        self.conflicts: List[Dict[str, Any]] = []
+        self._metric_stores: Dict[str, MetricStore] = {}
+        self._disk_fingerprints: Dict[str, Dict[str, str]] = {}
+        self._write_lock = threading.Lock()
+        # Background jobs and read-only menu commands hold it for reading, other
+        # commands for writing, so nothing reads the project while it changes
+        self.lock = ReadWriteLock()
+        self._closed = False
         
         self._initialize_directory_structure()
+        self.datasets = DatasetRegistry(self.base_path / 'data')
         self._load_existing_data()
+        if not self.insights.exists():
+            self._import_legacy_insights()
+        if not self.result_cache.exists():
+            self._seed_result_cache()
+        self.migration = self._start_migration()
+        atexit.register(self.close)
 
     def _initialize_directory_structure(self) -> None:
         """Creates the necessary directory structure for research artifacts."""
         dirs = ['experiments', 'ideas', 'daily_logs', 'paper_notes', 
-                'figures', 'data', 'models', 'backups']
+                'figures', 'data', 'models', 'backups', 'artifacts', 'insights']
         for dir_name in dirs:
             (self.base_path / dir_name).mkdir(parents=True, exist_ok=True)
 
     def _load_existing_data(self) -> None:
-        """Loads existing research data from disk, handling potential errors."""
+        """
+        Loads existing research data from disk, handling potential errors.
+        
+        The project JSON files hold the state as of the last checkpoint; any
+        mutations logged since then are replayed on top of them.
+        """
+        files = self._project_files()
+        problems: List[int] = []
+        
+        for idea in self._read_project_file('ideas', files['ideas'], problems):
+            self.ideas[idea.id] = idea
+            self._index_idea(idea)
+        
+        self.paper_notes = list(self._read_project_file('paper_notes', files['paper_notes'], problems))
+        for note in self.paper_notes:
+            self.note_index.add(note)
+        
+        # Streamed, so that in memory-bounded mode only summaries stay resident
+        self.experiments.load(self._read_project_file('experiments', files['experiments'], problems))
+        for key in self.experiments.keys():
+            self.param_index.add(key, self.experiments.summary(key)['parameters'])
+        
+        if problems:
+            console.log("[yellow]Warning: Some research data could not be loaded; run the integrity check for details[/yellow]")
+        else:
+            console.log("[green]Successfully loaded existing research data[/green]")
+        
+        self._remember_disk_state()
+        self._replay_mutations()
+
+    def _read_project_file(self, kind: str, path: Path, problems: List[int]):
+        """
+        Stream the valid records of a project file.
+        
+        Invalid records are skipped, and a file that cannot be read to the end
+        keeps the records before the damage. Either way the file is copied to
+        quarantine/ first, as the next checkpoint would overwrite it, and the
+        number of lost records (or 1 for a damaged file) is added to problems.
+        """
+        errors = []
         try:
-            # Load ideas with proper type conversion
-            ideas_data = load_json(self.base_path / 'ideas' / 'idea_summaries.json')
-            if ideas_data:
-                for idea_dict in ideas_data:
-                    idea_dict['status'] = IdeaStatus(idea_dict['status'])
-                    idea_dict['created_date'] = datetime.fromisoformat(idea_dict['created_date'])
-                    idea_dict['last_updated'] = datetime.fromisoformat(idea_dict['last_updated'])
-                    self.ideas[idea_dict['id']] = ResearchIdea(**idea_dict)
-            
-            # Load paper notes
-            notes_data = load_json(self.base_path / 'paper_notes' / 'note_references.json')
-            if notes_data:
-                self.paper_notes = [PaperNoteReference(**note) for note in notes_data]
-            
-            # Load experiments
-            experiment_data = load_json(self.base_path / 'experiments' / 'experiments.json')
-            if experiment_data:
-                self.experiments = [Experiment(**exp) for exp in experiment_data]
+            yield from iter_records(path, kind, errors)
+        except IOError as e:
+            console.log(f"[red]Could not load {path} ({str(e)}); copied to {quarantine(self.base_path, path)}[/red]")
+            problems.append(1)
+        if errors:
+            console.log(
+                f"[red]Skipped {len(errors)} invalid records in {path}; "
+                f"original copied to {quarantine(self.base_path, path)}[/red]"
+            )
+            problems.append(len(errors))
+
+    def _start_migration(self) -> BackgroundMigration:
+        """
+        Rewrite project files holding records from older schemas in the background.
+        
+        Records were already upgraded as they loaded; the rewrite only spares
+        future loads that work. It is abandoned if the session closes first and
+        picked up again on the next open.
+        """
+        serializers = {
+            kind: (lambda record, from_dict=from_dict, to_dict=to_dict: to_dict(from_dict(record)))
+            for kind, (from_dict, to_dict, _) in _RECORD_CODECS.items()
+        }
+        return BackgroundMigration(self._project_files(), serializers, self._write_lock).start()
+
+    def _replay_mutations(self) -> None:
+        """Apply mutations logged after the last checkpoint, then fold them in."""
+        records = self.mutation_log.recover()
+        for record in records:
+            self._apply_mutation(record['op'], record['data'])
+        
+        if records:
+            console.log(f"[green]Recovered {len(records)} changes from the mutation log[/green]")
+            self.checkpoint()
+
+    def _apply_mutation(self, op: str, data: Dict[str, Any]) -> None:
+        """Apply one logged mutation to in-memory state; replaying it twice is harmless."""
+        if op == 'idea.save':
+            idea = idea_from_dict(data)
+            self.ideas[idea.id] = idea
+            self._index_idea(idea)
+        elif op == 'note.add':
+            note = note_from_dict(data)
+            if self.note_index.add(note) is None:
+                self.paper_notes.append(note)
+        elif op == 'experiment.save':
+            experiment = experiment_from_dict(data)
+            self.experiments.put(experiment)
+            self._index_experiment(experiment)
+        else:
+            console.log(f"[yellow]Warning: Ignoring unknown logged mutation '{op}'[/yellow]")
+
+    def _record_mutation(self, op: str, data: Dict[str, Any]) -> None:
+        """Append a mutation to the write-ahead log, checkpointing when the log grows long."""
+        self.mutation_log.append(op, data)
+        if self.mutation_log.tail_length >= SNAPSHOT_INTERVAL:
+            self.checkpoint()
+
+    def pending_writes(self) -> int:
+        """Changes not yet folded into the project files: logged mutations plus today's summary."""
+        return self.mutation_log.tail_length + (1 if self._today_dirty else 0)
+
+    def checkpoint(self) -> bool:
+        """Write the full research state to the project files and truncate the log."""
+        self.sync_external_changes()
+        if not self._save_research_state():
+            return False
+        self.mutation_log.mark_checkpoint()
+        return True
+
+    def close(self) -> None:
+        """
+        Flush pending daily changes and fold logged mutations into the project
+        files. Finished work is moved to cold storage only with archive_on_close.
+
+        Only the first call does anything, so an explicit close is not repeated at exit.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.migration.cancel()
+        if self.migration.rewritten:
+            console.log(f"[green]Upgraded {sum(self.migration.rewritten.values())} records to the current schema[/green]")
+            self.migration.rewritten.clear()
+        self.flush_daily_summary()
+        if self.archive_on_close:
+            self.apply_tiering()
+        if self.mutation_log.tail_length:
+            self.checkpoint()
+        self.insights.save_index()
+        self.result_cache.save()
+        stats = self.experiments.stats
+        if self.experiments.bounded and stats.hits + stats.misses:
+            console.log(
+                f"Experiment cache: {stats.hits} hits, {stats.misses} misses ({stats.hit_rate:.0%} hit rate), "
+                f"{stats.evictions} evictions, {stats.resident_bytes} of {stats.max_bytes} bytes in use"
+            )
+            stats.hits = stats.misses = stats.evictions = 0
+        self.watcher.close()
+
+    def _project_files(self) -> Dict[str, Path]:
+        return {
+            'ideas': self.base_path / 'ideas' / 'idea_summaries.json',
+            'paper_notes': self.base_path / 'paper_notes' / 'note_references.json',
+            'experiments': self.base_path / 'experiments' / 'experiments.json',
+        }
+
+    def _fingerprints(self, kind: str) -> Dict[str, str]:
+        """Fingerprints of the in-memory records of one kind in their on-disk form, keyed by identity."""
+        if kind == 'experiments':
+            return self.experiments.fingerprints()
+        _, to_dict, key_of = _RECORD_CODECS[kind]
+        records = self.ideas.values() if kind == 'ideas' else self.paper_notes
+        return {key_of(record): record_fingerprint(to_dict(record)) for record in records}
+
+    def _current_record(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """One in-memory record in its on-disk form, or None if it does not exist."""
+        _, to_dict, key_of = _RECORD_CODECS[kind]
+        if kind == 'experiments':
+            item = self.experiments.get(key)
+        elif kind == 'ideas':
+            item = self.ideas.get(key)
+        else:
+            item = next((note for note in self.paper_notes if key_of(note) == key), None)
+        return to_dict(item) if item is not None else None
+
+    def _read_external(self, kind: str, path: Path):
+        """
+        Fingerprints of every record in a project file, and the full records
+        of those that differ from what this session last read or wrote.
+        """
+        from_dict, to_dict, key_of = _RECORD_CODECS[kind]
+        known = self._disk_fingerprints[kind]
+        fingerprints, changed = {}, {}
+        for raw in iter_json_array(path):
+            item = from_dict(raw)
+            key, record = key_of(item), to_dict(item)
+            fingerprints[key] = record_fingerprint(record)
+            if known.get(key) != fingerprints[key]:
+                changed[key] = record
+        return fingerprints, changed
+
+    def _remember_disk_state(self) -> None:
+        """Take the in-memory state as what the project files now contain."""
+        for kind, path in self._project_files().items():
+            self._disk_fingerprints[kind] = self._fingerprints(kind)
+            self.watcher.watch(path)
+            self.watcher.acknowledge(path)
+
+    def sync_external_changes(self) -> int:
+        """
+        Reload records that another process changed in the project files.
+        
+        Each changed file is merged against the version this session last read
+        or wrote: records changed only on disk are adopted, while records also
+        changed in this session are kept and flagged as conflicts, with the
+        external version saved under conflicts/. Returns the number of records
+        reloaded.
+        """
+        changed = self.watcher.changes()
+        if not changed:
+            return 0
+        
+        reloaded = 0
+        for kind, path in self._project_files().items():
+            if path not in changed:
+                continue
+            try:
+                theirs, external = self._read_external(kind, path)
+            except (IOError, KeyError, TypeError, ValueError) as e:
+                console.log(f"[yellow]Warning: Ignoring unreadable external change to {path}: {str(e)}[/yellow]")
+                continue
             
-            console.log("[green]Successfully loaded existing research data[/green]")
-        except Exception as e:
-            console.log(f"[yellow]Warning: Could not load existing data: {str(e)}[/yellow]")
+            # Records are compared by fingerprint; only changed ones are held in full
+            updates, conflicts = merge_external(self._disk_fingerprints[kind], theirs, self._fingerprints(kind))
+            for key in conflicts:
+                self._flag_conflict(kind, key, self._current_record(kind, key), external.get(key))
+            self._apply_external(kind, {key: external.get(key) for key in updates})
+            self._disk_fingerprints[kind] = theirs
+            reloaded += len(updates)
+        
+        if self._today_summary is not None:
+            today_path = self.daily_logs.live_path(self._today_date)
+            if today_path in changed:
+                reloaded += self._reload_daily_summary(today_path)
+        
+        if reloaded:
+            console.log(f"[green]Reloaded {reloaded} externally modified records[/green]")
+        return reloaded
 
-    def _save_research_state(self) -> None:
+    def _apply_external(self, kind: str, updates: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Apply merged external changes to in-memory state and its indexes."""
+        if kind == 'ideas':
+            for key, record in updates.items():
+                if record is None:
+                    self.ideas.pop(key, None)
+                    self._unindex_idea(key)
+                else:
+                    idea = idea_from_dict(record)
+                    self.ideas[idea.id] = idea
+                    self._index_idea(idea)
+        
+        elif kind == 'paper_notes':
+            positions = {_note_key(note): i for i, note in enumerate(self.paper_notes)}
+            removed = {key for key, record in updates.items() if record is None}
+            rebuild = bool(removed)
+            for key, record in updates.items():
+                if record is None:
+                    continue
+                note = note_from_dict(record)
+                if key in positions:
+                    self.paper_notes[positions[key]] = note
+                    rebuild = True
+                else:
+                    self.paper_notes.append(note)
+                    self.note_index.add(note)
+            if removed:
+                self.paper_notes = [note for note in self.paper_notes if _note_key(note) not in removed]
+            if rebuild:
+                self.note_index = PaperNoteIndex(self.paper_notes)
+        
+        elif kind == 'experiments':
+            for key, record in updates.items():
+                if record is None:
+                    self.experiments.remove([key])
+                    self.param_index.remove(key)
+                else:
+                    experiment = experiment_from_dict(record)
+                    self.experiments.put(experiment)
+                    self._index_experiment(experiment)
+
+    def _reload_daily_summary(self, path: Path) -> int:
+        """Adopt an external edit of today's log unless this session has unsaved changes."""
+        try:
+            external = load_json(path)
+        except IOError as e:
+            console.log(f"[yellow]Warning: Ignoring unreadable external change to {path}: {str(e)}[/yellow]")
+            return 0
+        if external is None or external == self._today_summary:
+            return 0
+        if self._today_dirty:
+            self._flag_conflict('daily_logs', path.stem, self._today_summary, external)
+            return 0
+        # Update in place: daily_summaries holds the same dictionary
+        self._today_summary.clear()
+        self._today_summary.update(external)
+        return 1
+
+    def _flag_conflict(self, kind: str, key: str, ours: Any, theirs: Any) -> None:
+        """Keep this session's version of a record and set the external one aside."""
+        conflict_path = self.base_path / 'conflicts' / f"{kind}_{datetime.now():%Y%m%d_%H%M%S_%f}.json"
+        save_json({
+            'kind': kind,
+            'key': key,
+            'detected': datetime.now().isoformat(),
+            'session_version': ours,
+            'external_version': theirs,
+        }, conflict_path)
+        self.conflicts.append({'kind': kind, 'key': key, 'path': conflict_path})
+        console.log(
+            f"[red]Conflict: {kind} record {key} was changed both on disk and in this session. "
+            f"Keeping this session's version; the external one was saved to {conflict_path}[/red]"
+        )
+
+    def _save_research_state(self) -> bool:
         """Saves the current state of all research data."""
         try:
-            # Save ideas
-            save_json(
-                [asdict(idea) for idea in self.ideas.values()],
-                self.base_path / 'ideas' / 'idea_summaries.json'
-            )
+            # Background schema rewrites replace these files under the same lock
+            with self._write_lock:
+                # Save ideas
+                save_json(
+                    [idea_to_dict(idea) for idea in self.ideas.values()],
+                    self.base_path / 'ideas' / 'idea_summaries.json'
+                )
             
-            # Save paper notes
-            save_json(
-                [asdict(note) for note in self.paper_notes],
-                self.base_path / 'paper_notes' / 'note_references.json'
-            )
+                # Save paper notes
+                save_json(
+                    [note_to_dict(note) for note in self.paper_notes],
+                    self.base_path / 'paper_notes' / 'note_references.json'
+                )
             
-            # Save experiments
-            save_json(
-                [asdict(exp) for exp in self.experiments],
-                self.base_path / 'experiments' / 'experiments.json'
-            )
+                # Save experiments one at a time; they may not all be in memory
+                save_json_stream(
+                    (experiment_to_dict(exp, copy=False) for exp in self.experiments),
+                    self.base_path / 'experiments' / 'experiments.json'
+                )
+            self._remember_disk_state()
+            return True
         except Exception as e:
             console.log(f"[red]Error saving research state: {str(e)}[/red]")
+            return False
 
     def _save_idea(self, idea: ResearchIdea):
-        """Save idea to disk"""
-        ideas_file = self.base_path / 'ideas' / 'idea_summaries.json'
-        current_ideas = []
-        
-        if ideas_file.exists():
-            with open(ideas_file, 'r') as f:
-                current_ideas = json.load(f)
-        
-        # Update or add the idea
-        idea_dict = asdict(idea)
-        idea_dict['status'] = idea.status.value
-        idea_dict['created_date'] = idea.created_date.isoformat()
-        idea_dict['last_updated'] = idea.last_updated.isoformat()
-        
-        # Replace or append
-        found = False
-        for i, existing_idea in enumerate(current_ideas):
-            if existing_idea['id'] == idea.id:
-                current_ideas[i] = idea_dict
-                found = True
-                break
-        if not found:
-            current_ideas.append(idea_dict)
-        
-        with open(ideas_file, 'w') as f:
-            json.dump(current_ideas, f, indent=2, cls=DateTimeEncoder)
+        """Log the idea's new state; it reaches idea_summaries.json at the next checkpoint"""
+        self._record_mutation('idea.save', idea_to_dict(idea))
+        self._index_idea(idea)
+
+    def _index_idea(self, idea: ResearchIdea) -> None:
+        """Refresh an idea in the dependency graph and the similarity index."""
+        self.idea_graph.update(idea)
+        self.idea_similarity.update(idea.id, f"{idea.title} {idea.description}")
+
+    def _unindex_idea(self, idea_id: str) -> None:
+        self.idea_graph.remove(idea_id)
+        self.idea_similarity.remove(idea_id)
 
     def _get_git_version(self) -> str:
-        """Get current git commit hash"""
+        """Get current git commit hash, with a -dirty suffix if tracked files have uncommitted changes"""
         try:
-            return subprocess.check_output(['git', 'rev-parse', 'HEAD']).decode('ascii').strip()
+            version = subprocess.check_output(['git', 'rev-parse', 'HEAD']).decode('ascii').strip()
         except:
             return "Git version unavailable"
+        changed = subprocess.run(['git', 'diff', '--quiet', 'HEAD'], capture_output=True).returncode
+        return f"{version}-dirty" if changed else version
 
     def _load_daily_goals(self) -> Dict[str, Any]:
-        """Load today's goals and progress from the daily logs."""
-        today = datetime.now().strftime("%Y%m%d")
-        daily_log_path = self.base_path / 'daily_logs' / f"daily_{today}.json"
+        """
+        Return today's summary, reading it from the daily logs at most once per day.
         
-        if daily_log_path.exists():
-            return load_json(daily_log_path)
-        return {
-            'date': datetime.now().isoformat(),
-            'goals': [],
-            'completed_tasks': [],
-            'insights': [],
-            'next_day_todos': [],
-            'goal_status': {}  # Tracks status of each goal
-        }
+        The returned dictionary is the session's single authoritative copy;
+        callers modify it in place and call _mark_daily_dirty.
+        """
+        today = datetime.now().date()
+        if self._today_summary is not None and self._today_date == today:
+            return self._today_summary
+        
+        # The day rolled over (or this is the first access): persist the old day first
+        self.flush_daily_summary()
+        
+        summary = self.daily_logs.load(today)
+        if summary is None:
+            summary = {
+                'date': datetime.now().isoformat(),
+                'goals': [],
+                'completed_tasks': [],
+                'insights': [],
+                'next_day_todos': [],
+                'goal_status': {}  # Tracks status of each goal
+            }
+        
+        self._today_summary = summary
+        self._today_date = today
+        self._today_dirty = False
+        self.watcher.watch(self.daily_logs.live_path(today))
+        self.daily_summaries.append(summary)
+        return summary
+
+    def _mark_daily_dirty(self) -> None:
+        """Note that today's in-memory summary has changes not yet on disk."""
+        self._today_dirty = True
+
+    def flush_daily_summary(self) -> None:
+        """Write today's summary if it changed; repeated changes coalesce into one write."""
+        if self._today_summary is None or not self._today_dirty:
+            return
+        self.sync_external_changes()
+        self._save_daily_summary(self._today_summary, self._today_date)
+        self._today_dirty = False
 
     def _get_past_incomplete_goals(self) -> List[Dict[str, Any]]:
         """
         Retrieves incomplete goals from past daily logs, ensuring carried-over goals
         are only counted once with their original date.
         Returns a list of dictionaries containing unique goal details and their earliest dates.
+        
+        Goals completed on any day, including today, are excluded. All days are
+        read in a single pass over the live and archived logs.
         """
-        goal_tracker: Dict[str, Dict[str, Any]] = {}
-        completed_goals = set()  # Track all completed goals
-        daily_logs_path = self.base_path / 'daily_logs'
-        today = datetime.now().date()
+        return incomplete_goals(self.daily_logs.iter_days(), before=datetime.now().date())
+
+    def show_goal_analytics(self, days: int = 30) -> Dict[str, Any]:
+        """
+        Display goal completion trends, time to completion, carry-overs and
+        blocked streaks, and return the headline figures.
+        """
+        history = self.goal_history
+        history.refresh(today_summary=self._load_daily_goals())
+        by_day = history.completion_by_day()
+        if not len(by_day['day']):
+            console.log("[yellow]No goals logged yet.[/yellow]")
+            return {}
         
-        # First pass: identify all completed goals
-        for log_file in sorted(daily_logs_path.glob('daily_*.json')):
-            try:
-                file_date = datetime.strptime(log_file.stem[6:], '%Y%m%d').date()
-                if file_date >= today:
-                    continue
-                    
-                daily_summary = load_json(log_file)
-                goals = daily_summary.get('goals', [])
-                goal_status = daily_summary.get('goal_status', {})
-                
-                # Track any completed goals
-                for i, goal in enumerate(goals, 1):
-                    goal_text = str(goal).strip()
-                    status = goal_status.get(str(i), {}).get('status', 'pending')
-                    if status == 'completed':
-                        completed_goals.add(goal_text)
-                        
-            except (ValueError, json.JSONDecodeError) as e:
-                console.log(f"[yellow]Warning: Error processing {log_file}: {str(e)}[/yellow]")
-        
-        # Second pass: collect incomplete goals that were never completed
-        for log_file in sorted(daily_logs_path.glob('daily_*.json')):
-            try:
-                file_date = datetime.strptime(log_file.stem[6:], '%Y%m%d').date()
-                if file_date >= today:
-                    continue
-                    
-                daily_summary = load_json(log_file)
-                goals = daily_summary.get('goals', [])
-                goal_status = daily_summary.get('goal_status', {})
-                
-                for goal, goal_status in zip(goals, goal_status.values()):
-                    goal_text = str(goal).strip()
-                    status = goal_status.get('status', 'pending')
-                    
-                    # Skip if goal was ever completed
-                    if goal_text in completed_goals:
-                        continue
-                        
-                    # Update tracker with earliest occurrence of incomplete goal
-                    if goal_text not in goal_tracker or \
-                       datetime.fromisoformat(goal_tracker[goal_text]['original_date']).date() > file_date:
-                        goal_tracker[goal_text] = {
-                            'goal': goal,
-                            'original_date': file_date.isoformat(),
-                            'status': status,
-                            'progress_notes': goal_status.get('progress_notes', [])
-                        }
-                        
-            except (ValueError, json.JSONDecodeError) as e:
-                console.log(f"[yellow]Warning: Error processing {log_file}: {str(e)}[/yellow]")
-        
-        return list(goal_tracker.values())
+        durations = history.time_to_completion()
+        carry = history.carry_overs()
+        streaks = history.blocked_streaks()
+        total_goals = int(by_day['total'].sum())
+        stats = {
+            'goals_logged': total_goals,
+            'completion_rate': float(by_day['completed'].sum() / total_goals),
+            'median_days_to_complete': float(np.median(durations)) if len(durations) else None,
+            'p90_days_to_complete': float(np.percentile(durations, 90)) if len(durations) else None,
+            'carried_over_rows': int(carry['carried'].sum()),
+            'most_carried_goal_days': int(carry['appearances'].max()),
+            'goals_currently_blocked': int((streaks['current'] > 0).sum()),
+        }
+        
+        console.display_header("Goal Analytics")
+        summary_table = Table(show_header=True, header_style="bold magenta")
+        summary_table.add_column("Metric")
+        summary_table.add_column("Value")
+        for name, value in stats.items():
+            if isinstance(value, float) and name == 'completion_rate':
+                value = f"{value:.0%}"
+            elif value is None:
+                value = "n/a"
+            summary_table.add_row(name.replace('_', ' ').capitalize(), str(value))
+        console.log(summary_table)
+        
+        recent = slice(max(0, len(by_day['day']) - days), None)
+        PaginatedTable(
+            [
+                Column("Day", lambda i: date.fromordinal(int(by_day['day'][i])).isoformat()),
+                Column("Goals", lambda i: str(by_day['total'][i])),
+                Column("Completed", lambda i: str(by_day['completed'][i])),
+                Column("Rate", lambda i: f"{by_day['rate'][i]:.0%}"),
+                Column("7-day Rate", lambda i: f"{by_day['rolling_rate'][i]:.0%}"),
+                Column("Carried Over", lambda i: str(carry['carried'][i])),
+            ],
+            range(len(by_day['day']))[recent],
+            reverse=True,
+            sort_key=lambda i: i,
+            title=f"Completion by day (last {days} logged days)"
+        ).show()
+        
+        if len(streaks['goal']):
+            PaginatedTable(
+                [
+                    Column("Goal", lambda i: history.goals[streaks['goal'][i]], max_width=60),
+                    Column("Longest Blocked Streak", lambda i: f"{streaks['longest'][i]} days"),
+                    Column("Currently Blocked", lambda i: f"{streaks['current'][i]} days" if streaks['current'][i] else "-"),
+                ],
+                range(len(streaks['goal'])),
+                sort_key=lambda i: (streaks['current'][i], streaks['longest'][i]),
+                reverse=True,
+                title="Blocked goals"
+            ).show()
+        return stats
+
+    def compact_daily_logs(self) -> int:
+        """Pack closed days' log files into monthly archives."""
+        compacted = self.daily_logs.compact(before=datetime.now().date())
+        console.log(f"[green]Compacted {compacted} daily logs into monthly archives[/green]")
+        return compacted
 
     def review_daily_goals(self) -> None:
         daily_summary = self._load_daily_goals()
         goals = daily_summary.get('goals', [])
         goal_status = daily_summary.get('goal_status', {})
-        completed_goals = set()
-        daily_logs_path = self.base_path / 'daily_logs'
         
-        for log_file in daily_logs_path.glob('daily_*.json'):
-            try:
-                log_data = load_json(log_file)
-                log_status = log_data.get('goal_status', {})
-                
-                for i, goal in enumerate(log_data.get('goals', []), 1):
-                    if log_status.get(str(i), {}).get('status') == 'completed':
-                        completed_goals.add(str(goal).strip())
-            except (ValueError, json.JSONDecodeError) as e:
-                console.log(f"[yellow]Warning: Error processing {log_file}: {str(e)}[/yellow]")
-        
-        # Get incomplete goals from past days, excluding completed ones
-        past_incomplete = []
-        for goal_info in self._get_past_incomplete_goals():
-            if str(goal_info['goal']).strip() not in completed_goals:
-                past_incomplete.append(goal_info)
+        # Get incomplete goals from past days, excluding ones completed on any day
+        past_incomplete = self._get_past_incomplete_goals()
         
         if past_incomplete:
             console.display_header("Past Incomplete Goals")
@@ -306,7 +706,8 @@ class ComprehensiveResearchLog:
         
         daily_summary['goals'] = goals
         daily_summary['goal_status'] = goal_status
-        self._save_daily_summary(daily_summary)
+        self._mark_daily_dirty()
+        self.flush_daily_summary()
         self._display_goals_summary(daily_summary)
 
     def _display_goals_summary(self, daily_summary: Dict[str, Any]) -> None:
@@ -315,42 +716,57 @@ class ComprehensiveResearchLog:
         
         console.display_header("Goals Summary")
         
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Goal")
-        table.add_column("Status")
-        table.add_column("Progress")
-        table.add_column("Latest Update")
-        table.add_column("Notes")
+        status_styles = {
+            'pending': 'yellow',
+            'in_progress': 'blue',
+            'completed': 'green',
+            'blocked': 'red'
+        }
+        today = datetime.now().date()
         
-        for i, goal in enumerate(goals, 1):
-            status = goal_status.get(str(i), {'status': 'pending', 'progress_notes': []})
-            
+        def goal_status_for(row) -> Dict[str, Any]:
+            return goal_status.get(str(row[0]), {'status': 'pending', 'progress_notes': []})
+        
+        def latest_note(row) -> str:
+            status = goal_status_for(row)
             progress_notes = status['progress_notes']
-            latest_note = progress_notes[-1]['note'] if progress_notes else "No updates"
-            latest_time = format_time(datetime.fromisoformat(progress_notes[-1]['time'])) if progress_notes else "-"
-            
-            status_style = {
-                'pending': 'yellow',
-                'in_progress': 'blue',
-                'completed': 'green',
-                'blocked': 'red'
-            }.get(status['status'], 'white')
+            note = progress_notes[-1]['note'] if progress_notes else "No updates"
             
             # Highlight overdue goals
             if status.get('original_date'):
                 original_date = datetime.fromisoformat(status['original_date']).date()
-                if original_date < datetime.now().date():
-                    latest_note = f"[red]Overdue since {original_date}[/red] " + latest_note
-            
-            table.add_row(
-                goal,
-                Text(status['status'], style=status_style),
-                latest_note,
-                latest_time,
-                "\n".join([note['note'] for note in progress_notes])
-            )
+                if original_date < today:
+                    note = f"[red]Overdue since {original_date}[/red] " + note
+            return note
         
-        console.log(table)
+        def latest_time(row) -> str:
+            progress_notes = goal_status_for(row)['progress_notes']
+            return format_time(datetime.fromisoformat(progress_notes[-1]['time'])) if progress_notes else "-"
+        
+        def status_text(row) -> Text:
+            status = goal_status_for(row)['status']
+            return Text(status, style=status_styles.get(status, 'white'))
+        
+        def goal_detail(row) -> str:
+            notes = goal_status_for(row)['progress_notes']
+            lines = [f"[bold]Goal {row[0]}: {row[1]}[/bold]"]
+            lines.extend(f"{format_time(datetime.fromisoformat(n['time']))}  {n['note']}" for n in notes)
+            return "\n".join(lines)
+        
+        PaginatedTable(
+            columns=[
+                Column("Goal", lambda row: row[1], max_width=60),
+                Column("Status", status_text),
+                Column("Progress", latest_note, max_width=60),
+                Column("Latest Update", latest_time),
+                # Only the most recent notes are shown inline; the row detail has the full history
+                Column("Notes", lambda row: "\n".join(
+                    n['note'] for n in goal_status_for(row)['progress_notes'][-NOTES_PREVIEW_COUNT:]
+                ), max_width=80)
+            ],
+            rows=list(enumerate(goals, 1)),
+            detail=goal_detail
+        ).show()
         
         completed = sum(1 for s in goal_status.values() if s['status'] == 'completed')
         total = len(goals)
@@ -366,17 +782,13 @@ class ComprehensiveResearchLog:
         existing data to maintain continuity throughout the day.
         """
 
-        existing_summary = self._load_daily_goals()
+        summary = self._load_daily_goals()
         
         # Preserve existing data while adding new goals
-        summary = {
-            'date': existing_summary['date'],
-            'goals': existing_summary.get('goals', []) + goals,
-            'completed_tasks': existing_summary.get('completed_tasks', []),
-            'insights': existing_summary.get('insights', []),
-            'next_day_todos': existing_summary.get('next_day_todos', []),
-            'goal_status': existing_summary.get('goal_status', {})
-        }
+        summary['goals'] = summary.get('goals', []) + goals
+        for key in ('completed_tasks', 'insights', 'next_day_todos'):
+            summary.setdefault(key, [])
+        summary.setdefault('goal_status', {})
         
         # Initialize status for new goals
 
@@ -391,9 +803,6 @@ class ComprehensiveResearchLog:
                     'completion_time': None
                 }
         
-        # Update in-memory state
-        self.daily_summaries.append(summary)
-        
         # Display current goals with their status
         console.display_header("Daily Research Goals")
         table = Table(show_header=True, header_style="bold magenta")
@@ -427,12 +836,19 @@ class ComprehensiveResearchLog:
         console.log(table)
         
         # Save the updated summary
-        self._save_daily_summary(summary)
+        self._mark_daily_dirty()
+        self.flush_daily_summary()
         return summary
 
     def add_paper_note(self, notebook_id: str, page_number: int, 
                       note_type: str, summary: str) -> PaperNoteReference:
-        """Record a new paper note reference"""
+        """Record a new paper note reference, skipping notebook pages already logged"""
+        duplicate = self.note_index.find_duplicate(notebook_id, page_number, note_type)
+        if duplicate is not None:
+            console.log(f"[yellow]Page {page_number} of {notebook_id} already has a [{note_type}] note "
+                        f"from {format_date(duplicate.date)}: {duplicate.brief_summary}[/yellow]")
+            return duplicate
+        
         note = PaperNoteReference(
             notebook_id=notebook_id,
             page_number=page_number,
@@ -441,25 +857,65 @@ class ComprehensiveResearchLog:
             brief_summary=summary
         )
         self.paper_notes.append(note)
+        self.note_index.add(note)
         
-        # Save to disk
-        notes_file = self.base_path / 'paper_notes' / 'note_references.json'
-        current_notes = []
-        if notes_file.exists():
-            with open(notes_file, 'r') as f:
-                current_notes = json.load(f)
-        
-        current_notes.append(asdict(note))
-        with open(notes_file, 'w') as f:
-            json.dump(current_notes, f, indent=2, cls=DateTimeEncoder)
+        self._record_mutation('note.add', note_to_dict(note))
         
         console.log(f"[green]Added paper note reference: {summary}[/green]")
         return note
 
+    def generate_notebook_toc(self, notebook_id: str) -> str:
+        """
+        Build the table of contents for a physical notebook from logged notes.
+        
+        The result is printed and written to paper_notes/toc_<notebook>.md so it
+        can be copied into the reserved contents pages of the notebook.
+        """
+        toc = self.note_index.table_of_contents(notebook_id)
+        if not toc:
+            console.log(f"[yellow]No notes logged for notebook {notebook_id}[/yellow]")
+            return ""
+        
+        lines = [f"# {notebook_id} Table of Contents", ""]
+        for page_number, notes in toc:
+            for note in notes:
+                lines.append(f"- p. {page_number} [{note.note_type}] {note.brief_summary} ({format_date(note.date)})")
+        contents = "\n".join(lines) + "\n"
+        
+        safe_id = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in notebook_id)
+        with open(self.base_path / 'paper_notes' / f"toc_{safe_id}.md", 'w') as f:
+            f.write(contents)
+        
+        PaginatedTable(
+            columns=[
+                Column("Page", lambda entry: str(entry[0])),
+                Column("Type", lambda entry: Text(f"[{entry[1].note_type}]")),
+                Column("Summary", lambda entry: Text(entry[1].brief_summary), max_width=70),
+                Column("Date", lambda entry: format_date(entry[1].date))
+            ],
+            rows=[(page_number, note) for page_number, notes in toc for note in notes],
+            title=f"{notebook_id} Table of Contents"
+        ).show()
+        return contents
+
     def add_idea(self, title: str, description: str, 
-                 paper_note: Optional[PaperNoteReference] = None) -> str:
-        """Capture a new research idea"""
+                 paper_note: Optional[PaperNoteReference] = None,
+                 link_similar: Optional[bool] = None) -> str:
+        """
+        Capture a new research idea.
+        
+        Existing ideas with similar titles and descriptions are suggested,
+        flagging likely duplicates, and linked through the new idea's
+        related_ideas once confirmed. link_similar answers that question
+        without asking.
+        """
         idea_id = f"IDEA-{datetime.now():%Y%m%d-%H%M}"
+        similar = self.find_similar_ideas(f"{title} {description}", exclude=idea_id)
+        related = []
+        if similar:
+            self._display_similar_ideas(similar)
+            if link_similar if link_similar is not None else console.confirm("Link these ideas as related?"):
+                related = [match_id for match_id, _ in similar]
         idea = ResearchIdea(
             id=idea_id,
             title=title,
@@ -469,7 +925,7 @@ class ComprehensiveResearchLog:
             last_updated=datetime.now(),
             prerequisites=[],
             paper_notes=[paper_note] if paper_note else [],
-            related_ideas=[],
+            related_ideas=related,
             potential_impact="",
             effort_estimate="",
             next_steps="Initial exploration needed",
@@ -481,6 +937,61 @@ class ComprehensiveResearchLog:
         console.log(f"[green]Added new idea: {title} ({idea_id})[/green]")
         return idea_id
 
+    def find_similar_ideas(self, text: str, threshold: float = RELATED_IDEA_THRESHOLD,
+                           exclude: Optional[str] = None) -> List[tuple]:
+        """(idea id, estimated similarity) pairs for ideas resembling the text, best first."""
+        return [
+            (match_id, score)
+            for match_id, score in self.idea_similarity.similar(text, threshold, exclude=exclude)
+            if match_id in self.ideas
+        ]
+
+    def _display_similar_ideas(self, similar: List[tuple]) -> None:
+        table = Table(show_header=True, header_style="bold magenta", title="Similar existing ideas")
+        table.add_column("ID")
+        table.add_column("Title")
+        table.add_column("Status")
+        table.add_column("Similarity")
+        for match_id, score in similar:
+            match = self.ideas[match_id]
+            label = f"{score:.0%}"
+            if score >= DUPLICATE_IDEA_THRESHOLD:
+                label = f"[red]{label} likely duplicate[/red]"
+            table.add_row(match_id, match.title, match.status.value, label)
+        console.log(table)
+
+    def add_prerequisite(self, idea_id: str, prerequisite_id: str) -> bool:
+        """Record that one idea depends on another, refusing links that form a cycle."""
+        if idea_id not in self.ideas or prerequisite_id not in self.ideas:
+            console.log("[red]Both ideas must exist to link them[/red]")
+            return False
+        if self.idea_graph.would_create_cycle(idea_id, prerequisite_id):
+            console.log(f"[red]{prerequisite_id} already depends on {idea_id}; link would create a cycle[/red]")
+            return False
+        
+        idea = self.ideas[idea_id]
+        if prerequisite_id not in idea.prerequisites:
+            idea.prerequisites.append(prerequisite_id)
+            idea.last_updated = datetime.now()
+            self._save_idea(idea)
+        return True
+
+    def get_prerequisite_closure(self, idea_id: str) -> List[ResearchIdea]:
+        """All ideas the given idea transitively depends on."""
+        return [self.ideas[i] for i in sorted(self.idea_graph.prerequisite_closure(idea_id)) if i in self.ideas]
+
+    def get_ready_ideas(self) -> List[ResearchIdea]:
+        """READY ideas ordered so that prerequisites come before their dependents."""
+        return [self.ideas[i] for i in self.idea_graph.ready_order()]
+
+    def get_unblocked_by(self, idea_id: str) -> List[ResearchIdea]:
+        """Ideas whose last unfinished prerequisite is the given idea."""
+        return [self.ideas[i] for i in self.idea_graph.unblocked_by(idea_id) if i in self.ideas]
+
+    def find_idea_cycles(self) -> List[List[str]]:
+        """Groups of idea ids whose prerequisites depend on each other."""
+        return self.idea_graph.find_cycles()
+
     def get_stale_ideas(self, days_threshold: int = 10) -> List[ResearchIdea]:
         """Find ideas that haven't been updated recently"""
         current_time = datetime.now()
@@ -488,40 +999,51 @@ class ComprehensiveResearchLog:
             idea for idea in self.ideas.values()
             if (current_time - idea.last_updated).days > days_threshold
             and idea.status != IdeaStatus.BLOCKED
+            and idea.status not in TERMINAL_STATUSES
         ]
         
         if stale_ideas:
             console.log("\n[yellow]Stale Ideas Found:[/yellow]")
-            table = Table(show_header=True, header_style="bold magenta")
-            table.add_column("ID")
-            table.add_column("Title")
-            table.add_column("Status")
-            table.add_column("Last Updated")
-            
-            for idea in stale_ideas:
-                table.add_row(
-                    idea.id,
-                    idea.title,
-                    idea.status.value,
-                    idea.last_updated.strftime("%Y-%m-%d")
-                )
-            
-            console.log(table)
+            PaginatedTable(
+                columns=[
+                    Column("ID", lambda idea: idea.id),
+                    Column("Title", lambda idea: idea.title, max_width=60),
+                    Column("Status", lambda idea: idea.status.value),
+                    Column("Last Updated", lambda idea: format_date(idea.last_updated))
+                ],
+                rows=stale_ideas,
+                sort_key=lambda idea: idea.last_updated,
+                detail=self._idea_detail
+            ).show()
 
         else:
             console.log(f"\n[yellow]No Stale Ideas Found > {days_threshold} Days[/yellow]")
         
         return stale_ideas
 
+    def _idea_detail(self, idea: ResearchIdea) -> str:
+        """Full-text view of an idea for table drill-down."""
+        return (
+            f"[bold]{idea.id}: {idea.title}[/bold]\n"
+            f"Status: {idea.status.value}  Priority: {idea.priority}\n"
+            f"{idea.description}\n"
+            f"Next steps: {idea.next_steps}"
+        )
+
     def add_insight(self, observation: str, implications: str):
-        """Record important insights or realizations"""
-        insight = {
-            'timestamp': datetime.now(),
-            'observation': observation,
-            'implications': implications,
-            'experiment_id': id(self.current_experiment) if self.current_experiment else None
-        }
-        self.insights.append(insight)
+        """
+        Record important insights or realizations.
+        
+        The insight is durably stored right away, linked to the running
+        experiment and the ideas it tests.
+        """
+        experiment = self.current_experiment
+        insight = self.insights.append(
+            observation,
+            implications,
+            experiment_id=experiment_id(experiment) if experiment else None,
+            idea_ids=experiment.related_ideas if experiment else []
+        )
         
         # Update current experiment if one is active
         if self.current_experiment:
@@ -529,22 +1051,96 @@ class ComprehensiveResearchLog:
                 self.current_experiment.results['insights'] = []
             self.current_experiment.results['insights'].append(insight)
         
-        # Add to daily summary if one exists
-        if self.daily_summaries:
-            self.daily_summaries[-1]['insights'].append(insight)
+        # Add to today's summary; the write is deferred to the next flush
+        self._load_daily_goals().setdefault('insights', []).append(insight)
+        self._mark_daily_dirty()
         
         console.log(f"[green]Recorded new insight: {observation}[/green]")
         return insight
 
+    def _import_legacy_insights(self) -> None:
+        """
+        Seed a new insight store from daily logs and experiment results.
+        
+        Older insights were linked to experiments by in-memory object ids,
+        which do not survive a restart; an insight is linked to an experiment
+        when the same insight is found in that experiment's results.
+        """
+        found: Dict[tuple, Dict[str, Any]] = {}
+        for experiment in self.iter_experiments():
+            for insight in experiment.results.get('insights', []):
+                key = (str(insight.get('timestamp')), insight.get('observation', ''))
+                found[key] = dict(insight, experiment_id=experiment_id(experiment),
+                                  idea_ids=experiment.related_ideas)
+        for _, summary in self.daily_logs.iter_days():
+            for insight in summary.get('insights', []):
+                key = (str(insight.get('timestamp')), insight.get('observation', ''))
+                found.setdefault(key, dict(insight, experiment_id=None, idea_ids=[]))
+        
+        legacy = [
+            {
+                'timestamp': str(insight.get('timestamp') or datetime.now().isoformat()),
+                'observation': insight.get('observation', ''),
+                'implications': insight.get('implications', ''),
+                'experiment_id': insight['experiment_id'],
+                'idea_ids': insight['idea_ids'],
+            }
+            for insight in found.values()
+        ]
+        self.insights.append_many(sorted(legacy, key=lambda insight: insight['timestamp']))
+        if legacy:
+            console.log(f"[green]Imported {len(legacy)} insights into the insight store[/green]")
+
+    def show_insights(self, linked_id: Optional[str] = None, days: Optional[int] = None):
+        """
+        Page through insights, newest last, optionally only those linked to an
+        experiment or idea id, or recorded in the last `days` days.
+        """
+        start = datetime.now() - timedelta(days=days) if days else None
+        if linked_id and linked_id.startswith('experiment_'):
+            results = self.insights.query(experiment_id=linked_id, start=start)
+        else:
+            results = self.insights.query(idea_id=linked_id or None, start=start)
+        
+        PaginatedTable(
+            columns=[
+                Column("ID", lambda insight: insight['id']),
+                Column("Recorded", lambda insight: format_date(datetime.fromisoformat(insight['timestamp']))),
+                Column("Observation", lambda insight: insight['observation'], max_width=50),
+                Column("Experiment", lambda insight: insight['experiment_id'] or "-"),
+            ],
+            rows=results,
+            detail=lambda insight: (
+                f"[bold]{insight['id']}[/bold] ({insight['timestamp']})\n"
+                f"{insight['observation']}\n"
+                f"Implications: {insight['implications']}\n"
+                f"Ideas: {', '.join(insight['idea_ids']) or '-'}"
+            ),
+            title=f"Insights ({len(results)})"
+        ).show()
+        return results
+
+    def timeline(self) -> Timeline:
+        """Every idea, note, experiment, insight and goal of the project in time order."""
+        self.flush_daily_summary()
+        return Timeline(self)
+
     def start_experiment(self, hypothesis: str, methodology: str, 
-                        parameters: dict, related_idea_id: Optional[str] = None):
-        """Begin a new research experiment"""
+                        parameters: dict, related_idea_id: Optional[str] = None,
+                        datasets: Optional[List[str]] = None):
+        """
+        Begin a new research experiment.
+        
+        datasets names registered datasets the run reads; their latest versions
+        are declared up front so that an identical earlier run can be found in
+        the result cache, which is reported if it is.
+        """
         if self.current_experiment:
             console.log("[yellow]Warning: Concluding previous experiment automatically[/yellow]")
             self.conclude_experiment("Automatically concluded", "Switched to new experiment")
 
         experiment = Experiment(
-            timestamp=datetime.now(),
+            timestamp=self._unused_start_time(),
             hypothesis=hypothesis,
             methodology=methodology,
             results={},
@@ -558,9 +1154,10 @@ class ComprehensiveResearchLog:
         )
         
         self.current_experiment = experiment
+        self._index_experiment(experiment)
         
         # Create experiment directory
-        exp_dir = self.base_path / 'experiments' / f"experiment_{experiment.timestamp:%Y%m%d_%H%M%S}"
+        exp_dir = self._experiment_dir(experiment)
         exp_dir.mkdir(parents=True, exist_ok=True)
         
         # Save initial experiment metadata
@@ -574,8 +1171,33 @@ class ComprehensiveResearchLog:
             }, f, indent=2, cls=DateTimeEncoder)
         
         console.log(f"[green]Started new experiment: {hypothesis}[/green]")
+        
+        for name in datasets or []:
+            self.use_dataset(name)
+        key = self._result_key(experiment)
+        cached = self.result_cache.get(key) if key else None
+        if cached is not None:
+            console.log(
+                f"[yellow]An identical run was concluded as {cached['experiment_id']} on "
+                f"{cached['concluded_at'][:10]}; its results can be reused[/yellow]"
+            )
         return experiment
 
+    def _unused_start_time(self) -> datetime:
+        """
+        The current time, or the next second whose experiment id is still free.
+        
+        Experiment ids and directories have one-second resolution, so a run
+        started within the same second as another would otherwise replace it.
+        """
+        timestamp = datetime.now()
+        while True:
+            key = experiment_key(timestamp)
+            if not (self.experiments.contains(key) or self.cold.contains('experiments', key)
+                    or (self.base_path / 'experiments' / key).exists()):
+                return timestamp
+            timestamp = timestamp.replace(microsecond=0) + timedelta(seconds=1)
+
     def conclude_experiment(self, conclusions: str, next_steps: str):
         """Conclude current experiment with findings and future directions"""
         if not self.current_experiment:
@@ -583,37 +1205,453 @@ class ComprehensiveResearchLog:
         
         self.current_experiment.conclusions = conclusions
         self.current_experiment.next_steps = next_steps
+        self.current_experiment.results['concluded_at'] = datetime.now().isoformat()
         
         # Save final results
-        exp_dir = self.base_path / 'experiments' / f"experiment_{self.current_experiment.timestamp:%Y%m%d_%H%M%S}"
+        exp_dir = self._experiment_dir(self.current_experiment)
         
-        # Save complete experiment data
-        with open(exp_dir / 'results.json', 'w') as f:
-            json.dump({
-                'hypothesis': self.current_experiment.hypothesis,
-                'methodology': self.current_experiment.methodology,
-                'parameters': self.current_experiment.parameters,
-                'results': self.current_experiment.results,
-                'metrics': self.current_experiment.metrics,
-                'conclusions': conclusions,
-                'next_steps': next_steps,
-                'end_time': datetime.now().isoformat()
-            }, f, indent=2, cls=DateTimeEncoder)
+        # Save complete experiment data, compressing large result payloads
+        save_json({
+            'hypothesis': self.current_experiment.hypothesis,
+            'methodology': self.current_experiment.methodology,
+            'parameters': self.current_experiment.parameters,
+            'results': self.current_experiment.results,
+            'metrics': self.current_experiment.metrics,
+            'conclusions': conclusions,
+            'next_steps': next_steps,
+            'end_time': datetime.now().isoformat()
+        }, exp_dir / 'results.json', compress_threshold=COMPRESS_THRESHOLD)
         
-        self.experiments.append(self.current_experiment)
+        self._save_experiment(self.current_experiment)
+        key = self._result_key(self.current_experiment)
+        if key and 'reused_from' not in self.current_experiment.results:
+            self.result_cache.put(key, self._outcome(self.current_experiment))
+            self.result_cache.save()
         self.current_experiment = None
         
         console.log("[green]Experiment concluded successfully[/green]")
 
-    def _save_daily_summary(self, summary: Dict[str, Any]) -> None:
+    def _result_key(self, experiment: Experiment) -> Optional[str]:
+        """The experiment's result cache key, or None when its code version is unknown or uncommitted."""
+        if not cacheable_version(experiment.code_version):
+            return None
+        return result_key(experiment.parameters, experiment.code_version, experiment.results.get('datasets', []))
+
+    def _outcome(self, experiment: Experiment) -> Dict[str, Any]:
+        """What the result cache keeps of a concluded experiment."""
+        return {
+            'experiment_id': experiment_id(experiment),
+            'concluded_at': self._concluded_at(experiment).isoformat(),
+            'parameters': experiment.parameters,
+            'code_version': experiment.code_version,
+            'results': {name: value for name, value in experiment.results.items() if name not in RUN_FIELDS},
+            'metrics': experiment.metrics,
+            'conclusions': experiment.conclusions,
+            'next_steps': experiment.next_steps,
+        }
+
+    def _seed_result_cache(self) -> None:
+        """Fill a new result cache from the concluded experiments that are not archived."""
+        for experiment in self.experiments:
+            key = self._result_key(experiment)
+            if key and 'reused_from' not in experiment.results:
+                self.result_cache.put(key, self._outcome(experiment))
+        self.result_cache.save()
+
+    def cached_result(self) -> Optional[Dict[str, Any]]:
+        """The cached outcome of an earlier run identical to the current experiment, if any."""
+        if not self.current_experiment:
+            raise ValueError("No active experiment to look up")
+        key = self._result_key(self.current_experiment)
+        return self.result_cache.peek(key) if key else None
+
+    def reuse_cached_result(self) -> Optional[Dict[str, Any]]:
+        """
+        Copy the results and metrics of an identical earlier run into the
+        current experiment instead of running it. The experiment still has
+        to be concluded; returns the cached outcome, or None without one.
+        """
+        cached = self.cached_result()
+        if cached is None:
+            return None
+        # Outcomes cached before a field was counted as per-run may still hold it
+        self.current_experiment.results.update(
+            (name, value) for name, value in cached['results'].items() if name not in RUN_FIELDS
+        )
+        self.current_experiment.results['reused_from'] = cached['experiment_id']
+        self.current_experiment.metrics = cached['metrics']
+        self._update_experiment_metadata(reused_from=cached['experiment_id'])
+        console.log(f"[green]Reused the results of {cached['experiment_id']}[/green]")
+        return cached
+
+    def _index_experiment(self, experiment: Experiment) -> None:
+        """Add or refresh an experiment in the parameter index."""
+        self.param_index.add(experiment_id(experiment), experiment.parameters)
+
+    def _save_experiment(self, experiment: Experiment) -> None:
+        """Log a concluded experiment's new state and store it in the experiment collection."""
+        self._record_mutation('experiment.save', experiment_to_dict(experiment))
+        self.experiments.put(experiment)
+        self._index_experiment(experiment)
+
+    def _hot_experiment(self, key: str) -> Optional[Experiment]:
+        """The running experiment or a concluded one that is not archived."""
+        if self.current_experiment is not None and experiment_id(self.current_experiment) == key:
+            return self.current_experiment
+        return self.experiments.get(key)
+
+    def find_experiments(self, equals: Optional[Dict[str, Any]] = None,
+                         ranges: Optional[Dict[str, tuple]] = None,
+                         include_cold: bool = False) -> List[Experiment]:
+        """
+        Experiments whose parameters match every condition, oldest first.
+        
+        Archived experiments are searched through their catalogued parameters
+        when include_cold is set; only the matches are read from the archive.
+        
+        Example: find_experiments(equals={'window': 20}, ranges={'lr': (1e-4, 1e-3)})
+        """
+        keys = self.param_index.query(equals=equals, ranges=ranges)
+        found = {key: self._hot_experiment(key) for key in keys}
+        if include_cold:
+            if self._cold_param_index is None:
+                self._cold_param_index = ParameterIndex()
+                for key in self.cold.keys('experiments'):
+                    self._cold_param_index.add(key, self.cold.summary('experiments', key)['parameters'])
+            cold_keys = self._cold_param_index.query(equals=equals, ranges=ranges) - set(found)
+            for key, record in self.cold.iter_records('experiments', cold_keys):
+                found[key] = experiment_from_dict(record)
+        return [found[key] for key in sorted(found)]
+
+    def update_idea_status(self, idea_id: str, status: IdeaStatus) -> bool:
+        """Move an idea to a new status, e.g. to mark it completed or abandoned."""
+        idea = self.ideas.get(idea_id)
+        if idea is None:
+            console.log(f"[red]No active idea {idea_id}[/red]")
+            return False
+        if idea.status != status:
+            idea.status = status
+            idea.last_updated = datetime.now()
+            self._save_idea(idea)
+        console.log(f"[green]{idea_id} is now {status.value}[/green]")
+        return True
+
+    def _concluded_at(self, experiment: Experiment) -> datetime:
+        concluded = experiment.results.get('concluded_at')
+        return datetime.fromisoformat(concluded) if concluded else experiment.timestamp
+
+    def apply_tiering(self, max_age_days: int = COLD_AFTER_DAYS) -> Dict[str, int]:
+        """
+        Move old finished work out of the files loaded on every open.
+        
+        Experiments concluded more than max_age_days ago, and ideas in a terminal
+        state untouched for as long, go to the cold store. An idea stays hot
+        while any hot idea that is still open lists it as a prerequisite.
+        Returns the number of records moved per kind.
+        """
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        
+        # Selected from the in-memory summaries; bodies are loaded one at a time below
+        experiment_keys = [
+            key for key in self.experiments.keys()
+            if self.experiments.summary(key)['concluded_at'] < cutoff
+        ]
+        
+        candidates = {
+            idea_id for idea_id, idea in self.ideas.items()
+            if idea.status in TERMINAL_STATUSES and idea.last_updated < cutoff
+        }
+        changed = True
+        while changed:
+            changed = False
+            for idea_id in list(candidates):
+                if any(d not in candidates for d in self.idea_graph.dependents(idea_id) if d in self.ideas):
+                    candidates.discard(idea_id)
+                    changed = True
+        
+        if not experiment_keys and not candidates:
+            return {'ideas': 0, 'experiments': 0}
+        
+        def archived_experiments():
+            for key in experiment_keys:
+                exp = self.experiments.get(key)
+                yield key, experiment_to_dict(exp), {
+                    'timestamp': exp.timestamp.isoformat(),
+                    'concluded_at': self._concluded_at(exp).isoformat(),
+                    'hypothesis': exp.hypothesis,
+                    'parameters': exp.parameters,
+                }
+        
+        self.cold.add('experiments', archived_experiments())
+        self.cold.add('ideas', [
+            (idea_id, idea_to_dict(self.ideas[idea_id]), {
+                'title': self.ideas[idea_id].title,
+                'status': self.ideas[idea_id].status.value,
+                'created_date': self.ideas[idea_id].created_date.isoformat(),
+                'last_updated': self.ideas[idea_id].last_updated.isoformat(),
+            })
+            for idea_id in sorted(candidates)
+        ])
+        
+        self.experiments.remove(experiment_keys)
+        for key in experiment_keys:
+            self.param_index.remove(key)
+        for idea_id in candidates:
+            del self.ideas[idea_id]
+            self._unindex_idea(idea_id)
+        self._cold_param_index = None
+        
+        # Rewrite the hot project files without the archived records
+        self.checkpoint()
+        
+        console.log(
+            f"[green]Moved {len(experiment_keys)} experiments and {len(candidates)} ideas to cold storage[/green]"
+        )
+        return {'ideas': len(candidates), 'experiments': len(experiment_keys)}
+
+    def iter_experiments(self, include_cold: bool = True):
+        """Concluded experiments, archived ones first, read from cold storage on demand."""
+        if include_cold:
+            for key, record in self.cold.iter_records('experiments'):
+                if not self.experiments.contains(key):
+                    yield experiment_from_dict(record)
+        yield from self.experiments
+
+    def iter_ideas(self, include_cold: bool = True):
+        """All ideas, archived ones first, read from cold storage on demand."""
+        if include_cold:
+            for key, record in self.cold.iter_records('ideas'):
+                if key not in self.ideas:
+                    yield idea_from_dict(record)
+        # A snapshot, so that ideas added meanwhile do not break a running export or backup
+        yield from list(self.ideas.values())
+
+    def get_idea(self, idea_id: str) -> Optional[ResearchIdea]:
+        """Look an idea up in the hot set, falling back to cold storage."""
+        if idea_id in self.ideas:
+            return self.ideas[idea_id]
+        record = self.cold.get('ideas', idea_id)
+        return idea_from_dict(record) if record else None
+
+    def get_experiment(self, key: str) -> Optional[Experiment]:
+        """Look an experiment up by id in the hot set, falling back to cold storage."""
+        experiment = self._hot_experiment(key)
+        if experiment is not None:
+            return experiment
+        record = self.cold.get('experiments', key)
+        return experiment_from_dict(record) if record else None
+
+    def rebuild_experiment_index(self) -> int:
+        """
+        Rebuild concluded experiments from their experiment directories.
+        
+        The metadata.json and results.json of each directory are taken as the
+        source of truth; fields only kept in the index, like the code version,
+        are preserved. Archived experiments are left alone. Returns the number
+        of experiments added or corrected.
+        """
+        changed = 0
+        for exp_dir in sorted((self.base_path / 'experiments').glob('experiment_*')):
+            key = exp_dir.name
+            if not exp_dir.is_dir() or self.cold.contains('experiments', key):
+                continue
+            if self.current_experiment is not None and key == experiment_id(self.current_experiment):
+                continue
+            existing = self.experiments.get(key)
+            base = experiment_to_dict(existing) if existing is not None else None
+            try:
+                record = experiment_from_directory(exp_dir, base)
+            except (IOError, KeyError, TypeError, ValueError) as e:
+                console.log(f"[yellow]Warning: Cannot rebuild {key}: {str(e)}[/yellow]")
+                continue
+            if record is None or record == base:
+                continue
+            
+            experiment = experiment_from_dict(record)
+            self.experiments.put(experiment)
+            self._index_experiment(experiment)
+            changed += 1
+        
+        self.checkpoint()
+        console.log(f"[green]Rebuilt {changed} experiments from their directories[/green]")
+        return changed
+
+    def drop_dangling_references(self) -> int:
+        """
+        Remove prerequisite and related-idea links to ideas that do not exist.
+        
+        Hot ideas and concluded experiments are updated through the mutation
+        log like any other edit. Returns the number of records changed.
+        """
+        known = {idea.id for idea in self.iter_ideas()}
+        changed = 0
+        for idea in list(self.ideas.values()):
+            prerequisites = [ref for ref in idea.prerequisites if ref in known]
+            related = [ref for ref in idea.related_ideas if ref in known]
+            if prerequisites != idea.prerequisites or related != idea.related_ideas:
+                idea.prerequisites = prerequisites
+                idea.related_ideas = related
+                self._save_idea(idea)
+                changed += 1
+        for key in self.experiments.keys():
+            experiment = self.experiments.get(key)
+            related = [ref for ref in experiment.related_ideas if ref in known]
+            if related != experiment.related_ideas:
+                experiment.related_ideas = related
+                self._save_experiment(experiment)
+                changed += 1
+        
+        console.log(f"[green]Removed dangling idea references from {changed} records[/green]")
+        return changed
+
+    def _experiment_dir(self, experiment: Experiment) -> Path:
+        return self.base_path / 'experiments' / experiment_id(experiment)
+
+    def add_artifact(self, path: Path, name: Optional[str] = None,
+                     kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Register a file produced by the current experiment in the artifact store.
+        
+        The file is stored once by content hash and a reference is recorded in the
+        experiment's results and metadata.
+        """
+        if not self.current_experiment:
+            raise ValueError("No active experiment to attach an artifact to")
+        
+        path = Path(path)
+        digest, size, deduplicated = self.artifacts.put(path)
+        ref = make_artifact_ref(path, digest, size, name=name, kind=kind)
+        self.current_experiment.results.setdefault('artifacts', []).append(ref)
+        
+        # Record the reference on disk right away so garbage collection sees it
+        self._update_experiment_metadata(artifacts=self.current_experiment.results['artifacts'])
+        
+        if deduplicated:
+            console.log(f"[green]Linked existing artifact {ref['name']} ({digest[:12]})[/green]")
+        else:
+            console.log(f"[green]Stored artifact {ref['name']} ({digest[:12]}, {size} bytes)[/green]")
+        return ref
+
+    def _metric_store(self, experiment: Experiment) -> MetricStore:
+        key = experiment_id(experiment)
+        if key not in self._metric_stores:
+            self._metric_stores[key] = MetricStore(self._experiment_dir(experiment) / 'metrics')
+        return self._metric_stores[key]
+
+    def _metric_experiment(self, key: Optional[str]) -> Experiment:
+        """The experiment with an id, or the current one for None."""
+        experiment = self.current_experiment if key is None else self.get_experiment(key)
+        if experiment is None:
+            raise ValueError(f"No experiment {key}" if key else "No active experiment")
+        return experiment
+
+    def log_metric(self, name: str, values: Any, steps: Any = None) -> Dict[str, Any]:
+        """
+        Append one value or an array of values to a metric series of the
+        current experiment. Rollup tiers are extended as points arrive, and
+        the series summary is kept in the experiment's metrics.
+        """
+        if not self.current_experiment:
+            raise ValueError("No active experiment to log a metric for")
+        series = self._metric_store(self.current_experiment).series(name)
+        series.append(values, steps)
+        summary = series.summary()
+        self.current_experiment.metrics[name] = summary
+        return summary
+
+    def metric_names(self, key: Optional[str] = None) -> List[str]:
+        """Names of the metric series logged for an experiment, the current one by default."""
+        return self._metric_store(self._metric_experiment(key)).names()
+
+    def metric_view(self, name: str, key: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None, max_points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+        """A downsampled view of a metric series; see MetricSeries.view."""
+        store = self._metric_store(self._metric_experiment(key))
+        if name not in store.names():
+            raise ValueError(f"No metric series {name}")
+        return store.series(name).view(start, end, max_points)
+
+    def show_metric(self, name: str, key: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None) -> None:
+        """Draw a metric series as a sparkline as wide as the console."""
+        view = self.metric_view(name, key, start, end, max_points=max(console.console.width - 4, 10))
+        if not len(view['step']):
+            console.log("[yellow]No points in that range.[/yellow]")
+            return
+        mean = view['mean']
+        low, high = float(view['min'].min()), float(view['max'].max())
+        scale = (mean - low) / (high - low) if high > low else np.zeros(len(mean))
+        blocks = "▁▂▃▄▅▆▇█"
+        line = ''.join(blocks[int(round(value * (len(blocks) - 1)))] for value in scale)
+        console.log(f"\n[bold]{name}[/bold] steps {view['step'][0]:g} to {view['step'][-1]:g} "
+                    f"(tier {view['tier']}, {len(mean)} points)")
+        console.log(f"max {high:g}")
+        console.log(f"[cyan]{line}[/cyan]")
+        console.log(f"min {low:g}")
+
+    def _update_experiment_metadata(self, **fields: Any) -> None:
+        """Merge fields into the current experiment's metadata.json."""
+        metadata_path = self._experiment_dir(self.current_experiment) / 'metadata.json'
+        metadata = load_json(metadata_path) or {}
+        metadata.update(fields)
+        save_json(metadata, metadata_path)
+
+    def get_artifact_path(self, ref: Dict[str, Any]) -> Path:
+        """Location of a stored artifact's contents."""
+        return self.artifacts.blob_path(ref['sha256'])
+
+    def collect_artifact_garbage(self) -> int:
+        """Remove stored artifacts that no experiment references any more."""
+        records = []
+        for exp_dir in (self.base_path / 'experiments').glob('experiment_*'):
+            for filename in ('metadata.json', 'results.json'):
+                try:
+                    records.append(load_json(exp_dir / filename))
+                except IOError as e:
+                    # An unreadable record might hold references; keep everything
+                    console.log(f"[red]Skipping garbage collection, {str(e)}[/red]")
+                    return 0
+        if self.current_experiment:
+            records.append(self.current_experiment.results)
+        
+        removed, freed = self.artifacts.collect_garbage(referenced_digests(records))
+        console.log(f"[green]Removed {removed} unreferenced artifacts ({freed} bytes)[/green]")
+        return removed
+
+    def register_dataset(self, name: str, path: Path, shape: Optional[tuple] = None,
+                         dtype: Optional[str] = None) -> Dict[str, Any]:
+        """Record shape, dtype and checksum of a .npy or raw binary dataset."""
+        entry = self.datasets.register(name, Path(path), shape=shape, dtype=dtype)
+        console.log(f"[green]Registered dataset {name} v{entry['version']} "
+                    f"{tuple(entry['shape'])} {entry['dtype']}[/green]")
+        return entry
+
+    def open_dataset(self, name: str, version: Optional[int] = None):
+        """Open a registered dataset as a read-only memory-mapped array."""
+        return self.datasets.open(name, version)
+
+    def use_dataset(self, name: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """Declare that the current experiment uses a dataset version."""
+        if not self.current_experiment:
+            raise ValueError("No active experiment to declare a dataset for")
+        
+        entry = self.datasets.get(name, version)
+        declared = self.current_experiment.results.setdefault('datasets', [])
+        reference = {'name': name, 'version': entry['version'], 'checksum': entry['checksum']}
+        if reference not in declared:
+            declared.append(reference)
+            self._update_experiment_metadata(datasets=declared)
+        return reference
+
+    def _save_daily_summary(self, summary: Dict[str, Any], day=None) -> None:
         """
         Save or update the daily summary file, preserving file consistency.
         
         This method ensures atomic writes to prevent data corruption and maintains
-        proper JSON formatting with datetime handling.
+        proper JSON formatting with datetime handling. The file for the given day
+        is written, defaulting to today.
         """
-        today = datetime.now()
-        daily_log_path = self.base_path / 'daily_logs' / f"daily_{today:%Y%m%d}.json"
+        daily_log_path = self.daily_logs.live_path(day or datetime.now().date())
         
         try:
             # Create a temporary file for atomic write
@@ -636,6 +1674,7 @@ class ComprehensiveResearchLog:
             
             # Atomic rename to ensure file consistency
             temp_path.replace(daily_log_path)
+            self.watcher.acknowledge(daily_log_path)
             
             console.log(f"[green]Successfully saved daily summary to {daily_log_path}[/green]")
         except Exception as e:
@@ -644,55 +1683,100 @@ class ComprehensiveResearchLog:
                 temp_path.unlink()
             raise
 
-    def generate_weekly_digest(self) -> str:
-        """Create a comprehensive weekly research summary"""
+    def generate_weekly_digest(self, write_reports: bool = True) -> str:
+        """
+        Create a comprehensive weekly research summary.
+        
+        With write_reports=False only the tables are shown; the caller is
+        expected to run generate_reports itself, for instance in the background.
+        """
         week_start = datetime.now() - timedelta(days=7)
         
-        # Create tables for rich display
-        experiments_table = Table(show_header=True, header_style="bold magenta")
-        experiments_table.add_column("Hypothesis")
-        experiments_table.add_column("Status")
-        experiments_table.add_column("Conclusions")
-        
-        ideas_table = Table(show_header=True, header_style="bold magenta")
-        ideas_table.add_column("Priority")
-        ideas_table.add_column("Title")
-        ideas_table.add_column("Status")
-        ideas_table.add_column("Next Steps")
-        
-        # Active experiments
-        recent_experiments = [e for e in self.experiments if e.timestamp > week_start]
-        for exp in recent_experiments:
-            experiments_table.add_row(
-                exp.hypothesis,
-                'Ongoing' if exp == self.current_experiment else 'Completed',
-                exp.conclusions if exp.conclusions else 'No conclusions yet'
-            )
+        experiments_view = PaginatedTable(
+            columns=[
+                Column("Hypothesis", lambda exp: exp.hypothesis, max_width=60),
+                Column("Status", lambda exp: 'Ongoing' if exp == self.current_experiment else 'Completed'),
+                Column("Conclusions", lambda exp: exp.conclusions if exp.conclusions else 'No conclusions yet',
+                       max_width=60)
+            ],
+            rows=self.experiments.since(week_start, newest_first=True),
+            detail=lambda exp: f"[bold]{exp.hypothesis}[/bold]\n{exp.methodology}\n{exp.conclusions}"
+        )
         
-        # Ideas progress
-        active_ideas = [i for i in self.ideas.values() if i.last_updated > week_start]
-        for idea in active_ideas:
-            ideas_table.add_row(
-                str(idea.priority),
-                idea.title,
-                idea.status.value,
-                idea.next_steps
-            )
+        ideas_view = PaginatedTable(
+            columns=[
+                Column("Priority", lambda idea: str(idea.priority)),
+                Column("Title", lambda idea: idea.title, max_width=60),
+                Column("Status", lambda idea: idea.status.value),
+                Column("Next Steps", lambda idea: idea.next_steps, max_width=60)
+            ],
+            rows=self.ideas.values(),
+            row_filter=lambda idea: idea.last_updated > week_start,
+            sort_key=lambda idea: (idea.priority, -idea.last_updated.timestamp()),
+            detail=self._idea_detail
+        )
         
         console.log("\n[bold blue]Weekly Research Digest[/bold blue]")
         console.log("\n[bold]Active Experiments[/bold]")
-        console.log(experiments_table)
+        experiments_view.show()
         console.log("\n[bold]Ideas Progress[/bold]")
-        console.log(ideas_table)
+        ideas_view.show()
         
+        if not write_reports:
+            return "Weekly digest shown"
+        self.generate_reports()
+        report_path = self.base_path / 'reports' / 'week' / f"{period_key('week', datetime.now().date())}.md"
+        if report_path.exists():
+            console.log(f"[green]Weekly report written to {report_path}[/green]")
+            return str(report_path)
         return "Weekly digest generated"
 
-    def backup_research_data(self, backup_dir: Optional[Path] = None) -> Path:
+    def generate_reports(self, periods: tuple = PERIODS,
+                         progress: Optional[Callable[[int, int], None]] = None,
+                         cancelled: Optional[threading.Event] = None) -> List[Path]:
+        """
+        Write Markdown and HTML reports per day, week and month under reports/.
+        
+        Only periods whose ideas, experiments, notes, goals or insights changed
+        since the last run are rebuilt. progress and cancelled are passed on to
+        ReportGenerator.generate.
+        """
+        self.flush_daily_summary()
+        written = ReportGenerator(self, self.base_path / 'reports').generate(periods, progress, cancelled)
+        console.log(f"[green]Updated {len(written)} report files[/green]")
+        return written
+
+    def export_data(self, formats: Optional[List[str]] = None,
+                    output_dir: Optional[Path] = None,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    cancelled: Optional[threading.Event] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Export ideas, notes, experiments, insights and goal history as flat tables.
+        
+        Sources unchanged since the previous export into the same directory are
+        left as they are. progress and cancelled are passed on to
+        ProjectExporter.export.
+        """
+        self.flush_daily_summary()
+        exporter = ProjectExporter(self, output_dir or self.base_path / 'exports')
+        summary = exporter.export(formats or ['csv'], progress, cancelled)
+        
+        for name, result in summary.items():
+            state = "unchanged" if not result['written'] else f"wrote {len(result['written'])} file(s)"
+            console.log(f"[green]{name}: {result['rows']} rows, {state}[/green]")
+        return summary
+
+    def backup_research_data(self, backup_dir: Optional[Path] = None,
+                             progress: Optional[Callable[[int, int], None]] = None,
+                             cancelled: Optional[threading.Event] = None) -> Path:
         """Create a backup of all research data
         
         Args:
             backup_dir (Optional[Path]): Custom backup directory path.
                 If None, creates backup in default location.
+            progress: Called with (records written, total records) as the backup proceeds
+            cancelled: When set, the backup stops, removes the files it wrote
+                and raises InterruptedError
         
         Returns:
             Path: Path to the created backup directory
@@ -702,21 +1786,42 @@ class ComprehensiveResearchLog:
         
         backup_dir.mkdir(parents=True, exist_ok=True)
         
-        # Backup ideas
-        with open(backup_dir / 'ideas.json', 'w') as f:
-            json.dump([asdict(idea) for idea in self.ideas.values()], f, indent=2, cls=DateTimeEncoder)
-        
-        # Backup paper notes
-        with open(backup_dir / 'paper_notes.json', 'w') as f:
-            json.dump([asdict(note) for note in self.paper_notes], f, indent=2, cls=DateTimeEncoder)
+        cold_experiments = [key for key in self.cold.keys('experiments') if not self.experiments.contains(key)]
+        cold_ideas = [key for key in self.cold.keys('ideas') if key not in self.ideas]
+        sources = [
+            ('ideas.json', self.iter_ideas(), idea_to_dict, len(self.ideas) + len(cold_ideas)),
+            ('paper_notes.json', list(self.paper_notes), note_to_dict, len(self.paper_notes)),
+            ('daily_summaries.json', list(self.daily_summaries), lambda summary: summary,
+             len(self.daily_summaries)),
+            ('experiments.json', self.iter_experiments(), lambda exp: experiment_to_dict(exp, copy=False),
+             len(self.experiments) + len(cold_experiments)),
+        ]
+        total = sum(count for _, _, _, count in sources)
+        done = 0
         
-        # Backup daily summaries
-        with open(backup_dir / 'daily_summaries.json', 'w') as f:
-            json.dump(self.daily_summaries, f, indent=2, default=str)
+        def records(items, to_dict):
+            nonlocal done
+            for item in items:
+                if cancelled is not None and cancelled.is_set():
+                    raise InterruptedError("backup cancelled")
+                yield to_dict(item)
+                done += 1
+                if progress is not None:
+                    progress(done, total)
         
-        # Backup experiments
-        with open(backup_dir / 'experiments.json', 'w') as f:
-            json.dump([asdict(exp) for exp in self.experiments], f, indent=2, cls=DateTimeEncoder)
+        written = []
+        try:
+            for name, items, to_dict, _ in sources:
+                save_json_stream(records(items, to_dict), backup_dir / name, compress_threshold=COMPRESS_THRESHOLD)
+                written.append(backup_dir / name)
+        except IOError:
+            if cancelled is None or not cancelled.is_set():
+                raise
+            for path in written:
+                path.unlink()
+            if not any(backup_dir.iterdir()):
+                backup_dir.rmdir()
+            raise InterruptedError(f"Backup to {backup_dir} cancelled")
         
         console.log(f"[green]Created backup at {backup_dir}[/green]")
         return backup_dir
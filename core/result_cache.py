@@ -0,0 +1,154 @@
+"""
+Persistent cache of concluded experiment outcomes.
+Outcomes are stored under a canonical hash of the parameters, code version
+and input dataset checksums, so a repeated run can reuse the earlier results
+and metrics instead of being run again.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from utils.file_handlers import save_json, load_json, DateTimeEncoder, COMPRESS_THRESHOLD
+
+# Default bound on the bytes of cached outcomes kept on disk
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Result fields describing one particular run rather than its outcome: the
+# insights recorded during it and the dataset versions it declared belong
+# to that run and are never copied into another
+RUN_FIELDS = ('concluded_at', 'reused_from', 'insights', 'datasets')
+
+# A clean git commit; unknown versions and ones with a "-dirty" suffix do not
+# pin down the code that ran, so their outcomes are never cached
+_COMMIT = re.compile(r'^[0-9a-f]{40}([0-9a-f]{24})?$')
+
+def cacheable_version(code_version: str) -> bool:
+    """Whether a code version identifies the code exactly enough to key outcomes on."""
+    return bool(_COMMIT.match(code_version or ''))
+
+def result_key(parameters: Dict[str, Any], code_version: str, datasets: Iterable[Dict[str, Any]] = ()) -> str:
+    """
+    Canonical hash of what determines an experiment's outcome.
+
+    Parameter order does not matter, and datasets count by checksum only, so
+    re-registering an unchanged file under a new name still matches.
+    """
+    canonical = json.dumps({
+        'parameters': parameters,
+        'code_version': code_version,
+        'datasets': sorted(dataset['checksum'] for dataset in datasets),
+    }, sort_keys=True, separators=(',', ':'), cls=DateTimeEncoder)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+@dataclass
+class ResultCacheStats:
+    """Lookup counts of a result cache, kept across sessions."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ResultCache:
+    """
+    Outcomes in <directory>/entries/<key>.json, with an index in index.json.
+
+    The index records each entry's size and last use. Once the entries take
+    more than max_bytes on disk, the least recently used ones are deleted.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.index_path = self.directory / 'index.json'
+        self.max_bytes = max_bytes
+        saved = load_json(self.index_path) or {}
+        self._entries: Dict[str, Dict[str, Any]] = saved.get('entries', {})
+        self.stats = ResultCacheStats(**saved.get('stats', {}))
+        self._dirty = False
+
+    def exists(self) -> bool:
+        return self.index_path.exists()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry['size'] for entry in self._entries.values())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / 'entries' / f"{key}.json"
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """The cached outcome for a key, without counting a lookup."""
+        if key not in self._entries:
+            return None
+        try:
+            return load_json(self._path(key))
+        except IOError:
+            # A damaged entry is as good as a missing one
+            self._forget(key)
+            return None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The cached outcome for a key, counted as a hit or a miss."""
+        outcome = self.peek(key)
+        if outcome is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            self._entries[key]['last_used'] = datetime.now().isoformat()
+        self._dirty = True
+        return outcome
+
+    def put(self, key: str, outcome: Dict[str, Any]) -> None:
+        """
+        Store an outcome, replacing any earlier one, and evict down to max_bytes.
+        The index is only written by save().
+        """
+        path = self._path(key)
+        save_json(outcome, path, compress_threshold=COMPRESS_THRESHOLD)
+        self._entries[key] = {
+            'experiment_id': outcome.get('experiment_id'),
+            'size': path.stat().st_size,
+            'last_used': datetime.now().isoformat(),
+        }
+        self._dirty = True
+        self._evict(keep=key)
+
+    def _forget(self, key: str) -> None:
+        path = self._path(key)
+        if path.exists():
+            path.unlink()
+        del self._entries[key]
+        self._dirty = True
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        total = self.total_bytes
+        by_age = sorted(self._entries, key=lambda key: self._entries[key]['last_used'])
+        for key in by_age:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries[key]['size']
+            self._forget(key)
+            self.stats.evictions += 1
+
+    def save(self) -> None:
+        """Persist the index and statistics if they changed."""
+        if not self._dirty and self.index_path.exists():
+            return
+        save_json({'entries': self._entries, 'stats': asdict(self.stats)}, self.index_path)
+        self._dirty = False
@@ -0,0 +1,186 @@
+"""
+Versioned schemas for research records.
+Every idea, paper note and experiment record carries the schema version it
+was written with. Older records are upgraded through registered migrations
+as they are read, and outdated project files are rewritten in the background.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from core.watcher import file_signature
+from utils.file_handlers import iter_json_array, save_json_stream, detect_codec
+
+VERSION_FIELD = 'schema_version'
+
+# Records written before versioning was introduced carry no version field
+LEGACY_VERSION = 1
+
+SCHEMA_VERSIONS = {
+    'ideas': 2,
+    'paper_notes': 2,
+    'experiments': 2,
+}
+
+_MIGRATIONS: Dict[Tuple[str, int], Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+def migration(kind: str, from_version: int) -> Callable:
+    """Register a function upgrading a record of kind from from_version to the next version."""
+    def register(function: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable:
+        _MIGRATIONS[(kind, from_version)] = function
+        return function
+    return register
+
+def record_version(record: Dict[str, Any]) -> int:
+    return record.get(VERSION_FIELD, LEGACY_VERSION)
+
+def is_current(kind: str, record: Dict[str, Any]) -> bool:
+    return record_version(record) == SCHEMA_VERSIONS[kind]
+
+def upgrade(kind: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of a stored record migrated to the current schema.
+
+    The version field is removed, so the result maps directly onto the
+    dataclass fields. Records from a newer schema than this code knows
+    raise ValueError rather than being silently misread.
+    """
+    record = dict(record)
+    version = record.pop(VERSION_FIELD, LEGACY_VERSION)
+    target = SCHEMA_VERSIONS[kind]
+    if version > target:
+        raise ValueError(f"{kind} record has schema version {version}; this version reads up to {target}")
+    while version < target:
+        migrate = _MIGRATIONS.get((kind, version))
+        if migrate is None:
+            raise ValueError(f"No migration for {kind} records from schema version {version}")
+        record = migrate(record)
+        version += 1
+    return record
+
+def stamp(kind: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Mark a freshly serialized record with the current schema version."""
+    record[VERSION_FIELD] = SCHEMA_VERSIONS[kind]
+    return record
+
+# Unversioned records were written by several code paths over time and by
+# hand; optional fields may be missing and numbers may be stored as strings.
+
+@migration('ideas', 1)
+def _ideas_from_legacy(record: Dict[str, Any]) -> Dict[str, Any]:
+    record['status'] = str(record.get('status', 'seed')).lower()
+    for field in ('prerequisites', 'paper_notes', 'related_ideas'):
+        record[field] = record.get(field) or []
+    for field in ('potential_impact', 'effort_estimate', 'next_steps'):
+        record[field] = record.get(field) or ""
+    record['priority'] = int(record.get('priority', 3))
+    record.setdefault('last_updated', record['created_date'])
+    return record
+
+@migration('paper_notes', 1)
+def _notes_from_legacy(record: Dict[str, Any]) -> Dict[str, Any]:
+    record['page_number'] = int(record['page_number'])
+    record['brief_summary'] = record.get('brief_summary') or ""
+    return record
+
+@migration('experiments', 1)
+def _experiments_from_legacy(record: Dict[str, Any]) -> Dict[str, Any]:
+    for field in ('results', 'parameters', 'metrics'):
+        record[field] = record.get(field) or {}
+    for field in ('paper_notes', 'related_ideas'):
+        record[field] = record.get(field) or []
+    for field in ('conclusions', 'next_steps'):
+        record[field] = record.get(field) or ""
+    record['code_version'] = record.get('code_version') or "unknown"
+    return record
+
+def needs_rewrite(path: Path, kind: str) -> bool:
+    """Whether a record file holds any record below the current schema version."""
+    return any(not is_current(kind, record) for record in iter_json_array(path))
+
+def rewrite_file(path: Path, kind: str, serialize: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 lock: Optional[threading.Lock] = None,
+                 cancelled: Optional[threading.Event] = None) -> int:
+    """
+    Rewrite a record file with every record at the current schema version.
+
+    Stored records are streamed one at a time through serialize, which must
+    return them in their current form, into a sibling file. That file replaces
+    the original only if the original was not modified meanwhile; lock is held
+    for that final check and replace.
+    Returns the number of records written, or 0 if nothing was replaced.
+    """
+    if not path.exists() or not needs_rewrite(path, kind):
+        return 0
+    signature = file_signature(path)
+    codec = detect_codec(path)
+    staging = path.with_name(path.name + '.migrating')
+
+    def records() -> Iterator[Dict[str, Any]]:
+        for record in iter_json_array(path):
+            if cancelled is not None and cancelled.is_set():
+                raise InterruptedError("schema rewrite cancelled")
+            yield serialize(record)
+
+    try:
+        count = save_json_stream(records(), staging, compress_threshold=0 if codec else None,
+                                 codec=codec or 'gzip')
+        with lock or threading.Lock():
+            if file_signature(path) != signature:
+                return 0
+            os.replace(staging, path)
+        return count
+    except IOError:
+        if cancelled is not None and cancelled.is_set():
+            return 0
+        raise
+    finally:
+        if staging.exists():
+            staging.unlink()
+
+class BackgroundMigration:
+    """
+    Rewrites a project's outdated record files on a daemon thread.
+
+    Reading never waits for it: records are upgraded on load regardless, and
+    this only saves future loads the work. A file written by the project
+    while its rewrite is in flight keeps the project's version.
+    """
+
+    def __init__(self, files: Dict[str, Path], serializers: Dict[str, Callable],
+                 lock: threading.Lock):
+        self.files = files
+        self.serializers = serializers
+        self.lock = lock
+        self.rewritten: Dict[str, int] = {}
+        self.errors: Dict[str, str] = {}
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='schema-migration', daemon=True)
+
+    def start(self) -> 'BackgroundMigration':
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        for kind, path in self.files.items():
+            if self._cancelled.is_set():
+                return
+            try:
+                count = rewrite_file(path, kind, self.serializers[kind], self.lock, self._cancelled)
+            except (IOError, KeyError, TypeError, ValueError) as e:
+                # Unreadable files are left for the integrity check
+                self.errors[kind] = str(e)
+                continue
+            if count:
+                self.rewritten[kind] = count
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def cancel(self, timeout: Optional[float] = None) -> None:
+        """Stop after the record being written and wait for the thread to exit."""
+        self._cancelled.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
@@ -0,0 +1,239 @@
+"""
+Chronological timeline across every kind of project record.
+Each source keeps a lightweight time index of its records; a page of the
+timeline is a lazy k-way merge of the sources read from a cursor, so only
+the records on the page are ever loaded.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from core.models import experiment_id
+
+PAGE_SIZE = 20
+
+# Events are ordered by (timestamp, kind, key, action); a cursor is such a
+# tuple, and (timestamp,) alone positions a cursor at a point in time.
+Cursor = Tuple[Any, ...]
+
+@dataclass(frozen=True, order=True)
+class TimelineEvent:
+    """Something that happened to one record at one time."""
+    timestamp: datetime
+    kind: str
+    key: str
+    action: str
+    title: str = field(compare=False)
+
+    @property
+    def cursor(self) -> Cursor:
+        return (self.timestamp, self.kind, self.key, self.action)
+
+@dataclass
+class TimelinePage:
+    """
+    Events oldest first, with cursors for the neighbouring pages.
+    before and after are None at either end of the timeline.
+    """
+    events: List[TimelineEvent]
+    before: Optional[Cursor]
+    after: Optional[Cursor]
+
+class IndexedSource:
+    """
+    Events of one kind from a sorted list of (timestamp, key, action).
+
+    Titles are looked up by describe(key, action) only for events that are
+    actually read, so the index is all that is held for the others.
+    """
+
+    def __init__(self, kind: str, index: List[Tuple[datetime, str, str]],
+                 describe: Callable[[str, str], str]):
+        self.kind = kind
+        self.index = sorted(index)
+        self.describe = describe
+        # Cursors of the index entries, searched in place of a bisect key
+        # function so this runs before Python 3.10
+        self._cursors = [(timestamp, kind, key, action) for timestamp, key, action in self.index]
+
+    def events(self, cursor: Optional[Cursor], forward: bool) -> Iterator[TimelineEvent]:
+        """Events strictly after the cursor going forward, or strictly before it going back."""
+        if forward:
+            first = 0 if cursor is None else bisect_right(self._cursors, cursor)
+            positions = range(first, len(self.index))
+        else:
+            last = len(self.index) if cursor is None else bisect_left(self._cursors, cursor)
+            positions = range(last - 1, -1, -1)
+        for position in positions:
+            timestamp, key, action = self.index[position]
+            yield TimelineEvent(timestamp, self.kind, key, action, self.describe(key, action))
+
+class InsightSource:
+    """Insight events read straight from the insight store's time index."""
+
+    kind = 'insight'
+
+    def __init__(self, store):
+        self.store = store
+
+    def _event(self, record) -> TimelineEvent:
+        return TimelineEvent(datetime.fromisoformat(record['timestamp']), self.kind, record['id'],
+                             'recorded', record['observation'])
+
+    def events(self, cursor: Optional[Cursor], forward: bool) -> Iterator[TimelineEvent]:
+        if forward:
+            results = self.store.query(start=cursor[0] if cursor else None)
+            for position in range(len(results)):
+                event = self._event(results[position])
+                if cursor is None or event.cursor > cursor:
+                    yield event
+        else:
+            # end is exclusive, and events at the cursor's own time may still precede it
+            results = self.store.query(end=cursor[0] + timedelta(microseconds=1) if cursor else None)
+            for position in range(len(results) - 1, -1, -1):
+                event = self._event(results[position])
+                if cursor is None or event.cursor < cursor:
+                    yield event
+
+class GoalSource:
+    """Daily goals, one event per goal per logged day, loading a day only when it is reached."""
+
+    kind = 'goal'
+
+    def __init__(self, daily_logs):
+        self.daily_logs = daily_logs
+        self.days = daily_logs.days()
+
+    def _day_events(self, day) -> List[TimelineEvent]:
+        summary = self.daily_logs.load(day) or {}
+        goal_status = summary.get('goal_status', {})
+        start = datetime.combine(day, time())
+        return [
+            TimelineEvent(start, self.kind, f"{day:%Y%m%d}#{i:03d}",
+                          goal_status.get(str(i), {}).get('status', 'pending'), str(goal))
+            for i, goal in enumerate(summary.get('goals', []), 1)
+        ]
+
+    def events(self, cursor: Optional[Cursor], forward: bool) -> Iterator[TimelineEvent]:
+        day = cursor[0].date() if cursor else None
+        if forward:
+            days = self.days[bisect_left(self.days, day):] if day else self.days
+        else:
+            days = self.days[:bisect_right(self.days, day)][::-1] if day else self.days[::-1]
+        for day in days:
+            events = self._day_events(day)
+            for event in (events if forward else reversed(events)):
+                if cursor is None or (event.cursor > cursor if forward else event.cursor < cursor):
+                    yield event
+
+class Timeline:
+    """
+    A project's ideas, paper notes, experiments, insights and goals in time order.
+
+    Ideas contribute a created and, if later, an updated event; experiments a
+    started and a concluded event. Archived ideas and experiments are
+    described from the cold storage catalog without being decompressed.
+    """
+
+    def __init__(self, research_log):
+        self.log = research_log
+        self.sources = [
+            self._idea_source(),
+            self._note_source(),
+            self._experiment_source(),
+            InsightSource(research_log.insights),
+            GoalSource(research_log.daily_logs),
+        ]
+
+    def _idea_source(self) -> IndexedSource:
+        log, index = self.log, []
+        for key in log.cold.keys('ideas'):
+            if key not in log.ideas:
+                summary = log.cold.summary('ideas', key)
+                index.append((datetime.fromisoformat(summary['created_date']), key, 'created'))
+                updated = datetime.fromisoformat(summary['last_updated'])
+                if updated.date() != index[-1][0].date():
+                    index.append((updated, key, 'updated'))
+        for idea in log.ideas.values():
+            index.append((idea.created_date, idea.id, 'created'))
+            if idea.last_updated.date() != idea.created_date.date():
+                index.append((idea.last_updated, idea.id, 'updated'))
+
+        def describe(key: str, action: str) -> str:
+            idea = log.ideas.get(key)
+            if idea is not None:
+                return f"{idea.title} [{idea.status.value}]"
+            summary = log.cold.summary('ideas', key)
+            return f"{summary['title']} [{summary['status']}]"
+        return IndexedSource('idea', index, describe)
+
+    def _note_source(self) -> IndexedSource:
+        notes = {f"{note.notebook_id}:{note.page_number}:{note.note_type}": note for note in self.log.paper_notes}
+        index = [(note.date, key, 'noted') for key, note in notes.items()]
+
+        def describe(key: str, action: str) -> str:
+            note = notes[key]
+            return f"{note.notebook_id} p.{note.page_number} ({note.note_type}): {note.brief_summary}"
+        return IndexedSource('paper_note', index, describe)
+
+    def _experiment_source(self) -> IndexedSource:
+        log, index = self.log, []
+        for key in log.cold.keys('experiments'):
+            if not log.experiments.contains(key):
+                summary = log.cold.summary('experiments', key)
+                index.append((datetime.fromisoformat(summary['timestamp']), key, 'started'))
+                index.append((datetime.fromisoformat(summary['concluded_at']), key, 'concluded'))
+        for key in log.experiments.keys():
+            summary = log.experiments.summary(key)
+            index.append((summary['timestamp'], key, 'started'))
+            index.append((summary['concluded_at'], key, 'concluded'))
+        current = log.current_experiment
+        if current is not None:
+            index.append((current.timestamp, experiment_id(current), 'started'))
+
+        def describe(key: str, action: str) -> str:
+            if log.experiments.contains(key):
+                return log.experiments.get(key).hypothesis
+            if current is not None and key == experiment_id(current):
+                return current.hypothesis
+            return log.cold.summary('experiments', key)['hypothesis']
+        return IndexedSource('experiment', index, describe)
+
+    def _merge(self, cursor: Optional[Cursor], forward: bool) -> Iterator[TimelineEvent]:
+        return heapq.merge(*(source.events(cursor, forward) for source in self.sources), reverse=not forward)
+
+    def page(self, start: Optional[datetime] = None, cursor: Optional[Cursor] = None,
+             forward: bool = True, limit: int = PAGE_SIZE) -> TimelinePage:
+        """
+        One page of events next to a cursor.
+
+        Without a cursor, a forward page begins at start (or the first event)
+        and a backward page ends just before start (or with the last event).
+        Pass a page's after cursor forward, or its before cursor backward,
+        to move through the timeline.
+        """
+        if cursor is None and start is not None:
+            cursor = (start,)
+        events = list(islice(self._merge(cursor, forward), limit + 1))
+        more = len(events) > limit
+        events = events[:limit]
+        if not forward:
+            events.reverse()
+        if not events:
+            # Past either end: leave a way back towards the events that do exist
+            behind = cursor is not None and next(self._merge(cursor, not forward), None) is not None
+            return TimelinePage([], cursor if behind and forward else None,
+                                cursor if behind and not forward else None)
+
+        first, last = events[0].cursor, events[-1].cursor
+        if forward:
+            before = first if next(self._merge(first, False), None) is not None else None
+            after = last if more else None
+        else:
+            before = first if more else None
+            after = last if next(self._merge(last, True), None) is not None else None
+        return TimelinePage(events, before, after)
@@ -0,0 +1,132 @@
+"""
+Write-ahead log for research state mutations.
+Each mutation is appended as a checksummed line before it touches any other
+file; periodic checkpoints fold the log into the project's JSON files.
+"""
+
+import json
+import os
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.file_handlers import DateTimeEncoder, save_json, load_json
+
+# Number of logged mutations after which the log is folded into a checkpoint
+SNAPSHOT_INTERVAL = 200
+
+def encode_line(record: Dict[str, Any]) -> bytes:
+    """Serialize a record as one "<crc32> <json>" line."""
+    payload = json.dumps(record, cls=DateTimeEncoder).encode('utf-8')
+    return f"{zlib.crc32(payload):08x} ".encode('ascii') + payload + b"\n"
+
+def decode_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse a line written by encode_line, or None if it is torn or corrupt."""
+    if not line.endswith(b"\n"):
+        return None
+    checksum, _, payload = line.rstrip(b"\n").partition(b" ")
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload.decode('utf-8'))
+    except ValueError:
+        return None
+
+class MutationLog:
+    """
+    Append-only log of mutations with a checkpoint watermark.
+
+    Every line is "<crc32> <json>" where the JSON holds a sequence number,
+    operation name and payload. Recovery stops at the first line whose
+    checksum does not match, which is where a crash interrupted a write, and
+    truncates the torn tail.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.log_path = self.directory / 'mutations.log'
+        self.checkpoint_path = self.directory / 'checkpoint.json'
+        self.seq = 0
+        self.checkpoint_seq = 0
+        self.tail_length = 0
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """
+        Read back mutations logged after the last checkpoint, in order.
+
+        Also restores the sequence counter so new appends continue from it.
+        """
+        checkpoint = load_json(self.checkpoint_path) or {}
+        self.checkpoint_seq = self.seq = checkpoint.get('seq', 0)
+        if not self.log_path.exists():
+            return []
+
+        records, valid_length = self._scan(self.checkpoint_seq)
+        for record in records:
+            self.seq = max(self.seq, record['seq'])
+
+        if valid_length < self.log_path.stat().st_size:
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(valid_length)
+
+        self.tail_length = len(records)
+        return records
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """
+        Mutations logged after the last checkpoint, without touching any file.
+
+        Unlike recover() this neither truncates a torn tail nor updates the
+        sequence counter, so it is safe to call on a project that another
+        process has open.
+        """
+        checkpoint = load_json(self.checkpoint_path) or {}
+        if not self.log_path.exists():
+            return []
+        return self._scan(checkpoint.get('seq', 0))[0]
+
+    def torn_bytes(self) -> int:
+        """Bytes after the last intact record, which recover() would truncate."""
+        if not self.log_path.exists():
+            return 0
+        return self.log_path.stat().st_size - self._scan(0)[1]
+
+    def _scan(self, after_seq: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Valid records newer than after_seq and the length of the valid prefix."""
+        records = []
+        valid_length = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                record = decode_line(line)
+                if record is None:
+                    break
+                valid_length += len(line)
+                if record['seq'] > after_seq:
+                    records.append(record)
+        return records, valid_length
+
+    def append(self, op: str, data: Any) -> int:
+        """Durably append a mutation and return its sequence number."""
+        self.seq += 1
+        line = encode_line({'seq': self.seq, 'op': op, 'time': datetime.now().isoformat(), 'data': data})
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.tail_length += 1
+        return self.seq
+
+    def mark_checkpoint(self) -> None:
+        """
+        Record that all logged mutations are reflected in the project files.
+
+        The watermark is written before the log is truncated, so a crash in
+        between only causes already-applied records to be skipped on replay.
+        """
+        save_json({'seq': self.seq, 'time': datetime.now().isoformat()}, self.checkpoint_path)
+        with open(self.log_path, 'wb'):
+            pass
+        self.checkpoint_seq = self.seq
+        self.tail_length = 0
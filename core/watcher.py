@@ -0,0 +1,174 @@
+"""
+Change detection and merging for project files edited outside the session.
+Uses Linux inotify through ctypes when available and falls back to polling
+file metadata everywhere else.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# inotify event bits (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')
+
+Signature = Optional[Tuple[int, int, int]]
+
+def file_signature(path: Path) -> Signature:
+    """(inode, mtime, size) of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+class _InotifyBackend:
+    """
+    Watches the parent directories of registered files.
+
+    Files are written by atomic replacement, which gives them a new inode, so
+    watching the directory is the only way to keep seeing changes.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        self._watched: Set[Path] = set()
+
+    def add(self, path: Path) -> None:
+        directory = path.parent
+        if directory in self._watched:
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+        self._dirs[wd] = directory
+        self._watched.add(directory)
+
+    def candidates(self, files: Set[Path]) -> Set[Path]:
+        """Registered files named in events since the last call."""
+        touched: Set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return set(files)
+                if wd in self._dirs and name:
+                    touched.add(self._dirs[wd] / os.fsdecode(name))
+        return touched & files
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class _PollingBackend:
+    """Reports every registered file; FileWatcher then compares signatures."""
+
+    def add(self, path: Path) -> None:
+        pass
+
+    def candidates(self, files: Set[Path]) -> Set[Path]:
+        return set(files)
+
+    def close(self) -> None:
+        pass
+
+class FileWatcher:
+    """
+    Reports registered files whose content changed since they were last seen.
+
+    The session calls acknowledge() after each of its own writes, so only
+    changes made by other processes are reported. The backend only narrows
+    down which files to stat; a file counts as changed when its signature
+    differs from the acknowledged one.
+    """
+
+    def __init__(self, use_inotify: bool = True):
+        self.backend = _PollingBackend()
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self.backend = _InotifyBackend()
+            except (OSError, AttributeError):
+                pass
+        self._known: Dict[Path, Signature] = {}
+
+    @property
+    def mode(self) -> str:
+        return 'inotify' if isinstance(self.backend, _InotifyBackend) else 'polling'
+
+    def watch(self, path: Path) -> None:
+        """Start watching a file, treating its current content as already seen."""
+        path = Path(path)
+        if path in self._known:
+            return
+        try:
+            self.backend.add(path)
+        except OSError:
+            self.backend.close()
+            self.backend = _PollingBackend()
+        self._known[path] = file_signature(path)
+
+    def acknowledge(self, path: Path) -> None:
+        """Record the session's own write so it is not reported as external."""
+        path = Path(path)
+        if path in self._known:
+            self._known[path] = file_signature(path)
+
+    def changes(self) -> Set[Path]:
+        """Watched files modified, created or deleted by someone else since last checked."""
+        changed = set()
+        for path in self.backend.candidates(set(self._known)):
+            signature = file_signature(path)
+            if signature != self._known[path]:
+                self._known[path] = signature
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        self.backend.close()
+
+def merge_external(base: Dict[str, Any], theirs: Dict[str, Any],
+                   ours: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Three-way merge of keyed records after an external edit.
+
+    base is what the session last read or wrote, theirs is the file's new
+    content and ours the in-memory state. Returns the external changes that
+    can be applied (None meaning a deletion) and the keys changed on both
+    sides in different ways.
+    """
+    apply: Dict[str, Any] = {}
+    conflicts: List[str] = []
+    for key in set(base) | set(theirs):
+        before, after = base.get(key), theirs.get(key)
+        if before == after:
+            continue
+        current = ours.get(key)
+        if current == before or current == after:
+            apply[key] = after
+        else:
+            conflicts.append(key)
+    return apply, sorted(conflicts)
@@ -1,9 +1,17 @@
 from pathlib import Path
+from datetime import datetime
+from typing import Optional
 from core.project_manager import ProjectManager
-from core.research_log import ComprehensiveResearchLog
-from ui.menus import display_project_selection, display_main_menu
+from core.research_log import ComprehensiveResearchLog, COLD_AFTER_DAYS
+from core.models import IdeaStatus
+from core.export import available_formats
+from core.cross_project import CrossProjectSearch, KINDS
+from core.integrity import ProjectChecker, repair
+from ui.menus import (display_project_selection, display_main_menu, display_search_results,
+                      display_project_totals, display_integrity_issues, display_timeline)
 from ui.input_handlers import get_cancellable_input, get_cancellable_multi_input, get_cancellable_number, get_cancellable_parameters
 from ui.console import console
+from ui.async_app import run_project, JobSpec
 
 
 def get_application_root() -> Path:
@@ -28,6 +36,237 @@ def get_application_root() -> Path:
     
     return projects_dir
 
+# Menu commands that only read the project, which can run while background
+# jobs are working: the digest, stale ideas, table of contents, insights,
+# metrics and timeline views, and the commands that start jobs
+READ_ONLY_COMMANDS = ("7", "8", "10", "11", "13", "14", "18", "19", "20")
+
+def run_menu_command(research_log: ComprehensiveResearchLog, choice: str,
+                     shared: bool = False) -> Optional[JobSpec]:
+    """
+    Run one main menu command.
+
+    Long operations are not run here but returned as a background job for
+    the project app to start. A shared command runs alongside background
+    jobs, so external changes are picked up only by the next exclusive one.
+    """
+    if not shared:
+        research_log.sync_external_changes()
+    job = _menu_command(research_log, choice)
+    if not shared:
+        research_log.flush_daily_summary()
+    return job
+
+def _menu_command(research_log: ComprehensiveResearchLog, choice: str) -> Optional[JobSpec]:
+    if choice == "1":
+        goals = get_cancellable_multi_input("Enter daily goals", "goal")
+        if goals is None:
+            console.log("[yellow]Operation cancelled.[/yellow]")
+            return None
+        research_log.start_day(goals)
+
+    elif choice == "2":
+        research_log.review_daily_goals()
+
+    elif choice == "3":
+        title = get_cancellable_input("Enter idea title")
+        if title is None:
+            return None
+        
+        description = get_cancellable_input("Enter description")
+        if description is None:
+            return None
+        
+        research_log.add_idea(title, description)
+
+    elif choice == "4":
+        observation = get_cancellable_input("Enter observation")
+        if observation is None:
+            return None
+        
+        implications = get_cancellable_input("Enter implications")
+        if implications is None:
+            return None
+        
+        research_log.add_insight(observation, implications)
+
+    elif choice == "5":
+        notebook_id = get_cancellable_input("Enter notebook ID")
+        if notebook_id is None:
+            return None
+        
+        page_number = get_cancellable_number("Enter page number")
+        if page_number is None:
+            return None
+        
+        note_type = get_cancellable_input("Enter note type (H/E/R/I/Q)")
+        if note_type is None:
+            return None
+        if note_type not in ['H', 'E', 'R', 'I', 'Q']:
+            console.log("[red]Invalid note type. Must be H, E, R, I, or Q.[/red]")
+            return None
+        
+        summary = get_cancellable_input("Enter summary")
+        if summary is None:
+            return None
+        
+        research_log.add_paper_note(notebook_id, page_number, note_type, summary)
+
+    elif choice == "6":
+        hypothesis = get_cancellable_input("Enter experiment hypothesis")
+        if hypothesis is None:
+            return None
+        
+        methodology = get_cancellable_input("Enter methodology")
+        if methodology is None:
+            return None
+        
+        parameters = get_cancellable_parameters()
+        if parameters is None:
+            return None
+        
+        related_idea = get_cancellable_input("Related idea ID (optional)", allow_empty=True)
+        if related_idea is None:
+            return None
+
+        research_log.start_experiment(
+            hypothesis=hypothesis,
+            methodology=methodology,
+            parameters=parameters,
+            related_idea_id=related_idea if related_idea else None
+        )
+        cached = research_log.cached_result()
+        if cached is not None and console.confirm(f"Reuse the results of {cached['experiment_id']} and conclude now?"):
+            research_log.reuse_cached_result()
+            research_log.conclude_experiment(f"Results reused from {cached['experiment_id']}: {cached['conclusions']}",
+                                             cached['next_steps'])
+
+    elif choice == "7":
+        research_log.generate_weekly_digest(write_reports=False)
+        return ("Weekly reports", research_log.generate_reports, {})
+
+    elif choice == "8":
+        days = get_cancellable_number("Enter days threshold (default 10)", allow_empty=True)
+        if days is None:
+            days = 10
+        research_log.get_stale_ideas(days)
+
+    elif choice == "9":
+        if not research_log.current_experiment:
+            console.log("[red]No active experiment to conclude[/red]")
+            return None
+        
+        conclusions = get_cancellable_input("Enter conclusions")
+        if conclusions is None:
+            return None
+        
+        next_steps = get_cancellable_input("Enter next steps")
+        if next_steps is None:
+            return None
+        
+        research_log.conclude_experiment(conclusions, next_steps)
+
+    elif choice == "10":
+        backup_path = get_cancellable_input("Enter backup path (optional)", allow_empty=True)
+        if backup_path is None:
+            return None
+
+        backup_dir = Path(backup_path) if backup_path else None
+        return ("Backup", research_log.backup_research_data, {'backup_dir': backup_dir})
+
+    elif choice == "11":
+        notebook_id = get_cancellable_input("Enter notebook ID")
+        if notebook_id is None:
+            return None
+
+        research_log.generate_notebook_toc(notebook_id)
+
+    elif choice == "12":
+        research_log.compact_daily_logs()
+
+    elif choice == "13":
+        formats = available_formats()
+        file_format = get_cancellable_input(f"Export format ({'/'.join(formats)}, default csv)",
+                                            allow_empty=True)
+        if file_format is None:
+            return None
+        if file_format and file_format not in formats:
+            console.log(f"[red]Format must be one of: {', '.join(formats)}[/red]")
+            return None
+
+        return (f"Export ({file_format or 'csv'})", research_log.export_data, {'formats': [file_format or 'csv']})
+
+    elif choice == "14":
+        return ("Reports", research_log.generate_reports, {})
+
+    elif choice == "15":
+        research_log.show_goal_analytics()
+
+    elif choice == "16":
+        idea_id = get_cancellable_input("Enter idea ID")
+        if idea_id is None:
+            return None
+        statuses = [status.value for status in IdeaStatus]
+        status = get_cancellable_input(f"New status ({'/'.join(statuses)})")
+        if status is None:
+            return None
+        if status not in statuses:
+            console.log("[red]Unknown status.[/red]")
+            return None
+        research_log.update_idea_status(idea_id, IdeaStatus(status))
+
+    elif choice == "17":
+        days = get_cancellable_input(
+            f"Archive work finished more than how many days ago (default {COLD_AFTER_DAYS})",
+            allow_empty=True
+        )
+        if days is None:
+            return None
+        if days and not days.isdigit():
+            console.log("[red]Please enter a valid number.[/red]")
+            return None
+        research_log.apply_tiering(int(days) if days else COLD_AFTER_DAYS)
+
+    elif choice == "18":
+        linked_id = get_cancellable_input("Experiment or idea ID (empty for all)", allow_empty=True)
+        if linked_id is None:
+            return None
+        days = get_cancellable_input("Only the last how many days (empty for all)", allow_empty=True)
+        if days is None:
+            return None
+        if days and not days.isdigit():
+            console.log("[red]Please enter a valid number.[/red]")
+            return None
+        research_log.show_insights(linked_id, int(days) if days else None)
+
+    elif choice == "19":
+        key = get_cancellable_input("Experiment ID (empty for the current one)", allow_empty=True)
+        if key is None:
+            return None
+        names = research_log.metric_names(key or None)
+        if not names:
+            console.log("[yellow]No metric series logged for this experiment.[/yellow]")
+            return None
+        name = get_cancellable_input(f"Metric ({', '.join(names)})")
+        if name is None:
+            return None
+        research_log.show_metric(name, key or None)
+
+    elif choice == "20":
+        start = get_cancellable_input("Start date (YYYY-MM-DD, empty for the latest events)", allow_empty=True)
+        if start is None:
+            return None
+        try:
+            start_time = datetime.strptime(start, "%Y-%m-%d") if start else None
+        except ValueError:
+            console.log("[red]Please enter a date as YYYY-MM-DD.[/red]")
+            return None
+        display_timeline(research_log.timeline(), start_time)
+
+    else:
+        console.log("[red]Invalid choice[/red]")
+    return None
+
 def main():
     """Main entry point for the research logger application."""
     console.log("[bold blue]Quantitative Research Logger[/bold blue]")
@@ -41,6 +280,9 @@ def main():
         
         console.log("\nOptions:")
         console.log("n/new - Create new project")
+        console.log("s/search - Search all projects")
+        console.log("t/totals - Summarize all projects")
+        console.log("f/fsck - Check project integrity")
         console.log("q/quit - Exit")
         if projects:
             console.log("Or enter a number to open an existing project")
@@ -50,6 +292,52 @@ def main():
             console.log("[green]Goodbye![/green]")
             return
             
+        if choice in ['s', 'search']:
+            query = get_cancellable_input("Enter search terms")
+            if query is None:
+                continue
+            kind = get_cancellable_input(f"Limit to one kind ({', '.join(KINDS)}) or empty for all", allow_empty=True)
+            if kind and kind not in KINDS:
+                console.log("[red]Unknown record kind.[/red]")
+                continue
+            try:
+                search = CrossProjectSearch(base_dir)
+                results = search.search(query, [kind] if kind else None)
+                display_search_results(results, query, search.skipped)
+            except Exception as e:
+                console.log(f"[red]Error: {str(e)}[/red]")
+            continue
+
+        if choice in ['t', 'totals']:
+            try:
+                search = CrossProjectSearch(base_dir)
+                display_project_totals(search.totals(), search.skipped)
+            except Exception as e:
+                console.log(f"[red]Error: {str(e)}[/red]")
+            continue
+
+        if choice in ['f', 'fsck']:
+            selection = get_cancellable_number("Project number to check")
+            if selection is None:
+                continue
+            if selection not in projects:
+                console.log("[red]Invalid project number.[/red]")
+                continue
+            project = projects[selection]
+            try:
+                issues = ProjectChecker(project['path']).check()
+                display_integrity_issues(issues, project['name'])
+                if any(issue.repair for issue in issues) and console.confirm("Apply the available repairs?"):
+                    research_log = ComprehensiveResearchLog(project['name'], project['path'])
+                    try:
+                        done = repair(research_log, issues)
+                    finally:
+                        research_log.close()
+                    console.log(f"[green]Repairs applied: {', '.join(f'{action}={count}' for action, count in sorted(done.items()))}[/green]")
+            except Exception as e:
+                console.log(f"[red]Error: {str(e)}[/red]")
+            continue
+
         if choice in ['n', 'new']:
             result = project_manager.create_new_project()
             if result is None:
@@ -75,132 +363,7 @@ def main():
                 console.log("[red]Invalid input. Please enter a number, 'n' for new project, or 'q' to quit.[/red]")
                 continue
     
-        while True:
-            display_main_menu()
-
-            choice = get_cancellable_input("\nEnter your choice (1-10)")
-            if choice is None:
-                console.log("[green]Exiting research logger[/green]")
-                break
-
-            try:
-                if choice == "1":
-                    goals = get_cancellable_multi_input("Enter daily goals", "goal")
-                    if goals is None:
-                        console.log("[yellow]Operation cancelled.[/yellow]")
-                        continue
-                    research_log.start_day(goals)
-
-                elif choice == "2":
-                    research_log.review_daily_goals()
-
-                elif choice == "3":
-                    title = get_cancellable_input("Enter idea title")
-                    if title is None:
-                        continue
-                    
-                    description = get_cancellable_input("Enter description")
-                    if description is None:
-                        continue
-                    
-                    research_log.add_idea(title, description)
-
-                elif choice == "4":
-                    observation = get_cancellable_input("Enter observation")
-                    if observation is None:
-                        continue
-                    
-                    implications = get_cancellable_input("Enter implications")
-                    if implications is None:
-                        continue
-                    
-                    research_log.add_insight(observation, implications)
-
-                elif choice == "5":
-                    notebook_id = get_cancellable_input("Enter notebook ID")
-                    if notebook_id is None:
-                        continue
-                    
-                    page_number = get_cancellable_number("Enter page number")
-                    if page_number is None:
-                        continue
-                    
-                    note_type = get_cancellable_input("Enter note type (H/E/R/I/Q)")
-                    if note_type is None:
-                        continue
-                    if note_type not in ['H', 'E', 'R', 'I', 'Q']:
-                        console.log("[red]Invalid note type. Must be H, E, R, I, or Q.[/red]")
-                        continue
-                    
-                    summary = get_cancellable_input("Enter summary")
-                    if summary is None:
-                        continue
-                    
-                    research_log.add_paper_note(notebook_id, page_number, note_type, summary)
-
-                elif choice == "6":
-                    hypothesis = get_cancellable_input("Enter experiment hypothesis")
-                    if hypothesis is None:
-                        continue
-                    
-                    methodology = get_cancellable_input("Enter methodology")
-                    if methodology is None:
-                        continue
-                    
-                    parameters = get_cancellable_parameters()
-                    if parameters is None:
-                        continue
-                    
-                    related_idea = get_cancellable_input("Related idea ID (optional)", allow_empty=True)
-                    if related_idea is None:
-                        continue
-
-                    research_log.start_experiment(
-                        hypothesis=hypothesis,
-                        methodology=methodology,
-                        parameters=parameters,
-                        related_idea_id=related_idea if related_idea else None
-                    )
-
-                elif choice == "7":
-                    research_log.generate_weekly_digest()
-
-                elif choice == "8":
-                    days = get_cancellable_number("Enter days threshold (default 10)", allow_empty=True)
-                    if days is None:
-                        days = 10
-                    research_log.get_stale_ideas(days)
-
-                elif choice == "9":
-                    if not research_log.current_experiment:
-                        console.log("[red]No active experiment to conclude[/red]")
-                        continue
-                    
-                    conclusions = get_cancellable_input("Enter conclusions")
-                    if conclusions is None:
-                        continue
-                    
-                    next_steps = get_cancellable_input("Enter next steps")
-                    if next_steps is None:
-                        continue
-                    
-                    research_log.conclude_experiment(conclusions, next_steps)
-
-                elif choice == "10":
-                    backup_path = get_cancellable_input("Enter backup path (optional)", allow_empty=True)
-                    if backup_path is None:
-                        continue
-
-                    backup_dir = Path(backup_path) if backup_path else None
-                    research_log.backup_research_data(backup_dir)
-
-                else:
-                    console.log("[red]Invalid choice[/red]")
-
-            except Exception as e:
-                console.log(f"[red]Error: {str(e)}[/red]")
-                console.log("[yellow]Returning to main menu.[/yellow]")
-
+        run_project(research_log, run_menu_command, "\nEnter your choice (1-20, j, x)", READ_ONLY_COMMANDS)
 
 if __name__ == "__main__":
     main()
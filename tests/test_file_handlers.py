@@ -0,0 +1,38 @@
+import gzip
+import json
+
+import pytest
+
+from utils.file_handlers import iter_json_array
+
+VALUES = [1.5, -2.5e-3, 1, 1e10, 0, True, False, None, "a, b]", {"x": [1, 2.25]}, [3, -4.0E+2], 12345678901234567890]
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64 * 1024])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_iter_json_array_across_chunk_boundaries(tmp_path, chunk_size, indent):
+    path = tmp_path / 'values.json'
+    path.write_text(json.dumps(VALUES, indent=indent))
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == VALUES
+
+@pytest.mark.parametrize('text', ['[1.5]', '[-2.5e-3]', '[1, 1e10]', '[ 7 ]'])
+@pytest.mark.parametrize('chunk_size', [1, 2, 3])
+def test_iter_json_array_bare_numbers(tmp_path, text, chunk_size):
+    path = tmp_path / 'numbers.json'
+    path.write_text(text)
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == json.loads(text)
+
+def test_iter_json_array_compressed(tmp_path):
+    path = tmp_path / 'values.json'
+    with gzip.open(path, 'wt') as f:
+        json.dump(VALUES, f)
+    assert list(iter_json_array(path, chunk_size=3)) == VALUES
+
+def test_iter_json_array_missing_file(tmp_path):
+    assert list(iter_json_array(tmp_path / 'missing.json')) == []
+
+@pytest.mark.parametrize('text', ['[1.5', '[1 2]', '{"a": 1}', '[1.]'])
+def test_iter_json_array_rejects_invalid(tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text)
+    with pytest.raises(IOError):
+        list(iter_json_array(path, chunk_size=2))
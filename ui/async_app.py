@@ -0,0 +1,283 @@
+"""
+Asynchronous front end for an open project.
+Menu commands run off the event loop, and long operations run as background
+jobs with progress bars while the prompt keeps taking commands; read-only
+commands can run while jobs are working.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+from rich.markup import escape
+from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn
+
+from ui.console import console
+from utils.locks import ReadWriteLock
+from ui.input_handlers import get_cancellable_input, get_cancellable_number
+from ui.menus import display_main_menu
+
+# A command that should run in the background is returned by the menu handler
+# as (label, function, keyword arguments). The function must also accept the
+# progress and cancelled keyword arguments and raise InterruptedError when
+# cancelled is set. Jobs only read the project.
+JobSpec = Tuple[str, Callable[..., Any], Dict[str, Any]]
+
+# Seconds between redraws of the live job view
+REFRESH_INTERVAL = 0.2
+
+async def run_blocking(function: Callable[..., Any], *args) -> Any:
+    """
+    Await a blocking call made on a fresh daemon thread.
+
+    Used for prompts and menu commands, which can sit in input() for as long
+    as the user likes. The default executor's threads are joined when the
+    interpreter exits, so a reader left there would hold up Ctrl-C until
+    Enter was pressed; a daemon thread is simply abandoned.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result: Any, error: Optional[BaseException]) -> None:
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def worker() -> None:
+        try:
+            result, error = function(*args), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            # The loop closed while this thread was still blocked
+            pass
+
+    threading.Thread(target=worker, daemon=True).start()
+    return await future
+
+@dataclass
+class Job:
+    """A background operation and the progress it last reported."""
+    id: int
+    name: str
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    completed: int = 0
+    total: Optional[int] = None
+    started: float = field(default_factory=time.monotonic)
+    task: Optional[asyncio.Task] = None
+
+    def report(self, completed: int, total: int) -> None:
+        # Called from the worker thread; the values are read when the status is drawn
+        self.completed, self.total = completed, total
+
+class JobRunner:
+    """
+    Runs blocking operations on worker threads until they finish or are cancelled.
+    Each job holds lock for reading while it runs.
+    """
+
+    def __init__(self, lock: ReadWriteLock):
+        self.jobs: Dict[int, Job] = {}
+        self.lock = lock
+        self._ids = itertools.count(1)
+
+    def submit(self, name: str, function: Callable[..., Any], kwargs: Optional[Dict[str, Any]] = None) -> Job:
+        job = Job(next(self._ids), name)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, function, kwargs or {}))
+        console.log(f"[green]Started job {job.id}: {escape(name)}[/green]")
+        return job
+
+    async def _run(self, job: Job, function: Callable[..., Any], kwargs: Dict[str, Any]) -> None:
+        def locked() -> Any:
+            with self.lock.read():
+                return function(progress=job.report, cancelled=job.cancelled, **kwargs)
+
+        try:
+            await asyncio.to_thread(locked)
+        except InterruptedError as e:
+            console.log(f"[yellow]Job {job.id} ({escape(job.name)}) cancelled: {escape(str(e))}[/yellow]")
+        except Exception as e:
+            console.log(f"[red]Error: Job {job.id} ({escape(job.name)}) failed: {escape(str(e))}[/red]")
+        else:
+            console.log(f"[green]Job {job.id} ({escape(job.name)}) finished in "
+                        f"{time.monotonic() - job.started:.1f}s[/green]")
+        finally:
+            del self.jobs[job.id]
+
+    def cancel(self, job_id: int) -> bool:
+        """Ask a job to stop; it exits at its next cancellation check."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancelled.set()
+        return True
+
+    async def wait(self) -> None:
+        await asyncio.gather(*(job.task for job in list(self.jobs.values())))
+
+    def progress(self, live: bool = False) -> Progress:
+        """
+        The running jobs as progress bars.
+
+        A snapshot unless live is set; a live display is kept current by
+        calling update_progress.
+        """
+        bars = Progress(
+            TextColumn("[bold]{task.fields[job]}[/bold] {task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TextColumn("{task.fields[state]}"),
+            console=console.console,
+            auto_refresh=live,
+        )
+        self.update_progress(bars, {})
+        return bars
+
+    def update_progress(self, bars: Progress, tasks: Dict[int, Any]) -> None:
+        """Add bars for new jobs to tasks (job id -> task id) and refresh all of them."""
+        now = time.monotonic()
+        for job in list(self.jobs.values()):
+            state = "cancelling" if job.cancelled.is_set() else f"{now - job.started:.0f}s"
+            if job.id not in tasks:
+                tasks[job.id] = bars.add_task(escape(job.name), job=f"#{job.id}", state=state)
+            bars.update(tasks[job.id], total=job.total or None, completed=job.completed, state=state)
+        for job_id, task_id in tasks.items():
+            if job_id not in self.jobs and not bars.tasks[task_id].finished:
+                total = bars.tasks[task_id].total or 1
+                bars.update(task_id, total=total, completed=total, state="ended")
+
+class ProjectApp:
+    """
+    Main menu loop for an open project.
+
+    The prompt and each command run on a worker thread, so background jobs
+    keep running while the user types. Jobs and the commands listed in
+    read_only hold the project's lock for reading and run side by side; any
+    other command needs it for writing, so it waits until the jobs are done.
+    The handler is called with shared=True when it runs alongside jobs.
+    """
+
+    def __init__(self, research_log, handler: Callable[..., Optional[JobSpec]], prompt: str,
+                 read_only: Collection[str] = ()):
+        self.research_log = research_log
+        self.handler = handler
+        self.prompt = prompt
+        self.read_only = read_only
+        self.jobs = JobRunner(research_log.lock)
+
+    def status_line(self) -> str:
+        pending = self.research_log.pending_writes()
+        running = len(self.jobs.jobs)
+        jobs = f"{running} job{'s' if running != 1 else ''} running" if running else "no jobs running"
+        return f"[dim]Pending writes: {pending} | {jobs}[/dim]"
+
+    def show_jobs(self) -> None:
+        if not self.jobs.jobs:
+            console.log("[yellow]No background jobs running.[/yellow]")
+            return
+        console.log(self.jobs.progress())
+
+    async def watch_jobs(self) -> None:
+        """Show live progress bars for the jobs until the user presses Enter."""
+        if not self.jobs.jobs:
+            console.log("[yellow]No background jobs running.[/yellow]")
+            return
+        console.log("[dim]Press Enter to return to the menu.[/dim]")
+        entered = asyncio.ensure_future(run_blocking(input))
+        tasks: Dict[int, Any] = {}
+        with self.jobs.progress(live=True) as bars:
+            while not entered.done():
+                self.jobs.update_progress(bars, tasks)
+                await asyncio.wait([entered], timeout=REFRESH_INTERVAL)
+        await entered
+
+    async def cancel_job(self) -> None:
+        if not self.jobs.jobs:
+            console.log("[yellow]No background jobs running.[/yellow]")
+            return
+        self.show_jobs()
+        job_id = await run_blocking(get_cancellable_number, "Job number to cancel")
+        if job_id is None:
+            return
+        if self.jobs.cancel(job_id):
+            console.log(f"[yellow]Cancelling job {job_id}...[/yellow]")
+        else:
+            console.log("[red]No such job.[/red]")
+
+    async def run(self) -> None:
+        try:
+            await self._loop()
+        except asyncio.CancelledError:
+            # Ctrl-C: stop the jobs without asking, but still close the project cleanly
+            await self.shutdown(ask=False)
+            raise
+        await self.shutdown()
+
+    async def _loop(self) -> None:
+        while True:
+            display_main_menu()
+            if self.jobs.jobs:
+                self.show_jobs()
+            console.log(self.status_line())
+
+            choice = await run_blocking(get_cancellable_input, self.prompt)
+            if choice is None:
+                break
+            if choice in ['j', 'jobs']:
+                await self.watch_jobs()
+                continue
+            if choice in ['x', 'kill']:
+                await self.cancel_job()
+                continue
+
+            lock = self.research_log.lock
+            if not self.jobs.jobs:
+                # Only a brief write, like the schema migration's, can hold it now
+                await run_blocking(lock.acquire)
+                shared, release = False, lock.release
+            elif choice in self.read_only:
+                if not lock.acquire_read(blocking=False):
+                    console.log("[yellow]The project is being written to; try again shortly.[/yellow]")
+                    continue
+                shared, release = True, lock.release_read
+            else:
+                console.log("[yellow]Background jobs are reading the project; until they finish only "
+                            f"commands {', '.join(sorted(self.read_only, key=int))} are available. "
+                            "Watch them (j) or cancel them (x).[/yellow]")
+                continue
+            try:
+                job = await run_blocking(self.handler, self.research_log, choice, shared)
+            except Exception as e:
+                console.log(f"[red]Error: {str(e)}[/red]")
+                console.log("[yellow]Returning to main menu.[/yellow]")
+                continue
+            finally:
+                release()
+            if job is not None:
+                self.jobs.submit(*job)
+
+    async def shutdown(self, ask: bool = True) -> None:
+        """Settle running jobs, then close the project."""
+        if self.jobs.jobs:
+            self.show_jobs()
+            if not ask or await run_blocking(console.confirm, "Cancel the running jobs instead of waiting for them?"):
+                for job_id in list(self.jobs.jobs):
+                    self.jobs.cancel(job_id)
+            console.log("[yellow]Waiting for background jobs...[/yellow]")
+            await self.jobs.wait()
+        self.research_log.close()
+        console.log("[green]Exiting research logger[/green]")
+
+def run_project(research_log, handler: Callable[..., Optional[JobSpec]], prompt: str,
+                read_only: Collection[str] = ()) -> None:
+    """Run the main menu for an open project until the user leaves it."""
+    asyncio.run(ProjectApp(research_log, handler, prompt, read_only).run())
@@ -1,8 +1,12 @@
+import sys
+from datetime import datetime
+from rich.markup import escape
 from rich.table import Table
 from core.project_manager import ProjectManager
 from ui.input_handlers import get_cancellable_input
 from ui.console import console
-from typing import Dict
+from ui.tables import PaginatedTable, Column
+from typing import Any, Dict, List, Optional
 
 def display_project_selection(projects: Dict[int, Dict]) -> None:
     """Display available projects in a formatted table."""
@@ -23,6 +27,63 @@ def display_project_selection(projects: Dict[int, Dict]) -> None:
     else:
         console.log("[yellow]No existing projects found.[/yellow]")
 
+def _display_skipped_projects(skipped: Optional[List[Dict[str, str]]]) -> None:
+    """List projects that a cross-project query could not read."""
+    for entry in skipped or []:
+        console.log(f"[yellow]Skipped project {escape(entry['project'])}: {escape(entry['error'])}[/yellow]")
+
+def display_search_results(results: List[Dict[str, Any]], query: str,
+                           skipped: Optional[List[Dict[str, str]]] = None) -> None:
+    """Display cross-project search matches, newest first, and any skipped projects."""
+    _display_skipped_projects(skipped)
+    PaginatedTable(
+        [
+            Column("Project", lambda doc: escape(doc['project'])),
+            Column("Kind", lambda doc: doc['kind']),
+            Column("Date", lambda doc: doc['date'][:10]),
+            Column("Title", lambda doc: escape(doc['title']), max_width=60),
+            Column("Status", lambda doc: doc['status']),
+        ],
+        results,
+        detail=lambda doc: f"[bold]{escape(doc['title'])}[/bold]\n{doc['project']} / {doc['kind']} {doc['id']}",
+        title=f"Matches for '{escape(query)}' ({len(results)})"
+    ).show()
+
+def display_project_totals(totals: List[Dict[str, Any]],
+                           skipped: Optional[List[Dict[str, str]]] = None) -> None:
+    """Display per-project record counts and open goals, and any skipped projects."""
+    _display_skipped_projects(skipped)
+    PaginatedTable(
+        [
+            Column("Project", lambda row: escape(row['project'])),
+            Column("Ideas", lambda row: str(row['ideas'])),
+            Column("Ready", lambda row: str(row['ideas_by_status'].get('ready', 0))),
+            Column("Experiments", lambda row: str(row['experiments'])),
+            Column("Paper Notes", lambda row: str(row['paper_notes'])),
+            Column("Days Logged", lambda row: str(row['days_logged'])),
+            Column("Open Goals", lambda row: str(row['open_goals'])),
+        ],
+        totals,
+        title="All Projects"
+    ).show()
+
+def display_integrity_issues(issues: List[Any], project_name: str) -> None:
+    """Display the problems found by an integrity check."""
+    if not issues:
+        console.log(f"[green]No problems found in {escape(project_name)}[/green]")
+        return
+    severity_styles = {'error': "red", 'warning': "yellow"}
+    PaginatedTable(
+        [
+            Column("Severity", lambda issue: f"[{severity_styles.get(issue.severity, 'white')}]{issue.severity}[/]"),
+            Column("Path", lambda issue: escape(issue.path)),
+            Column("Problem", lambda issue: escape(issue.message)),
+            Column("Repair", lambda issue: (issue.repair or "-").replace('_', ' ')),
+        ],
+        issues,
+        title=f"Integrity Check: {escape(project_name)}"
+    ).show()
+
 def display_main_menu() -> None:
     """Display the main action menu."""
     console.log("\n[bold]Available Actions:[/bold]")
@@ -36,3 +97,44 @@ def display_main_menu() -> None:
     console.log("8. Check Stale Ideas")
     console.log("9. Conclude Experiment")
     console.log("10. Create Backup")
+    console.log("11. Notebook Table of Contents")
+    console.log("12. Compact Daily Logs")
+    console.log("13. Export Data")
+    console.log("14. Generate Reports")
+    console.log("15. Goal Analytics")
+    console.log("16. Update Idea Status")
+    console.log("17. Archive Old Work")
+    console.log("18. Browse Insights")
+    console.log("19. Plot Experiment Metric")
+    console.log("20. Project Timeline")
+    console.log("j. Show Background Jobs")
+    console.log("x. Cancel Background Job")
+
+def display_timeline(timeline: Any, start: Optional[datetime] = None) -> None:
+    """
+    Page through a project timeline from a point in time, or back from the
+    latest events. Only the page on screen is read from the project.
+    """
+    page = timeline.page(start=start, forward=start is not None)
+    while True:
+        table = Table(show_header=True, header_style="bold magenta", title="Project Timeline")
+        table.add_column("When")
+        table.add_column("Kind")
+        table.add_column("Record")
+        table.add_column("Event")
+        table.add_column("Details", max_width=60, overflow="ellipsis", no_wrap=True)
+        for event in page.events:
+            table.add_row(event.timestamp.strftime("%Y-%m-%d %H:%M"), event.kind.replace('_', ' '),
+                          escape(event.key), event.action, escape(event.title))
+        console.log(table)
+
+        if not sys.stdin.isatty() or (page.before is None and page.after is None):
+            return
+        moves = [label for label, cursor in (("n for later", page.after), ("p for earlier", page.before)) if cursor]
+        choice = get_cancellable_input(f"{', '.join(moves)}, empty to finish", allow_empty=True)
+        if not choice:
+            return
+        if choice.lower() == 'n' and page.after is not None:
+            page = timeline.page(cursor=page.after, forward=True)
+        elif choice.lower() == 'p' and page.before is not None:
+            page = timeline.page(cursor=page.before, forward=False)
@@ -0,0 +1,144 @@
+"""
+Paginated table rendering for the research logger.
+Rows are filtered and sorted as plain records first; only the visible page
+is ever formatted into a rich Table and printed.
+"""
+
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from math import ceil
+from typing import Any, Callable, Iterable, List, Optional
+
+from rich.table import Table
+from rich.text import Text
+
+from ui.console import console
+from ui.input_handlers import get_cancellable_input
+
+DEFAULT_PAGE_SIZE = 20
+
+@dataclass
+class Column:
+    """Column definition for a paginated table."""
+    header: str
+    render: Callable[[Any], Any]
+    max_width: Optional[int] = None
+
+class PaginatedTable:
+    """
+    Table view that formats one page of rows at a time.
+
+    Filtering and sorting run on the raw records before any formatting. Cells in
+    columns with a max_width are truncated; when a detail callback is supplied
+    the full row can be shown by entering its number at the page prompt.
+    """
+
+    def __init__(self, columns: List[Column], rows: Iterable[Any],
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 sort_key: Optional[Callable[[Any], Any]] = None,
+                 reverse: bool = False,
+                 row_filter: Optional[Callable[[Any], bool]] = None,
+                 detail: Optional[Callable[[Any], str]] = None,
+                 title: Optional[str] = None):
+        self.columns = columns
+        self.page_size = max(1, page_size)
+        self.detail = detail
+        self.title = title
+
+        selected = rows if row_filter is None else (row for row in rows if row_filter(row))
+        if row_filter is None and sort_key is None and isinstance(rows, Sequence):
+            # Lazy sequences are only read one page at a time
+            self.rows = rows
+        elif sort_key is not None:
+            self.rows: List[Any] = sorted(selected, key=sort_key, reverse=reverse)
+        else:
+            self.rows = list(selected)
+        self._page_truncated = False
+
+    @property
+    def page_count(self) -> int:
+        return max(1, ceil(len(self.rows) / self.page_size))
+
+    def page_rows(self, page: int) -> List[Any]:
+        """Return the raw records on the given zero-based page."""
+        start = page * self.page_size
+        return self.rows[start:start + self.page_size]
+
+    def build_page(self, page: int) -> Table:
+        """Format a single page of rows into a rich Table."""
+        title = self.title
+        if self.page_count > 1:
+            title = f"{title or ''} (page {page + 1}/{self.page_count}, {len(self.rows)} rows)".strip()
+
+        table = Table(show_header=True, header_style="bold magenta", title=title)
+        if self.detail is not None:
+            table.add_column("#")
+        for column in self.columns:
+            table.add_column(column.header)
+
+        self._page_truncated = False
+        start = page * self.page_size
+        for offset, row in enumerate(self.page_rows(page)):
+            cells = [self._format_cell(column, row) for column in self.columns]
+            if self.detail is not None:
+                cells.insert(0, str(start + offset + 1))
+            table.add_row(*cells)
+
+        return table
+
+    def _format_cell(self, column: Column, row: Any) -> Any:
+        value = column.render(row)
+        if column.max_width is None:
+            return value
+
+        text = Text.from_markup(value) if isinstance(value, str) else value
+        if isinstance(text, Text) and text.cell_len > column.max_width:
+            text.truncate(column.max_width, overflow="ellipsis")
+            self._page_truncated = True
+        return text
+
+    def show(self, interactive: Optional[bool] = None) -> None:
+        """
+        Render the table incrementally, one page per prompt.
+
+        Non-interactive sessions (e.g. scripts with redirected stdin) print every
+        page in turn without prompting.
+        """
+        if not self.rows:
+            console.log(self.build_page(0))
+            return
+        if interactive is None:
+            interactive = sys.stdin.isatty()
+
+        page = 0
+        while True:
+            console.log(self.build_page(page))
+
+            if not interactive:
+                if page + 1 >= self.page_count:
+                    return
+                page += 1
+                continue
+
+            can_drill_down = self.detail is not None and self._page_truncated
+            if self.page_count == 1 and not can_drill_down:
+                return
+
+            choice = get_cancellable_input(
+                "n/p for next/previous page, row number for details, empty to finish",
+                allow_empty=True
+            )
+            if not choice:
+                return
+
+            choice = choice.lower()
+            if choice == 'n':
+                page = min(page + 1, self.page_count - 1)
+            elif choice == 'p':
+                page = max(page - 1, 0)
+            elif choice.isdigit() and self.detail is not None and 0 < int(choice) <= len(self.rows):
+                console.log(self.detail(self.rows[int(choice) - 1]))
+                get_cancellable_input("Press enter to return to the table", allow_empty=True)
+            else:
+                console.log("[red]Invalid choice[/red]")
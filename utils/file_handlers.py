@@ -4,19 +4,113 @@ Provides consistent file operations with error handling and type safety.
 """
 
 from pathlib import Path
+import gzip
+import hashlib
+import io
 import json
-from typing import Any, Dict, Optional
+import lzma
+import textwrap
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
 from datetime import datetime
+from enum import Enum
 import shutil
 
 class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime objects."""
+    """Custom JSON encoder that handles datetime and enum objects."""
     def default(self, obj):
         if isinstance(obj, datetime):
             return obj.isoformat()
+        if isinstance(obj, Enum):
+            return obj.value
         return super().default(obj)
 
-def save_json(data: Any, filepath: Path, create_dirs: bool = True) -> None:
+# Default size above which save_json compresses its output
+COMPRESS_THRESHOLD = 256 * 1024
+
+def _zstd_module():
+    """Return an importable zstd module, or None when neither variant is available."""
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+def _open_compressed(filepath: Path, codec: str, mode: str) -> BinaryIO:
+    """Open a binary stream that compresses or decompresses with the given codec."""
+    if codec == 'gzip':
+        return gzip.open(filepath, mode)
+    if codec == 'lzma':
+        return lzma.open(filepath, mode)
+    if codec == 'zstd':
+        zstd = _zstd_module()
+        if zstd is None:
+            raise IOError(f"zstd support is not installed; cannot open {filepath}")
+        return zstd.open(filepath, mode)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+# Leading bytes used to recognise compressed files regardless of their name
+_MAGIC_NUMBERS = {
+    b'\x1f\x8b': 'gzip',
+    b'\xfd7zXZ\x00': 'lzma',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+}
+
+def detect_codec(filepath: Path) -> Optional[str]:
+    """Return the compression codec of a file from its magic bytes, or None for plain files."""
+    with open(filepath, 'rb') as f:
+        head = f.read(6)
+    for magic, codec in _MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+class _ThresholdWriter(io.RawIOBase):
+    """
+    Binary sink that buffers output until it exceeds a size threshold.
+
+    Small payloads are written as-is on close; once the threshold is crossed the
+    buffer is flushed into a compressed stream and the rest streams through it.
+    """
+
+    def __init__(self, filepath: Path, threshold: int, codec: str):
+        self.filepath = filepath
+        self.threshold = threshold
+        self.codec = codec
+        self._buffer = bytearray()
+        self._stream: Optional[BinaryIO] = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._stream is not None:
+            self._stream.write(data)
+            return len(data)
+        self._buffer.extend(data)
+        if len(self._buffer) > self.threshold:
+            self._stream = _open_compressed(self.filepath, self.codec, 'wb')
+            self._stream.write(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._stream is not None:
+            self._stream.close()
+        else:
+            with open(self.filepath, 'wb') as f:
+                f.write(self._buffer)
+        super().close()
+
+def save_json(data: Any, filepath: Path, create_dirs: bool = True,
+              compress_threshold: Optional[int] = None, codec: str = 'gzip') -> None:
     """
     Safely saves data to a JSON file with proper error handling.
     
@@ -24,20 +118,37 @@ def save_json(data: Any, filepath: Path, create_dirs: bool = True) -> None:
         data: The data to save
         filepath: Path to the target file
         create_dirs: Whether to create parent directories if they don't exist
+        compress_threshold: Compress the file with codec once its serialized size
+            exceeds this many bytes; None never compresses
+        codec: Compression codec, one of 'gzip', 'lzma' or 'zstd'
     """
+    # Write to a sibling temp file and rename it over the target, so readers
+    # never see a partially written file
+    temp_path = filepath.with_name(filepath.name + '.tmp')
     try:
         if create_dirs:
             filepath.parent.mkdir(parents=True, exist_ok=True)
-            
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, cls=DateTimeEncoder)
+        
+        if compress_threshold is None:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=2, cls=DateTimeEncoder)
+        else:
+            # Compressed files are not meant for reading by eye, so skip the indentation
+            with io.TextIOWrapper(_ThresholdWriter(temp_path, compress_threshold, codec), encoding='utf-8') as f:
+                json.dump(data, f, cls=DateTimeEncoder)
+        temp_path.replace(filepath)
     except Exception as e:
+        if temp_path.exists():
+            temp_path.unlink()
         raise IOError(f"Failed to save JSON file {filepath}: {str(e)}")
 
 def load_json(filepath: Path) -> Optional[Any]:
     """
     Safely loads data from a JSON file with proper error handling.
     
+    Compressed files written by save_json are detected from their content and
+    decompressed while reading.
+    
     Args:
         filepath: Path to the JSON file
         
@@ -48,11 +159,179 @@ def load_json(filepath: Path) -> Optional[Any]:
         return None
         
     try:
-        with open(filepath, 'r') as f:
+        codec = detect_codec(filepath)
+        if codec is None:
+            with open(filepath, 'r') as f:
+                return json.load(f)
+        with io.TextIOWrapper(_open_compressed(filepath, codec, 'rb'), encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
         raise IOError(f"Failed to load JSON file {filepath}: {str(e)}")
 
+def iter_json_array(filepath: Path, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yields the elements of a JSON array file one at a time.
+    
+    Only the element being decoded is held in memory, so arbitrarily large
+    record files can be scanned. Compressed files are handled like load_json.
+    An element that does not fit in the buffer doubles it before decoding is
+    retried, so large elements still decode in linear time.
+    
+    Args:
+        filepath: Path to a file holding a JSON array
+        chunk_size: Minimum number of characters read at a time
+    """
+    filepath = Path(filepath)
+    if not filepath.exists():
+        return
+    decoder = json.JSONDecoder()
+    try:
+        codec = detect_codec(filepath)
+        stream = open(filepath, 'r') if codec is None else \
+            io.TextIOWrapper(_open_compressed(filepath, codec, 'rb'), encoding='utf-8')
+        with stream as f:
+            buffer, position, eof = '', 0, False
+            started = expect_separator = False
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position >= len(buffer):
+                    if eof:
+                        raise ValueError("unexpected end of file")
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer, position = buffer[position:] + chunk, 0
+                    continue
+                
+                char = buffer[position]
+                if not started:
+                    if char != '[':
+                        raise ValueError("file does not hold a JSON array")
+                    started = True
+                    position += 1
+                elif char == ']':
+                    return
+                elif expect_separator:
+                    if char != ',':
+                        raise ValueError(f"expected ',' but found {char!r}")
+                    expect_separator = False
+                    position += 1
+                else:
+                    try:
+                        item, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        item, end = None, None
+                    # A value that runs to the end of the buffer may continue in the next
+                    # chunk; so may a number not followed by a delimiter, since the
+                    # decoder accepts prefixes such as 1 of 1.5 or 1e10
+                    number = isinstance(item, (int, float)) and not isinstance(item, bool)
+                    if end is None or not eof and (
+                            end == len(buffer) or
+                            number and buffer[end] not in ',]' and not buffer[end].isspace()):
+                        if eof:
+                            raise ValueError(f"invalid JSON at character {position}")
+                        chunk = f.read(max(chunk_size, len(buffer) - position))
+                        eof = not chunk
+                        buffer, position = buffer[position:] + chunk, 0
+                        continue
+                    yield item
+                    buffer, position = buffer[end:], 0
+                    expect_separator = True
+    except Exception as e:
+        raise IOError(f"Failed to read JSON array {filepath}: {str(e)}")
+
+def save_json_stream(items: Iterable[Any], filepath: Path, compress_threshold: Optional[int] = None,
+                     codec: str = 'gzip') -> int:
+    """
+    Atomically writes a JSON array from an iterable without materialising it.
+    
+    The output is identical to save_json called with the full list, so the
+    two can be used interchangeably for the same file.
+    
+    Args:
+        items: Elements of the array, consumed once
+        filepath: Path to the target file
+        compress_threshold: As for save_json
+        codec: As for save_json
+        
+    Returns:
+        The number of elements written
+    """
+    temp_path = filepath.with_name(filepath.name + '.tmp')
+    count = 0
+    try:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if compress_threshold is None:
+            stream = open(temp_path, 'w')
+        else:
+            stream = io.TextIOWrapper(_ThresholdWriter(temp_path, compress_threshold, codec), encoding='utf-8')
+        with stream as f:
+            f.write('[')
+            for item in items:
+                if compress_threshold is None:
+                    text = textwrap.indent(json.dumps(item, indent=2, cls=DateTimeEncoder), '  ')
+                    f.write(('\n' if count == 0 else ',\n') + text)
+                else:
+                    f.write(('' if count == 0 else ', ') + json.dumps(item, cls=DateTimeEncoder))
+                count += 1
+            f.write('\n]' if count and compress_threshold is None else ']')
+        temp_path.replace(filepath)
+    except Exception as e:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise IOError(f"Failed to save JSON file {filepath}: {str(e)}")
+    return count
+
+def file_sha256(filepath: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 digest of a file, reading it in fixed-size chunks.
+    
+    Args:
+        filepath: File to hash
+        chunk_size: Number of bytes read per chunk
+        
+    Returns:
+        The hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except Exception as e:
+        raise IOError(f"Failed to hash file {filepath}: {str(e)}")
+    return digest.hexdigest()
+
+@contextmanager
+def exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on lock_path, shared with other processes, for the
+    duration of the block. Waits for a lock held elsewhere to be released.
+    
+    Args:
+        lock_path: Lock file, created if missing; its contents are not used
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        try:
+            import fcntl
+        except ImportError:
+            # Windows: lock the first byte instead
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
 def create_backup(source_dir: Path, backup_dir: Path) -> Path:
     """
     Creates a backup of a directory with timestamp.
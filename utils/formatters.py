@@ -5,8 +5,6 @@ Provides consistent formatting for dates, times, and other data types.
 
 from datetime import datetime
 from typing import Any, Dict
-from rich.table import Table
-from rich.text import Text
 
 def format_date(dt: datetime) -> str:
     """Format a datetime object for display in logs and UI."""
@@ -27,34 +25,6 @@ def format_duration(seconds: float) -> str:
         return f"{minutes}m {seconds}s"
     return f"{seconds}s"
 
-def create_idea_table(ideas: Dict[str, Any]) -> Table:
-    """Creates a formatted table for displaying ideas."""
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("ID")
-    table.add_column("Title")
-    table.add_column("Status")
-    table.add_column("Priority")
-    table.add_column("Last Updated")
-    
-    for idea_id, idea in ideas.items():
-        status_color = {
-            "seed": "blue",
-            "germinating": "green",
-            "developing": "yellow",
-            "blocked": "red",
-            "ready": "bold green"
-        }.get(idea.status.value, "white")
-        
-        table.add_row(
-            idea_id,
-            idea.title,
-            Text(idea.status.value, style=status_color),
-            str(idea.priority),
-            format_date(idea.last_updated)
-        )
-    
-    return table
-
 def format_experiment_summary(experiment: Dict[str, Any]) -> str:
     """Creates a formatted summary of an experiment."""
     return f"""
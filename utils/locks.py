@@ -0,0 +1,78 @@
+"""
+Locking utilities for the research logger.
+Provides a reader-writer lock for sharing an open project between threads.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+class ReadWriteLock:
+    """
+    Lock held either by any number of readers or by a single writer.
+
+    Used as a plain lock (with, acquire, release) it is taken for writing, so
+    code written against threading.Lock keeps exclusive access. A waiting
+    writer blocks new readers, so a stream of readers cannot starve it.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock for writing."""
+        with self._condition:
+            if not blocking:
+                if self._writing or self._readers:
+                    return False
+                self._writing = True
+                return True
+            self._writers_waiting += 1
+            try:
+                self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+            self._writing = True
+            return True
+
+    def release(self) -> None:
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+
+    def acquire_read(self, blocking: bool = True) -> bool:
+        """Take the lock for reading, alongside other readers."""
+        with self._condition:
+            def free() -> bool:
+                return not self._writing and not self._writers_waiting
+            if not blocking:
+                if not free():
+                    return False
+            else:
+                self._condition.wait_for(free)
+            self._readers += 1
+            return True
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    def __enter__(self) -> 'ReadWriteLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,104 @@
+"""
+Append-only record archive with an offset index.
+Packs many small JSON records into a single data file so that any one record
+is read back with a single seek, without enumerating or opening other files.
+"""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.file_handlers import DateTimeEncoder
+
+class RecordArchive:
+    """
+    JSON records stored back to back in <name>.dat, located via <name>.idx.json.
+
+    The index maps each key to its [offset, length] in the data file and is
+    replaced atomically after new records are appended, so a crash mid-append
+    leaves only unreferenced bytes at the end of the data file. With compress
+    set, each record is zlib-compressed on its own so it can still be read
+    back without touching its neighbours.
+    """
+
+    def __init__(self, directory: Path, name: str, compress: bool = False):
+        self.data_path = Path(directory) / f"{name}.dat"
+        self.index_path = Path(directory) / f"{name}.idx.json"
+        self.compress = compress
+        self._index: Optional[Dict[str, List[int]]] = None
+
+    def _decode(self, payload: bytes) -> Any:
+        if self.compress:
+            payload = zlib.decompress(payload)
+        return json.loads(payload.decode('utf-8'))
+
+    @property
+    def index(self) -> Dict[str, List[int]]:
+        if self._index is None:
+            if self.index_path.exists():
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {}
+        return self._index
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def keys(self) -> List[str]:
+        """Archived keys in sorted order."""
+        return sorted(self.index)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Read one record with a single seek, or None if the key is absent."""
+        location = self.index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.data_path, 'rb') as f:
+            f.seek(offset)
+            return self._decode(f.read(length))
+
+    def iter_records(self, keys: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, record) pairs in key order through one open file handle."""
+        wanted = self.keys() if keys is None else [k for k in keys if k in self.index]
+        if not wanted:
+            return
+        with open(self.data_path, 'rb') as f:
+            for key in wanted:
+                offset, length = self.index[key]
+                f.seek(offset)
+                yield key, self._decode(f.read(length))
+
+    def append(self, records: Iterable[Tuple[str, Any]]) -> int:
+        """
+        Append records to the archive; a key already present is superseded.
+
+        Returns the number of records written.
+        """
+        index = dict(self.index)
+        written = 0
+        self.data_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.data_path, 'ab') as f:
+            offset = f.tell()
+            for key, record in records:
+                payload = json.dumps(record, cls=DateTimeEncoder).encode('utf-8')
+                if self.compress:
+                    payload = zlib.compress(payload)
+                payload += b"\n"
+                f.write(payload)
+                index[key] = [offset, len(payload) - 1]
+                offset += len(payload)
+                written += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        if written:
+            temp_path = self.index_path.with_suffix('.tmp')
+            with open(temp_path, 'w') as f:
+                json.dump(index, f)
+            temp_path.replace(self.index_path)
+            self._index = index
+        return written